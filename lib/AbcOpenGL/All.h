@@ -37,9 +37,11 @@
 #ifndef _AbcOpenGL_All_h_
 #define _AbcOpenGL_All_h_
 
+#include <AbcOpenGL/DiskCache.h>
 #include <AbcOpenGL/Drawable.h>
 #include <AbcOpenGL/DrawContext.h>
 #include <AbcOpenGL/Foundation.h>
+#include <AbcOpenGL/FrameCache.h>
 #include <AbcOpenGL/GLCamera.h>
 #include <AbcOpenGL/ICurvesDrw.h>
 #include <AbcOpenGL/INuPatchDrw.h>
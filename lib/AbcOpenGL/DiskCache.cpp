@@ -0,0 +1,627 @@
+//-*****************************************************************************
+//
+// Copyright (c) 2009-2014,
+//  Sony Pictures Imageworks, Inc. and
+//  Industrial Light & Magic, a division of Lucasfilm Entertainment Company Ltd.
+//
+// All rights reserved.
+//
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+// *       Redistributions of source code must retain the above copyright
+// notice, this list of conditions and the following disclaimer.
+// *       Redistributions in binary form must reproduce the above
+// copyright notice, this list of conditions and the following disclaimer
+// in the documentation and/or other materials provided with the
+// distribution.
+// *       Neither the name of Sony Pictures Imageworks, nor
+// Industrial Light & Magic nor the names of their contributors may be used
+// to endorse or promote products derived from this software without specific
+// prior written permission.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//-*****************************************************************************
+
+#include "DiskCache.h"
+
+#include <sstream>
+#include <iomanip>
+
+#ifndef PLATFORM_WINDOWS
+#include <sys/types.h>
+#include <sys/stat.h>
+#include <sys/mman.h>
+#include <dirent.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <utime.h>
+#endif
+
+namespace AbcOpenGL {
+namespace ABCOPENGL_VERSION_NS {
+
+namespace {
+
+typedef Alembic::Util::uint32_t uint32;
+typedef Alembic::Util::uint64_t uint64;
+typedef Int32ArraySample::value_type int32;
+
+// Bump the version whenever the file layout changes.
+const uint32 kMagic = 0x46434241;
+const uint32 kVersion = 1;
+const std::string kExtension( ".abcf" );
+
+//-*****************************************************************************
+// A frame file is a header, the key, and then the arrays of the frame in
+// header order, each padded to 8 bytes.
+struct Header
+{
+    uint32 magic;
+    uint32 version;
+    uint64 keySize;
+    uint64 numP;
+    uint64 numN;
+    uint64 numIndices;
+    uint64 numCounts;
+    uint64 numCustomN;
+    uint64 numTriangles;
+    double bounds[6];
+};
+
+//-*****************************************************************************
+size_t padded( size_t iBytes )
+{
+    return ( iBytes + 7 ) & ~size_t( 7 );
+}
+
+//-*****************************************************************************
+// 64-bit FNV-1a hash, used to name frame files.
+uint64 hashKey( const std::string &iKey )
+{
+    uint64 hash = 14695981039346656037ULL;
+    for ( size_t i = 0; i < iKey.size(); ++i )
+    {
+        hash ^= static_cast<unsigned char>( iKey[i] );
+        hash *= 1099511628211ULL;
+    }
+    return hash;
+}
+
+#ifndef PLATFORM_WINDOWS
+
+//-*****************************************************************************
+// A read-only file mapping, unmapped once no array uses it.
+struct Mapping : private Alembic::Util::noncopyable
+{
+    Mapping( void *iData, size_t iSize ) : data( iData ), size( iSize ) {}
+    ~Mapping() { munmap( data, size ); }
+
+    void *data;
+    size_t size;
+};
+typedef Alembic::Util::shared_ptr<Mapping> MappingPtr;
+
+//-*****************************************************************************
+// Keeps the mapping alive for as long as an array sample points into it.
+template <class SAMPLE>
+struct MappedDeleter
+{
+    MappedDeleter( MappingPtr iMapping ) : mapping( iMapping ) {}
+    void operator()( SAMPLE *iSample ) { delete iSample; }
+
+    MappingPtr mapping;
+};
+
+//-*****************************************************************************
+// Wraps an array of the mapping in an array sample, without copying.
+template <class SAMPLE>
+Alembic::Util::shared_ptr<SAMPLE>
+mapArray( MappingPtr iMapping, size_t &ioOffset, uint64 iCount )
+{
+    typedef typename SAMPLE::value_type value_type;
+
+    Alembic::Util::shared_ptr<SAMPLE> sample;
+    if ( iCount > 0 )
+    {
+        const char *base = static_cast<const char *>( iMapping->data );
+        sample.reset( new SAMPLE( reinterpret_cast<const value_type *>(
+                                      base + ioOffset ), iCount ),
+                      MappedDeleter<SAMPLE>( iMapping ) );
+    }
+    ioOffset += padded( iCount * sizeof( value_type ) );
+    return sample;
+}
+
+//-*****************************************************************************
+// Copies an array of the mapping into a vector.
+template <class T>
+Alembic::Util::shared_ptr<std::vector<T> >
+copyArray( MappingPtr iMapping, size_t &ioOffset, uint64 iCount )
+{
+    Alembic::Util::shared_ptr<std::vector<T> > vec;
+    if ( iCount > 0 )
+    {
+        const T *data = reinterpret_cast<const T *>(
+            static_cast<const char *>( iMapping->data ) + ioOffset );
+        vec.reset( new std::vector<T>( data, data + iCount ) );
+    }
+    ioOffset += padded( iCount * sizeof( T ) );
+    return vec;
+}
+
+//-*****************************************************************************
+bool writeAll( int iFd, const void *iData, size_t iBytes )
+{
+    const char *data = static_cast<const char *>( iData );
+    while ( iBytes > 0 )
+    {
+        ssize_t written = write( iFd, data, iBytes );
+        if ( written <= 0 )
+        {
+            return false;
+        }
+        data += written;
+        iBytes -= written;
+    }
+    return true;
+}
+
+//-*****************************************************************************
+// Writes an array followed by its padding, and adds to the total size.
+bool writeArray( int iFd, const void *iData, size_t iBytes, size_t &ioTotal )
+{
+    static const char zeros[8] = { 0, 0, 0, 0, 0, 0, 0, 0 };
+    if ( iBytes > 0 && !writeAll( iFd, iData, iBytes ) )
+    {
+        return false;
+    }
+    size_t pad = padded( iBytes ) - iBytes;
+    if ( pad > 0 && !writeAll( iFd, zeros, pad ) )
+    {
+        return false;
+    }
+    ioTotal += iBytes + pad;
+    return true;
+}
+
+#endif // ifndef PLATFORM_WINDOWS
+
+} // End anonymous namespace
+
+//-*****************************************************************************
+DiskCache &DiskCache::instance()
+{
+    static DiskCache cache;
+    return cache;
+}
+
+//-*****************************************************************************
+DiskCache::DiskCache()
+  : m_budget( 0 )
+  , m_size( 0 )
+  , m_hits( 0 )
+  , m_misses( 0 )
+{
+    // Nothing!
+}
+
+//-*****************************************************************************
+void DiskCache::setup( const std::string &iDirectory, size_t iBytes )
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+
+    m_directory.clear();
+    m_entries.clear();
+    m_map.clear();
+    m_budget = iBytes;
+    m_size = 0;
+
+#ifndef PLATFORM_WINDOWS
+    std::string directory = iDirectory;
+    while ( directory.size() > 1 && directory[directory.size() - 1] == '/' )
+    {
+        directory.erase( directory.size() - 1 );
+    }
+    if ( directory.empty() )
+    {
+        return;
+    }
+
+    mkdir( directory.c_str(), 0755 );
+    DIR *dir = opendir( directory.c_str() );
+    if ( !dir )
+    {
+        std::cerr << "Cannot open frame cache directory: " << directory
+                  << std::endl;
+        return;
+    }
+    m_directory = directory;
+
+    // Existing files, oldest first, by the time they were last used.
+    std::vector<std::pair<time_t, Entry> > files;
+    while ( struct dirent *ent = readdir( dir ) )
+    {
+        std::string name( ent->d_name );
+        if ( name.size() <= kExtension.size() ||
+             name.compare( name.size() - kExtension.size(),
+                           kExtension.size(), kExtension ) != 0 )
+        {
+            continue;
+        }
+        struct stat st;
+        std::string path = m_directory + "/" + name;
+        if ( stat( path.c_str(), &st ) == 0 )
+        {
+            files.push_back( std::make_pair( st.st_mtime,
+                                             Entry( name, st.st_size ) ) );
+        }
+    }
+    closedir( dir );
+
+    std::sort( files.begin(), files.end() );
+    for ( size_t i = 0; i < files.size(); ++i )
+    {
+        touch( files[i].second.first, files[i].second.second );
+    }
+    evict();
+#endif
+}
+
+//-*****************************************************************************
+bool DiskCache::enabled() const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return !m_directory.empty();
+}
+
+//-*****************************************************************************
+std::string DiskCache::makeKey( const Abc::IObject &iObject ) const
+{
+#ifndef PLATFORM_WINDOWS
+    if ( !enabled() )
+    {
+        return std::string();
+    }
+
+    std::string archive = iObject.getArchive().getName();
+    struct stat st;
+    if ( stat( archive.c_str(), &st ) != 0 )
+    {
+        return std::string();
+    }
+
+    std::ostringstream key;
+    key << archive << "|" << st.st_mtime << "|" << iObject.getFullName();
+    return key.str();
+#else
+    return std::string();
+#endif
+}
+
+//-*****************************************************************************
+std::string DiskCache::fileName( const std::string &iKey,
+                                 index_t iIndex ) const
+{
+    std::ostringstream name;
+    name << std::hex << std::setw( 16 ) << std::setfill( '0' )
+         << hashKey( iKey ) << std::dec << "_" << iIndex << kExtension;
+    return name.str();
+}
+
+//-*****************************************************************************
+MeshDrwHelper::FramePtr DiskCache::get( const std::string &iKey,
+                                        index_t iIndex )
+{
+    MeshDrwHelper::FramePtr frame;
+
+#ifndef PLATFORM_WINDOWS
+    std::string name = fileName( iKey, iIndex );
+    std::string path;
+    {
+        Alembic::Util::scoped_lock l( m_mutex );
+        if ( m_directory.empty() )
+        {
+            return frame;
+        }
+        if ( m_map.find( name ) == m_map.end() )
+        {
+            ++m_misses;
+            return frame;
+        }
+        path = m_directory + "/" + name;
+    }
+
+    int fd = open( path.c_str(), O_RDONLY );
+    if ( fd < 0 )
+    {
+        Alembic::Util::scoped_lock l( m_mutex );
+        ++m_misses;
+        return frame;
+    }
+
+    struct stat st;
+    void *data = MAP_FAILED;
+    if ( fstat( fd, &st ) == 0 && st.st_size >= ( off_t ) sizeof( Header ) )
+    {
+        data = mmap( NULL, st.st_size, PROT_READ, MAP_SHARED, fd, 0 );
+    }
+    close( fd );
+    if ( data == MAP_FAILED )
+    {
+        Alembic::Util::scoped_lock l( m_mutex );
+        ++m_misses;
+        return frame;
+    }
+
+    MappingPtr mapping( new Mapping( data, st.st_size ) );
+    const char *base = static_cast<const char *>( data );
+    const Header *header = reinterpret_cast<const Header *>( base );
+
+    // Check the layout and key, and that the arrays fit in the file.
+    size_t offset = sizeof( Header );
+    size_t expected = offset + padded( header->keySize ) +
+        padded( header->numP * sizeof( V3f ) ) +
+        padded( header->numN * sizeof( V3f ) ) +
+        padded( header->numIndices * sizeof( int32 ) ) +
+        padded( header->numCounts * sizeof( int32 ) ) +
+        padded( header->numCustomN * sizeof( V3f ) ) +
+        padded( header->numTriangles * sizeof( MeshDrwHelper::Tri ) );
+
+    if ( header->magic != kMagic || header->version != kVersion ||
+         header->keySize != iKey.size() ||
+         expected > ( size_t ) st.st_size ||
+         memcmp( base + offset, iKey.data(), iKey.size() ) != 0 )
+    {
+        Alembic::Util::scoped_lock l( m_mutex );
+        ++m_misses;
+        return frame;
+    }
+    offset += padded( header->keySize );
+
+    frame.reset( new MeshDrwHelper::Frame );
+    frame->P = mapArray<P3fArraySample>( mapping, offset, header->numP );
+    frame->N = mapArray<V3fArraySample>( mapping, offset, header->numN );
+    frame->indices = mapArray<Int32ArraySample>( mapping, offset,
+                                                 header->numIndices );
+    frame->counts = mapArray<Int32ArraySample>( mapping, offset,
+                                                header->numCounts );
+    frame->customN = copyArray<V3f>( mapping, offset, header->numCustomN );
+    frame->triangles = copyArray<MeshDrwHelper::Tri>( mapping, offset,
+                                                     header->numTriangles );
+    if ( !frame->triangles )
+    {
+        frame->triangles.reset( new MeshDrwHelper::TriArray );
+    }
+    const double *b = header->bounds;
+    frame->bounds = Box3d( V3d( b[0], b[1], b[2] ), V3d( b[3], b[4], b[5] ) );
+
+    // Record the use in the file itself, for the next session.
+    utime( path.c_str(), NULL );
+
+    Alembic::Util::scoped_lock l( m_mutex );
+    ++m_hits;
+    touch( name, st.st_size );
+#endif
+
+    return frame;
+}
+
+//-*****************************************************************************
+void DiskCache::put( const std::string &iKey, index_t iIndex,
+                     MeshDrwHelper::FramePtr iFrame )
+{
+#ifndef PLATFORM_WINDOWS
+    if ( !iFrame || !iFrame->P || !iFrame->triangles || iKey.empty() )
+    {
+        return;
+    }
+
+    std::string name = fileName( iKey, iIndex );
+    std::string directory;
+    {
+        Alembic::Util::scoped_lock l( m_mutex );
+        if ( m_directory.empty() || m_map.find( name ) != m_map.end() )
+        {
+            return;
+        }
+        directory = m_directory;
+    }
+
+    const MeshDrwHelper::Frame &f = *iFrame;
+    Header header;
+    memset( &header, 0, sizeof( Header ) );
+    header.magic = kMagic;
+    header.version = kVersion;
+    header.keySize = iKey.size();
+    header.numP = f.P->size();
+    header.numN = f.N ? f.N->size() : 0;
+    header.numIndices = f.indices ? f.indices->size() : 0;
+    header.numCounts = f.counts ? f.counts->size() : 0;
+    header.numCustomN = f.customN ? f.customN->size() : 0;
+    header.numTriangles = f.triangles->size();
+    header.bounds[0] = f.bounds.min.x;
+    header.bounds[1] = f.bounds.min.y;
+    header.bounds[2] = f.bounds.min.z;
+    header.bounds[3] = f.bounds.max.x;
+    header.bounds[4] = f.bounds.max.y;
+    header.bounds[5] = f.bounds.max.z;
+
+    // Write to a temporary file and rename it, so readers in this or
+    // other sessions never see a partial frame.
+    std::string tmp = directory + "/.tmp_XXXXXX";
+    std::vector<char> tmpl( tmp.begin(), tmp.end() );
+    tmpl.push_back( '\0' );
+    int fd = mkstemp( &tmpl[0] );
+    if ( fd < 0 )
+    {
+        return;
+    }
+
+    size_t total = 0;
+    bool ok = writeArray( fd, &header, sizeof( Header ), total ) &&
+        writeArray( fd, iKey.data(), iKey.size(), total ) &&
+        writeArray( fd, f.P->get(), header.numP * sizeof( V3f ), total ) &&
+        writeArray( fd, f.N ? f.N->get() : NULL,
+                    header.numN * sizeof( V3f ), total ) &&
+        writeArray( fd, f.indices ? f.indices->get() : NULL,
+                    header.numIndices * sizeof( int32 ), total ) &&
+        writeArray( fd, f.counts ? f.counts->get() : NULL,
+                    header.numCounts * sizeof( int32 ), total ) &&
+        writeArray( fd, header.numCustomN ? &( *f.customN )[0] : NULL,
+                    header.numCustomN * sizeof( V3f ), total ) &&
+        writeArray( fd, header.numTriangles ? &( *f.triangles )[0] : NULL,
+                    header.numTriangles * sizeof( MeshDrwHelper::Tri ),
+                    total );
+    close( fd );
+
+    std::string path = directory + "/" + name;
+    if ( !ok || rename( &tmpl[0], path.c_str() ) != 0 )
+    {
+        unlink( &tmpl[0] );
+        return;
+    }
+
+    Alembic::Util::scoped_lock l( m_mutex );
+    if ( m_directory == directory )
+    {
+        touch( name, total );
+        evict();
+    }
+#endif
+}
+
+//-*****************************************************************************
+void DiskCache::touch( const std::string &iName, size_t iBytes )
+{
+    EntryMap::iterator it = m_map.find( iName );
+    if ( it != m_map.end() )
+    {
+        m_size -= it->second->second;
+        m_entries.erase( it->second );
+        m_map.erase( it );
+    }
+
+    m_entries.push_front( Entry( iName, iBytes ) );
+    m_map[iName] = m_entries.begin();
+    m_size += iBytes;
+}
+
+//-*****************************************************************************
+void DiskCache::evict()
+{
+#ifndef PLATFORM_WINDOWS
+    while ( m_size > m_budget && !m_entries.empty() )
+    {
+        const Entry &entry = m_entries.back();
+        std::string path = m_directory + "/" + entry.first;
+        unlink( path.c_str() );
+        m_size -= entry.second;
+        m_map.erase( entry.first );
+        m_entries.pop_back();
+    }
+#endif
+}
+
+//-*****************************************************************************
+void DiskCache::clear()
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+
+#ifndef PLATFORM_WINDOWS
+    for ( EntryList::iterator it = m_entries.begin();
+          it != m_entries.end(); ++it )
+    {
+        std::string path = m_directory + "/" + it->first;
+        unlink( path.c_str() );
+    }
+#endif
+    m_entries.clear();
+    m_map.clear();
+    m_size = 0;
+}
+
+//-*****************************************************************************
+std::string DiskCache::getDirectory() const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return m_directory;
+}
+
+//-*****************************************************************************
+size_t DiskCache::getBudget() const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return m_budget;
+}
+
+//-*****************************************************************************
+size_t DiskCache::getSize() const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return m_size;
+}
+
+//-*****************************************************************************
+size_t DiskCache::getHits() const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return m_hits;
+}
+
+//-*****************************************************************************
+size_t DiskCache::getMisses() const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return m_misses;
+}
+
+//-*****************************************************************************
+void setDiskCache( const std::string &iDirectory, size_t iBytes )
+{
+    DiskCache::instance().setup( iDirectory, iBytes );
+}
+
+//-*****************************************************************************
+std::string getDiskCacheDirectory()
+{
+    return DiskCache::instance().getDirectory();
+}
+
+//-*****************************************************************************
+size_t getDiskCacheSize()
+{
+    return DiskCache::instance().getSize();
+}
+
+//-*****************************************************************************
+size_t getDiskCacheHits()
+{
+    return DiskCache::instance().getHits();
+}
+
+//-*****************************************************************************
+size_t getDiskCacheMisses()
+{
+    return DiskCache::instance().getMisses();
+}
+
+//-*****************************************************************************
+void clearDiskCache()
+{
+    DiskCache::instance().clear();
+}
+
+} // End namespace ABCOPENGL_VERSION_NS
+} // End namespace AbcOpenGL
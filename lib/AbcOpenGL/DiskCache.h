@@ -0,0 +1,133 @@
+//-*****************************************************************************
+//
+// Copyright (c) 2009-2014,
+//  Sony Pictures Imageworks, Inc. and
+//  Industrial Light & Magic, a division of Lucasfilm Entertainment Company Ltd.
+//
+// All rights reserved.
+//
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+// *       Redistributions of source code must retain the above copyright
+// notice, this list of conditions and the following disclaimer.
+// *       Redistributions in binary form must reproduce the above
+// copyright notice, this list of conditions and the following disclaimer
+// in the documentation and/or other materials provided with the
+// distribution.
+// *       Neither the name of Sony Pictures Imageworks, nor
+// Industrial Light & Magic nor the names of their contributors may be used
+// to endorse or promote products derived from this software without specific
+// prior written permission.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//-*****************************************************************************
+
+#ifndef _AbcOpenGL_DiskCache_h_
+#define _AbcOpenGL_DiskCache_h_
+
+#include "Export.h"
+#include "Foundation.h"
+#include "MeshDrwHelper.h"
+
+#include <list>
+
+namespace AbcOpenGL {
+namespace ABCOPENGL_VERSION_NS {
+
+//-*****************************************************************************
+//! \brief Process-wide cache of draw-ready mesh frames on disk, one file
+//! per object and sample index, so frames decoded in one session can be
+//! memory-mapped instead of decoded again in the next. Entries are keyed
+//! by archive path, archive modification time and object path, so a
+//! rewritten archive never reads stale frames. Once the files exceed the
+//! size cap, the least recently used are deleted; file modification
+//! times record use across runs. Disabled until a directory is set.
+class ABC_OPENGL_EXPORT DiskCache : private Alembic::Util::noncopyable
+{
+public:
+    static DiskCache &instance();
+
+    // Sets the cache directory and size cap, and scans existing files.
+    // An empty directory disables the cache.
+    void setup( const std::string &iDirectory, size_t iBytes );
+
+    bool enabled() const;
+
+    // Returns the key prefix for an object's frames, or an empty string
+    // if the cache is disabled or the archive cannot be found on disk.
+    std::string makeKey( const Abc::IObject &iObject ) const;
+
+    // Returns the memory-mapped frame, or an empty pointer on a miss.
+    MeshDrwHelper::FramePtr get( const std::string &iKey, index_t iIndex );
+
+    // Writes a frame, deleting older files to stay within the size cap.
+    void put( const std::string &iKey, index_t iIndex,
+              MeshDrwHelper::FramePtr iFrame );
+
+    // Deletes all the cache files.
+    void clear();
+
+    std::string getDirectory() const;
+    size_t getBudget() const;
+    size_t getSize() const;
+    size_t getHits() const;
+    size_t getMisses() const;
+
+protected:
+    DiskCache();
+
+    // Returns the file name of a frame within the cache directory.
+    std::string fileName( const std::string &iKey, index_t iIndex ) const;
+
+    // Marks a file as the most recently used. Expects the lock to be held.
+    void touch( const std::string &iName, size_t iBytes );
+
+    // Deletes files until within the size cap. Expects the lock to be held.
+    void evict();
+
+    typedef std::pair<std::string, size_t> Entry;
+    typedef std::list<Entry> EntryList;
+    typedef std::map<std::string, EntryList::iterator> EntryMap;
+
+    std::string m_directory;
+
+    EntryList m_entries;
+    EntryMap m_map;
+
+    size_t m_budget;
+    size_t m_size;
+    size_t m_hits;
+    size_t m_misses;
+
+    mutable Alembic::Util::mutex m_mutex;
+};
+
+//-*****************************************************************************
+// Convenience functions for the disk cache instance.
+ABC_OPENGL_EXPORT void setDiskCache( const std::string &iDirectory,
+                                     size_t iBytes );
+ABC_OPENGL_EXPORT std::string getDiskCacheDirectory();
+ABC_OPENGL_EXPORT size_t getDiskCacheSize();
+ABC_OPENGL_EXPORT size_t getDiskCacheHits();
+ABC_OPENGL_EXPORT size_t getDiskCacheMisses();
+ABC_OPENGL_EXPORT void clearDiskCache();
+
+} // End namespace ABCOPENGL_VERSION_NS
+
+using namespace ABCOPENGL_VERSION_NS;
+
+} // End namespace AbcOpenGL
+
+#endif
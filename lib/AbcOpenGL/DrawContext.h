@@ -42,6 +42,92 @@
 namespace AbcOpenGL {
 namespace ABCOPENGL_VERSION_NS {
 
+//-*****************************************************************************
+//! Number of objects drawn and skipped by frustum culling.
+struct CullStats
+{
+    CullStats() : drawn( 0 ), culled( 0 ) {}
+
+    void reset() { drawn = 0; culled = 0; }
+
+    size_t drawn;
+    size_t culled;
+};
+
+//-*****************************************************************************
+//! The six clip planes of a view volume, in the space of the matrix
+//! they were built from.
+class Frustum
+{
+public:
+    Frustum()
+    {
+        M44d iden;
+        iden.makeIdentity();
+        set( iden );
+    }
+
+    //! Build the planes from the current GL modelview and projection
+    //! matrices, so boxes are tested in the current object space.
+    void setFromGL()
+    {
+        M44d modelView;
+        M44d projection;
+        glGetDoublev( GL_MODELVIEW_MATRIX, ( GLdouble * )&(modelView[0][0]) );
+        glGetDoublev( GL_PROJECTION_MATRIX, ( GLdouble * )&(projection[0][0]) );
+        set( modelView * projection );
+    }
+
+    //! Build the planes from an object-to-clip matrix.
+    void set( const M44d & iXf )
+    {
+        for ( int i = 0; i < 3; ++i )
+        {
+            for ( int j = 0; j < 4; ++j )
+            {
+                m_planes[i * 2][j] = iXf[j][3] + iXf[j][i];
+                m_planes[i * 2 + 1][j] = iXf[j][3] - iXf[j][i];
+            }
+        }
+    }
+
+    //! Return the planes in the space of a child whose local matrix to
+    //! this space is iXf, so the frustum follows the hierarchy without
+    //! reading matrices back from GL.
+    Frustum transformed( const M44d & iXf ) const
+    {
+        Frustum child;
+        for ( int i = 0; i < 6; ++i )
+        {
+            const double *p = m_planes[i];
+            for ( int j = 0; j < 4; ++j )
+            {
+                child.m_planes[i][j] = iXf[j][0] * p[0] + iXf[j][1] * p[1] +
+                                       iXf[j][2] * p[2] + iXf[j][3] * p[3];
+            }
+        }
+        return child;
+    }
+
+    //! Return false if the box is entirely outside one of the planes.
+    bool intersects( const Box3d & iBox ) const
+    {
+        for ( int i = 0; i < 6; ++i )
+        {
+            const double *p = m_planes[i];
+            double d = p[0] * ( p[0] > 0.0 ? iBox.max.x : iBox.min.x ) +
+                       p[1] * ( p[1] > 0.0 ? iBox.max.y : iBox.min.y ) +
+                       p[2] * ( p[2] > 0.0 ? iBox.max.z : iBox.min.z ) +
+                       p[3];
+            if ( d < 0.0 ) { return false; }
+        }
+        return true;
+    }
+
+protected:
+    double m_planes[6][4];
+};
+
 //-*****************************************************************************
 class DrawContext
 {
@@ -52,6 +138,11 @@ public:
         m_pointSize = 3.0f;
         m_visibleOnly = false;
         m_boundsOnly = false;
+        m_cull = false;
+        m_cullStats = NULL;
+        m_useBuffers = false;
+        m_instances = NULL;
+        m_instanceColors = NULL;
     }
 
     // Default copy & assign.
@@ -72,11 +163,83 @@ public:
     bool boundsOnly() const { return m_boundsOnly; }
     void setBoundsOnly( bool boundsOnly ) { m_boundsOnly = boundsOnly; }
 
+    // Get/Set frustum culling toggle - skip objs outside the view
+    bool cull() const { return m_cull; }
+    void setCull( bool cull ) { m_cull = cull; }
+
+    // Get/Set cull frustum in the current object space
+    const Frustum &getFrustum() const { return m_frustum; }
+    void setFrustum( const Frustum &frustum ) { m_frustum = frustum; }
+
+    // Get/Set cull frustum in the space of the world-to-camera matrix,
+    // for xforms that don't inherit
+    const Frustum &getWorldFrustum() const { return m_worldFrustum; }
+    void setWorldFrustum( const Frustum &frustum ) { m_worldFrustum = frustum; }
+
+    // Get/Set culling counters, may be NULL
+    CullStats *getCullStats() const { return m_cullStats; }
+    void setCullStats( CullStats *stats ) { m_cullStats = stats; }
+
+    // Get/Set buffer objects toggle - keep mesh data on the GPU
+    bool useBuffers() const { return m_useBuffers; }
+    void setUseBuffers( bool useBuffers ) { m_useBuffers = useBuffers; }
+
+    // Get/Set instances - view space transforms, each leaf is drawn once
+    // per transform with the matching color, may be NULL
+    const std::vector<M44d> *getInstances() const { return m_instances; }
+    void setInstances( const std::vector<M44d> *instances,
+                       const std::vector<C3f> *colors = NULL )
+    {
+        m_instances = instances;
+        m_instanceColors = colors;
+    }
+
+    // Number of times each leaf is drawn, 1 without instances
+    size_t numInstances() const
+    { return m_instances ? m_instances->size() : 1; }
+
+    //! Push the modelview and apply the i-th instance transform and
+    //! color on top of it. Does nothing without instances. Leaves loop
+    //! over their instances from 0, popping each before the next, so
+    //! the leaf modelview is only read back for the first instance.
+    void pushInstance( size_t i ) const
+    {
+        if ( !m_instances ) { return; }
+
+        if ( i == 0 )
+        {
+            glGetDoublev( GL_MODELVIEW_MATRIX,
+                          ( GLdouble * )&(m_leafModelView[0][0]) );
+        }
+        glPushMatrix();
+        glLoadMatrixd( ( const GLdouble * )&((*m_instances)[i][0][0]) );
+        glMultMatrixd( ( const GLdouble * )&(m_leafModelView[0][0]) );
+
+        if ( m_instanceColors && i < m_instanceColors->size() )
+        {
+            glColor3fv( ( const GLfloat * )&((*m_instanceColors)[i]) );
+        }
+    }
+
+    //! Pop the modelview pushed by pushInstance.
+    void popInstance() const
+    {
+        if ( m_instances ) { glPopMatrix(); }
+    }
+
 protected:
     M44d m_worldToCamera;
     float m_pointSize;
     bool m_visibleOnly;
     bool m_boundsOnly;
+    bool m_cull;
+    Frustum m_frustum;
+    Frustum m_worldFrustum;
+    CullStats *m_cullStats;
+    bool m_useBuffers;
+    const std::vector<M44d> *m_instances;
+    const std::vector<C3f> *m_instanceColors;
+    mutable M44d m_leafModelView;
 };
 
 } // End namespace ABCOPENGL_VERSION_NS
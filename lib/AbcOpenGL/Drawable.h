@@ -73,6 +73,16 @@ public:
     //! to a new time, in seconds.
     virtual void setTime( chrono_t iSeconds ) = 0;
 
+    //! This function decodes the samples needed at a new time, in
+    //! seconds, into the frame cache without changing the current state.
+    //! It may be called from worker threads.
+    virtual void prefetch( chrono_t iSeconds ) {}
+
+    //! This function returns the number of primitives (triangles,
+    //! points or curve vertices) drawn at the current time, as a
+    //! measure of drawing cost.
+    virtual size_t getNumPrimitives() { return 0; }
+
     //! This function gets the bounding box at the
     //! currently set time.
     virtual Box3d getBounds() = 0;
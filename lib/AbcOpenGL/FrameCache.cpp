@@ -0,0 +1,237 @@
+//-*****************************************************************************
+//
+// Copyright (c) 2009-2014,
+//  Sony Pictures Imageworks, Inc. and
+//  Industrial Light & Magic, a division of Lucasfilm Entertainment Company Ltd.
+//
+// All rights reserved.
+//
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+// *       Redistributions of source code must retain the above copyright
+// notice, this list of conditions and the following disclaimer.
+// *       Redistributions in binary form must reproduce the above
+// copyright notice, this list of conditions and the following disclaimer
+// in the documentation and/or other materials provided with the
+// distribution.
+// *       Neither the name of Sony Pictures Imageworks, nor
+// Industrial Light & Magic nor the names of their contributors may be used
+// to endorse or promote products derived from this software without specific
+// prior written permission.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//-*****************************************************************************
+
+#include "FrameCache.h"
+
+namespace AbcOpenGL {
+namespace ABCOPENGL_VERSION_NS {
+
+//-*****************************************************************************
+FrameCache &FrameCache::instance()
+{
+    static FrameCache cache;
+    return cache;
+}
+
+//-*****************************************************************************
+FrameCache::FrameCache()
+  : m_budget( 1024 * 1024 * 1024 )
+  , m_size( 0 )
+  , m_hits( 0 )
+  , m_misses( 0 )
+{
+    // Nothing!
+}
+
+//-*****************************************************************************
+MeshDrwHelper::FramePtr FrameCache::get( const void *iOwner, index_t iIndex )
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+
+    EntryMap::iterator it = m_map.find( Key( iOwner, iIndex ) );
+    if ( it == m_map.end() )
+    {
+        ++m_misses;
+        return MeshDrwHelper::FramePtr();
+    }
+
+    // Move the entry to the front, making it the most recently used.
+    m_entries.splice( m_entries.begin(), m_entries, it->second );
+    ++m_hits;
+    return it->second->second;
+}
+
+//-*****************************************************************************
+void FrameCache::put( const void *iOwner, index_t iIndex,
+                      MeshDrwHelper::FramePtr iFrame )
+{
+    if ( !iFrame )
+    {
+        return;
+    }
+
+    Alembic::Util::scoped_lock l( m_mutex );
+
+    Key key( iOwner, iIndex );
+    EntryMap::iterator it = m_map.find( key );
+    if ( it != m_map.end() )
+    {
+        m_size -= it->second->second->bytes();
+        m_entries.erase( it->second );
+        m_map.erase( it );
+    }
+
+    m_entries.push_front( Entry( key, iFrame ) );
+    m_map[key] = m_entries.begin();
+    m_size += iFrame->bytes();
+
+    evict();
+}
+
+//-*****************************************************************************
+MeshDrwHelper::FramePtr FrameCache::peek( const void *iOwner,
+                                          index_t iIndex ) const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+
+    EntryMap::const_iterator it = m_map.find( Key( iOwner, iIndex ) );
+    if ( it == m_map.end() )
+    {
+        return MeshDrwHelper::FramePtr();
+    }
+    return it->second->second;
+}
+
+//-*****************************************************************************
+bool FrameCache::contains( const void *iOwner, index_t iIndex ) const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return m_map.find( Key( iOwner, iIndex ) ) != m_map.end();
+}
+
+//-*****************************************************************************
+void FrameCache::erase( const void *iOwner )
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+
+    // Keys are ordered by owner first, so its frames are contiguous.
+    EntryMap::iterator it = m_map.lower_bound(
+        Key( iOwner, std::numeric_limits<index_t>::min() ) );
+    while ( it != m_map.end() && it->first.first == iOwner )
+    {
+        m_size -= it->second->second->bytes();
+        m_entries.erase( it->second );
+        m_map.erase( it++ );
+    }
+}
+
+//-*****************************************************************************
+void FrameCache::clear()
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    m_entries.clear();
+    m_map.clear();
+    m_size = 0;
+    m_hits = 0;
+    m_misses = 0;
+}
+
+//-*****************************************************************************
+void FrameCache::setBudget( size_t iBytes )
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    m_budget = iBytes;
+    evict();
+}
+
+//-*****************************************************************************
+size_t FrameCache::getBudget() const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return m_budget;
+}
+
+//-*****************************************************************************
+size_t FrameCache::getSize() const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return m_size;
+}
+
+//-*****************************************************************************
+size_t FrameCache::getHits() const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return m_hits;
+}
+
+//-*****************************************************************************
+size_t FrameCache::getMisses() const
+{
+    Alembic::Util::scoped_lock l( m_mutex );
+    return m_misses;
+}
+
+//-*****************************************************************************
+void FrameCache::evict()
+{
+    while ( m_size > m_budget && !m_entries.empty() )
+    {
+        const Entry &entry = m_entries.back();
+        m_size -= entry.second->bytes();
+        m_map.erase( entry.first );
+        m_entries.pop_back();
+    }
+}
+
+//-*****************************************************************************
+void setFrameCacheBudget( size_t iBytes )
+{
+    FrameCache::instance().setBudget( iBytes );
+}
+
+//-*****************************************************************************
+size_t getFrameCacheBudget()
+{
+    return FrameCache::instance().getBudget();
+}
+
+//-*****************************************************************************
+size_t getFrameCacheSize()
+{
+    return FrameCache::instance().getSize();
+}
+
+//-*****************************************************************************
+size_t getFrameCacheHits()
+{
+    return FrameCache::instance().getHits();
+}
+
+//-*****************************************************************************
+size_t getFrameCacheMisses()
+{
+    return FrameCache::instance().getMisses();
+}
+
+//-*****************************************************************************
+void clearFrameCache()
+{
+    FrameCache::instance().clear();
+}
+
+} // End namespace ABCOPENGL_VERSION_NS
+} // End namespace AbcOpenGL
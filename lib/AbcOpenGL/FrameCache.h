@@ -0,0 +1,121 @@
+//-*****************************************************************************
+//
+// Copyright (c) 2009-2014,
+//  Sony Pictures Imageworks, Inc. and
+//  Industrial Light & Magic, a division of Lucasfilm Entertainment Company Ltd.
+//
+// All rights reserved.
+//
+// Redistribution and use in source and binary forms, with or without
+// modification, are permitted provided that the following conditions are
+// met:
+// *       Redistributions of source code must retain the above copyright
+// notice, this list of conditions and the following disclaimer.
+// *       Redistributions in binary form must reproduce the above
+// copyright notice, this list of conditions and the following disclaimer
+// in the documentation and/or other materials provided with the
+// distribution.
+// *       Neither the name of Sony Pictures Imageworks, nor
+// Industrial Light & Magic nor the names of their contributors may be used
+// to endorse or promote products derived from this software without specific
+// prior written permission.
+//
+// THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+// "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+// LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+// A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+// OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+// SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+// LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+// DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+// THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+// (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+// OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//-*****************************************************************************
+
+#ifndef _AbcOpenGL_FrameCache_h_
+#define _AbcOpenGL_FrameCache_h_
+
+#include "Export.h"
+#include "Foundation.h"
+#include "MeshDrwHelper.h"
+
+#include <list>
+#include <limits>
+
+namespace AbcOpenGL {
+namespace ABCOPENGL_VERSION_NS {
+
+//-*****************************************************************************
+//! \brief Process-wide cache of decoded, draw-ready mesh frames, keyed by
+//! the drawable that owns them and the sample index. Once the frames
+//! held exceed the memory budget, the least recently used are evicted.
+class ABC_OPENGL_EXPORT FrameCache : private Alembic::Util::noncopyable
+{
+public:
+    static FrameCache &instance();
+
+    // Returns the cached frame, or an empty pointer on a miss.
+    MeshDrwHelper::FramePtr get( const void *iOwner, index_t iIndex );
+
+    // Stores a frame, evicting older frames to stay within budget.
+    void put( const void *iOwner, index_t iIndex,
+              MeshDrwHelper::FramePtr iFrame );
+
+    // Returns the cached frame, or an empty pointer, without touching
+    // its age or the hit counts.
+    MeshDrwHelper::FramePtr peek( const void *iOwner, index_t iIndex ) const;
+
+    // Returns true if the frame is cached, without touching its age.
+    bool contains( const void *iOwner, index_t iIndex ) const;
+
+    // Drops all the frames of one owner, e.g. when it is destroyed.
+    void erase( const void *iOwner );
+
+    void clear();
+
+    void setBudget( size_t iBytes );
+    size_t getBudget() const;
+    size_t getSize() const;
+    size_t getHits() const;
+    size_t getMisses() const;
+
+protected:
+    FrameCache();
+
+    // Evicts frames until within budget. Expects the lock to be held.
+    void evict();
+
+    typedef std::pair<const void *, index_t> Key;
+    typedef std::pair<Key, MeshDrwHelper::FramePtr> Entry;
+    typedef std::list<Entry> EntryList;
+    typedef std::map<Key, EntryList::iterator> EntryMap;
+
+    EntryList m_entries;
+    EntryMap m_map;
+
+    size_t m_budget;
+    size_t m_size;
+    size_t m_hits;
+    size_t m_misses;
+
+    mutable Alembic::Util::mutex m_mutex;
+};
+
+//-*****************************************************************************
+// Convenience functions for the frame cache instance.
+ABC_OPENGL_EXPORT void setFrameCacheBudget( size_t iBytes );
+ABC_OPENGL_EXPORT size_t getFrameCacheBudget();
+ABC_OPENGL_EXPORT size_t getFrameCacheSize();
+ABC_OPENGL_EXPORT size_t getFrameCacheHits();
+ABC_OPENGL_EXPORT size_t getFrameCacheMisses();
+ABC_OPENGL_EXPORT void clearFrameCache();
+
+} // End namespace ABCOPENGL_VERSION_NS
+
+using namespace ABCOPENGL_VERSION_NS;
+
+} // End namespace AbcOpenGL
+
+#endif
@@ -105,6 +105,17 @@ void ICurvesDrw::setTime( chrono_t iSeconds )
 }
 
 
+//-*****************************************************************************
+size_t ICurvesDrw::getNumPrimitives()
+{
+    size_t count = IObjectDrw::getNumPrimitives();
+    if ( m_positions )
+    {
+        count += m_positions->size();
+    }
+    return count;
+}
+
 //-*****************************************************************************
 void ICurvesDrw::draw( const DrawContext &iCtx )
 {
@@ -115,35 +126,41 @@ void ICurvesDrw::draw( const DrawContext &iCtx )
 
     glDisable( GL_LIGHTING );
 
-    glColor3f( 1.0, 1.0, 1.0 );
     glEnable( GL_POINT_SMOOTH );
     glPointSize( 1.0 );
     glLineWidth( 1.0 );
 
-    for ( size_t currentCurve = 0, currentVertex = 0 ; currentCurve < m_nCurves ;
-          ++currentCurve )
+    for ( size_t inst = 0; inst < iCtx.numInstances(); ++inst )
     {
+        iCtx.pushInstance( inst );
+        glColor3f( 1.0, 1.0, 1.0 );
 
-        m_curvePoints.clear();
-        for ( size_t currentCurveVertex = 0 ;
-              currentCurveVertex < ( size_t ) ( nVertices[currentCurve] );
-              ++currentCurveVertex, ++currentVertex )
+        for ( size_t currentCurve = 0, currentVertex = 0 ;
+              currentCurve < m_nCurves ; ++currentCurve )
         {
-            m_curvePoints.push_back(&points[currentVertex]);
-        }
 
-        glMap1f( GL_MAP1_VERTEX_3, 0.0, 1.0, 3, 4,
-                 (const GLfloat *)m_curvePoints[0] );
-        glEnable( GL_MAP1_VERTEX_3 );
-
-        glBegin( GL_LINE_STRIP );
-        for ( size_t currentSegment = 0 ; currentSegment < 30 ;
-              ++currentSegment )
-        {
-            glEvalCoord1f(
-                static_cast<GLfloat>( currentSegment ) / static_cast<GLfloat>( 30.0f ) );
+            m_curvePoints.clear();
+            for ( size_t currentCurveVertex = 0 ;
+                  currentCurveVertex < ( size_t ) ( nVertices[currentCurve] );
+                  ++currentCurveVertex, ++currentVertex )
+            {
+                m_curvePoints.push_back(&points[currentVertex]);
+            }
+
+            glMap1f( GL_MAP1_VERTEX_3, 0.0, 1.0, 3, 4,
+                     (const GLfloat *)m_curvePoints[0] );
+            glEnable( GL_MAP1_VERTEX_3 );
+
+            glBegin( GL_LINE_STRIP );
+            for ( size_t currentSegment = 0 ; currentSegment < 30 ;
+                  ++currentSegment )
+            {
+                glEvalCoord1f(
+                    static_cast<GLfloat>( currentSegment ) / static_cast<GLfloat>( 30.0f ) );
+            }
+            glEnd();
         }
-        glEnd();
+        iCtx.popInstance();
     }
 
     glEnable( GL_LIGHTING );
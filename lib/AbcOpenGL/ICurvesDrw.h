@@ -57,6 +57,8 @@ public:
 
     virtual void setTime( chrono_t iSeconds );
 
+    virtual size_t getNumPrimitives();
+
     virtual void draw( const DrawContext & iCtx );
 
 protected:
@@ -138,20 +138,25 @@ void INuPatchDrw::draw( const DrawContext &iCtx )
     size_t nknotu = m_uKnot -> size();
     size_t nknotv = m_vKnot -> size();
 
-    glColor3f(1.0, 1.0, 1.0);
-
-    gluBeginSurface(nurb);
-
-        gluNurbsSurface( nurb,
-                        nknotu, (GLfloat *) &u_knot[0],
-                        nknotv, (GLfloat *) &v_knot[0],
-                        3, m_nu*3, // stride
-                        (GLfloat *)&points[0][0],
-                        m_uOrder, m_vOrder, //orders
-                        GL_MAP2_VERTEX_3
-                        );
-
-    gluEndSurface(nurb);
+    for ( size_t inst = 0; inst < iCtx.numInstances(); ++inst )
+    {
+        iCtx.pushInstance( inst );
+        glColor3f(1.0, 1.0, 1.0);
+
+        gluBeginSurface(nurb);
+
+            gluNurbsSurface( nurb,
+                            nknotu, (GLfloat *) &u_knot[0],
+                            nknotv, (GLfloat *) &v_knot[0],
+                            3, m_nu*3, // stride
+                            (GLfloat *)&points[0][0],
+                            m_uOrder, m_vOrder, //orders
+                            GL_MAP2_VERTEX_3
+                            );
+
+        gluEndSurface(nurb);
+        iCtx.popInstance();
+    }
 
 
     IObjectDrw::draw( iCtx );
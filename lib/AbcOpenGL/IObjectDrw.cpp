@@ -212,6 +212,38 @@ void IObjectDrw::setTime( chrono_t iTime )
     }
 }
 
+//-*****************************************************************************
+void IObjectDrw::prefetch( chrono_t iTime )
+{
+    if ( !m_object ) { return; }
+
+    for ( DrawablePtrVec::iterator iter = m_children.begin();
+          iter != m_children.end(); ++iter )
+    {
+        DrawablePtr dptr = (*iter);
+        if ( dptr )
+        {
+            dptr->prefetch( iTime );
+        }
+    }
+}
+
+//-*****************************************************************************
+size_t IObjectDrw::getNumPrimitives()
+{
+    size_t count = 0;
+    for ( DrawablePtrVec::iterator iter = m_children.begin();
+          iter != m_children.end(); ++iter )
+    {
+        DrawablePtr dptr = (*iter);
+        if ( dptr )
+        {
+            count += dptr->getNumPrimitives();
+        }
+    }
+    return count;
+}
+
 //-*****************************************************************************
 Box3d IObjectDrw::getBounds()
 {
@@ -237,14 +269,33 @@ void IObjectDrw::draw( const DrawContext &iCtx )
         }
     }
 
+    // children bounds are tested in the current object space
+    const Frustum &frustum = iCtx.getFrustum();
+    CullStats *stats = iCtx.getCullStats();
+
     // GL picking, add to global selection index
     int i = 0;
     for ( DrawablePtrVec::iterator iter = m_children.begin();
           iter != m_children.end(); ++iter, i++ )
     {
+        DrawablePtr dptr = (*iter);
+
+        // skip children entirely outside the view, unless they have
+        // descendants that don't inherit this transform
+        if ( dptr && iCtx.cull() )
+        {
+            Box3d bnds = dptr->getBounds();
+            if ( !bnds.isEmpty() && !frustum.intersects( bnds ) &&
+                 dptr->getNonInheritedBounds().isEmpty() )
+            {
+                if ( stats ) { stats->culled++; }
+                continue;
+            }
+            if ( stats ) { stats->drawn++; }
+        }
+
         Abc::IObject iChild = m_object.getChild( i );
         int index = pushName( iChild );
-        DrawablePtr dptr = (*iter);
         if ( dptr )
         {
             dptr->draw( iCtx );
@@ -63,6 +63,10 @@ public:
 
     virtual void setTime( chrono_t iSeconds );
 
+    virtual void prefetch( chrono_t iSeconds );
+
+    virtual size_t getNumPrimitives();
+
     virtual Box3d getBounds();
 
     virtual void draw( const DrawContext & iCtx );
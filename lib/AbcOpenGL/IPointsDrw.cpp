@@ -39,10 +39,97 @@
 namespace AbcOpenGL {
 namespace ABCOPENGL_VERSION_NS {
 
+//-*****************************************************************************
+// points drawn in the viewport being drawn, 0 for all, and the points
+// its clouds had in view when it was last drawn
+static size_t g_pointBudget = 0;
+static double g_lastPointsInView = 0.0;
+
+// points in view added up by the clouds drawn since setPointBudget
+static double g_pointsInView = 0.0;
+
+// decimated index arrays kept per points object
+static const size_t MAX_DECIMATED = 16;
+
+//-*****************************************************************************
+void setPointBudget( size_t iPoints, size_t iPointsInView )
+{
+    g_pointBudget = iPoints;
+    g_lastPointsInView = ( double )iPointsInView;
+    g_pointsInView = 0.0;
+}
+
+//-*****************************************************************************
+size_t getPointBudget()
+{
+    return g_pointBudget;
+}
+
+//-*****************************************************************************
+size_t getPointsInView()
+{
+    return ( size_t )g_pointsInView;
+}
+
+//-*****************************************************************************
+// Mixes a point id into 32 well distributed bits, so a threshold on the
+// result picks a random subset that stays the same from frame to frame.
+static inline Alembic::Util::uint32_t hashId( Alembic::Util::uint64_t iId )
+{
+    iId ^= iId >> 33;
+    iId *= 0xff51afd7ed558ccdULL;
+    iId ^= iId >> 33;
+    iId *= 0xc4ceb9fe1a85ec53ULL;
+    iId ^= iId >> 33;
+    return ( Alembic::Util::uint32_t )iId;
+}
+
+//-*****************************************************************************
+// Returns the fraction of the screen area covered by the bounds that is
+// inside the viewport, 1 when it can't be told.
+static double visibleFraction( const Box3d &iBounds,
+                               const M44d &objectToClip )
+{
+    if ( iBounds.isEmpty() ) { return 1.0; }
+
+    Box2d screen;
+    for ( int i = 0; i < 8; ++i )
+    {
+        V3d corner( i & 1 ? iBounds.max.x : iBounds.min.x,
+                    i & 2 ? iBounds.max.y : iBounds.min.y,
+                    i & 4 ? iBounds.max.z : iBounds.min.z );
+        double x, y, w;
+        x = corner.x * objectToClip[0][0] + corner.y * objectToClip[1][0] +
+            corner.z * objectToClip[2][0] + objectToClip[3][0];
+        y = corner.x * objectToClip[0][1] + corner.y * objectToClip[1][1] +
+            corner.z * objectToClip[2][1] + objectToClip[3][1];
+        w = corner.x * objectToClip[0][3] + corner.y * objectToClip[1][3] +
+            corner.z * objectToClip[2][3] + objectToClip[3][3];
+
+        // a corner behind the camera, the cloud surrounds the view
+        if ( w <= 0.0 ) { return 1.0; }
+        screen.extendBy( V2d( x / w, y / w ) );
+    }
+
+    V2d size = screen.size();
+    double area = size.x * size.y;
+    if ( area <= 0.0 ) { return 1.0; }
+
+    Box2d view( V2d( -1.0, -1.0 ), V2d( 1.0, 1.0 ) );
+    V2d inMin( std::max( screen.min.x, view.min.x ),
+               std::max( screen.min.y, view.min.y ) );
+    V2d inMax( std::min( screen.max.x, view.max.x ),
+               std::min( screen.max.y, view.max.y ) );
+    if ( inMin.x >= inMax.x || inMin.y >= inMax.y ) { return 0.0; }
+
+    return ( inMax.x - inMin.x ) * ( inMax.y - inMin.y ) / area;
+}
+
 //-*****************************************************************************
 IPointsDrw::IPointsDrw( IPoints &iPmesh )
   : IObjectDrw( iPmesh, false )
   , m_points( iPmesh )
+  , m_sampleIndex( 0 )
 {
     // Get out if problems.
     if ( !m_points.valid() )
@@ -105,9 +192,13 @@ void IPointsDrw::setTime( chrono_t iSeconds )
 
     // Use nearest for now.
     ISampleSelector ss( iSeconds, ISampleSelector::kNearIndex );
+    IPointsSchema &schema = m_points.getSchema();
     IPointsSchema::Sample psamp;
-    m_points.getSchema().get( psamp, ss );
+    schema.get( psamp, ss );
     m_positions = psamp.getPositions();
+    m_ids = psamp.getIds();
+    m_sampleIndex = ss.getIndex( schema.getTimeSampling(),
+                                 schema.getNumSamples() );
 
     // Update bounds from positions
     m_bounds.makeEmpty();
@@ -132,6 +223,97 @@ void IPointsDrw::setTime( chrono_t iSeconds )
     }
 }
 
+//-*****************************************************************************
+double IPointsDrw::pointsInView( const DrawContext &iCtx ) const
+{
+    size_t numPoints = m_positions ? m_positions->size() : 0;
+    if ( numPoints == 0 ) { return 0.0; }
+
+    M44d modelView;
+    M44d projection;
+    glGetDoublev( GL_MODELVIEW_MATRIX, ( GLdouble * )&(modelView[0][0]) );
+    glGetDoublev( GL_PROJECTION_MATRIX, ( GLdouble * )&(projection[0][0]) );
+
+    const std::vector<M44d> *instances = iCtx.getInstances();
+    if ( !instances )
+    {
+        return numPoints * visibleFraction( m_bounds,
+                                            modelView * projection );
+    }
+
+    // each instance is drawn with its transform on top of the modelview
+    double fraction = 0.0;
+    for ( size_t i = 0; i < instances->size(); ++i )
+    {
+        fraction += visibleFraction( m_bounds,
+                                     modelView * (*instances)[i] * projection );
+    }
+    return numPoints * fraction;
+}
+
+//-*****************************************************************************
+int IPointsDrw::decimationLevel( double iInView ) const
+{
+    if ( g_pointBudget == 0 ) { return 0; }
+
+    // the budget is split across the clouds in view in proportion to
+    // their points in view, so every cloud is halved the same number of
+    // times. Zooming in on part of the clouds keeps more of their points.
+    // The first draw of a viewport has no total yet and uses this cloud's.
+    double inView = std::max( g_lastPointsInView, iInView );
+    int level = 0;
+    while ( level < 31 && inView > g_pointBudget )
+    {
+        inView *= 0.5;
+        ++level;
+    }
+    return level;
+}
+
+//-*****************************************************************************
+IPointsDrw::IndexArrayPtr IPointsDrw::decimate( int iLevel )
+{
+    if ( iLevel <= 0 || !m_positions ) { return IndexArrayPtr(); }
+
+    std::pair<index_t, int> key( m_sampleIndex, iLevel );
+    std::map<std::pair<index_t, int>, IndexArrayPtr>::iterator iter =
+        m_decimated.find( key );
+    if ( iter != m_decimated.end() ) { return iter->second; }
+
+    // keep points whose hashed id is below the threshold, so the points
+    // kept at one level are also kept at every lower level
+    size_t numPoints = m_positions->size();
+    const Alembic::Util::uint64_t *ids = NULL;
+    if ( m_ids && m_ids->size() == numPoints ) { ids = m_ids->get(); }
+    Alembic::Util::uint32_t threshold = 0xffffffffU >> iLevel;
+
+    IndexArrayPtr indices( new IndexArray );
+    indices->reserve( ( numPoints >> iLevel ) + 1 );
+    for ( size_t i = 0; i < numPoints; ++i )
+    {
+        Alembic::Util::uint64_t id = ids ? ids[i] : i;
+        if ( hashId( id ) <= threshold )
+        {
+            indices->push_back( ( GLuint )i );
+        }
+    }
+
+    if ( m_decimated.size() >= MAX_DECIMATED ) { m_decimated.clear(); }
+    m_decimated[key] = indices;
+    return indices;
+}
+
+//-*****************************************************************************
+size_t IPointsDrw::getNumPrimitives()
+{
+    size_t count = IObjectDrw::getNumPrimitives();
+    if ( m_positions )
+    {
+        count += m_positions->size();
+    }
+    return count;
+}
+
 //-*****************************************************************************
 void IPointsDrw::draw( const DrawContext &iCtx )
 {
@@ -148,6 +330,16 @@ void IPointsDrw::draw( const DrawContext &iCtx )
 
     size_t numPoints = m_positions->size();
 
+    // a stable subset of the points, when over the point budget
+    IndexArrayPtr indices;
+    if ( g_pointBudget > 0 )
+    {
+        double inView = pointsInView( iCtx );
+        g_pointsInView += inView;
+        indices = decimate( decimationLevel( inView ) );
+    }
+    size_t numDrawn = indices ? indices->size() : numPoints;
+
     const V3f *points = m_positions->get();
     const C3f *colors = NULL;
     if ( m_colors  && ( m_colors->size() == numPoints ) )
@@ -165,11 +357,6 @@ void IPointsDrw::draw( const DrawContext &iCtx )
         glDisable( GL_LIGHTING );
     }
 
-    if ( !colors )
-    {
-        glColor3f( 1.0f, 1.0f, 1.0f );
-    }
-
     glEnable( GL_POINT_SMOOTH );
     glPointSize( iCtx.getPointSize() );
 
@@ -193,8 +380,27 @@ void IPointsDrw::draw( const DrawContext &iCtx )
         GL_NOISY( glVertexPointer( 3, GL_FLOAT, 0,
                                    ( const GLvoid * )points ) );
 
-        GL_NOISY( glDrawArrays( GL_POINTS,
-                                0, ( GLsizei )( numPoints ) ) );
+        // arrays are bound once for all instances
+        for ( size_t inst = 0; inst < iCtx.numInstances(); ++inst )
+        {
+            iCtx.pushInstance( inst );
+            if ( !colors )
+            {
+                glColor3f( 1.0f, 1.0f, 1.0f );
+            }
+            if ( indices && numDrawn > 0 )
+            {
+                GL_NOISY( glDrawElements( GL_POINTS, ( GLsizei )numDrawn,
+                                          GL_UNSIGNED_INT,
+                                          ( const GLvoid * )&(*indices)[0] ) );
+            }
+            else if ( !indices )
+            {
+                GL_NOISY( glDrawArrays( GL_POINTS,
+                                        0, ( GLsizei )( numPoints ) ) );
+            }
+            iCtx.popInstance();
+        }
 
         if ( colors )
         {
@@ -207,29 +413,39 @@ void IPointsDrw::draw( const DrawContext &iCtx )
         GL_NOISY( glDisableClientState( GL_VERTEX_ARRAY ) );
     }
 #else
-    glBegin( GL_POINTS );
-
-    for ( size_t i = 0; i < numPoints; ++i )
+    for ( size_t inst = 0; inst < iCtx.numInstances(); ++inst )
     {
-        const V3f &vert = (*m_positions)[i];
-
-        if ( colors )
+        iCtx.pushInstance( inst );
+        if ( !colors )
         {
-            const C3f &col = colors[i];
-            glColor3fv( ( const GLfloat * )&col );
+            glColor3f( 1.0f, 1.0f, 1.0f );
         }
+        glBegin( GL_POINTS );
 
-        if ( normals )
+        for ( size_t d = 0; d < numDrawn; ++d )
         {
-            const N3f &norm = normals[i];
-            glNormal3fv( ( const GLfloat * )&norm );
+            size_t i = indices ? (*indices)[d] : d;
+            const V3f &vert = (*m_positions)[i];
+
+            if ( colors )
+            {
+                const C3f &col = colors[i];
+                glColor3fv( ( const GLfloat * )&col );
+            }
+
+            if ( normals )
+            {
+                const N3f &norm = normals[i];
+                glNormal3fv( ( const GLfloat * )&norm );
+            }
+
+            glVertex3fv( ( const GLfloat * )&vert );
         }
 
-        glVertex3fv( ( const GLfloat * )&vert );
+        glEnd();
+        iCtx.popInstance();
     }
 
-    glEnd();
-
 #endif
 
     glEnable( GL_LIGHTING );
@@ -45,6 +45,19 @@
 namespace AbcOpenGL {
 namespace ABCOPENGL_VERSION_NS {
 
+//-*****************************************************************************
+//! Set the number of points drawn in the viewport about to be drawn,
+//! split across its point clouds, which are decimated to a stable subset.
+//! 0 draws every point. iPointsInView is getPointsInView() from the last
+//! draw of the same viewport, 0 if unknown.
+ABC_OPENGL_EXPORT void setPointBudget( size_t iPoints,
+                                       size_t iPointsInView = 0 );
+ABC_OPENGL_EXPORT size_t getPointBudget();
+
+//! Returns the number of points in view of the clouds drawn since the
+//! last setPointBudget, counted once per instance.
+ABC_OPENGL_EXPORT size_t getPointsInView();
+
 //-*****************************************************************************
 //! Draw a poly mesh!
 class ABC_OPENGL_EXPORT IPointsDrw : public IObjectDrw
@@ -58,9 +71,26 @@ public:
 
     virtual void setTime( chrono_t iSeconds );
 
+    virtual size_t getNumPrimitives();
+
     virtual void draw( const DrawContext & iCtx );
 
 protected:
+    typedef std::vector<GLuint> IndexArray;
+    typedef Alembic::Util::shared_ptr<IndexArray> IndexArrayPtr;
+
+    // Returns the number of points inside the viewport, added up over
+    // the instances the cloud is drawn with.
+    double pointsInView( const DrawContext & iCtx ) const;
+
+    // Returns how many times the points are halved to fit the point
+    // budget, given the points of this cloud in view.
+    int decimationLevel( double iInView ) const;
+
+    // Returns the indices of the points kept at a decimation level, or
+    // NULL to draw every point. Cached per sample index and level.
+    IndexArrayPtr decimate( int iLevel );
+
     IPoints m_points;
     IC3fArrayProperty m_colorProp;
     IN3fArrayProperty m_normalProp;
@@ -68,6 +98,10 @@ protected:
     P3fArraySamplePtr m_positions;
     C3fArraySamplePtr m_colors;
     N3fArraySamplePtr m_normals;
+    UInt64ArraySamplePtr m_ids;
+    index_t m_sampleIndex;
+
+    std::map<std::pair<index_t, int>, IndexArrayPtr> m_decimated;
 
 };
 
@@ -43,6 +43,7 @@ namespace ABCOPENGL_VERSION_NS {
 IPolyMeshDrw::IPolyMeshDrw( IPolyMesh &iPmesh )
   : IObjectDrw( iPmesh, false )
   , m_polyMesh( iPmesh )
+  , m_index( -1 )
 {
     // Get out if problems.
     if ( !m_polyMesh.valid() )
@@ -52,6 +53,10 @@ IPolyMeshDrw::IPolyMeshDrw( IPolyMesh &iPmesh )
 
     // set constancy on the mesh draw helper
     m_drwHelper.setConstant( m_polyMesh.getSchema().isConstant() );
+    if ( !m_polyMesh.getSchema().isConstant() )
+    {
+        m_diskKey = DiskCache::instance().makeKey( m_polyMesh );
+    }
 
     if ( m_polyMesh.getSchema().getNumSamples() > 0 )
     {
@@ -81,7 +86,7 @@ IPolyMeshDrw::IPolyMeshDrw( IPolyMesh &iPmesh )
 //-*****************************************************************************
 IPolyMeshDrw::~IPolyMeshDrw()
 {
-    // Nothing!
+    FrameCache::instance().erase( this );
 }
 
 //-*****************************************************************************
@@ -102,21 +107,122 @@ void IPolyMeshDrw::setTime( chrono_t iSeconds )
 
     // Use nearest for now.
     ISampleSelector ss( iSeconds, ISampleSelector::kNearIndex );
-    IPolyMeshSchema::Sample psamp;
+    IPolyMeshSchema &schema = m_polyMesh.getSchema();
+
+    // Animated meshes reuse decoded frames from the frame cache, and
+    // skip all work when the sample index has not changed.
+    bool cached = false;
+    if ( !schema.isConstant() && schema.getNumSamples() > 0 )
+    {
+        index_t index = ss.getIndex( schema.getTimeSampling(),
+                                     schema.getNumSamples() );
+        if ( index == m_index && m_drwHelper.valid() )
+        {
+            cached = true;
+        }
+        else
+        {
+            m_index = index;
+            MeshDrwHelper::FramePtr frame =
+                FrameCache::instance().get( this, index );
+            if ( !frame && !m_diskKey.empty() )
+            {
+                frame = DiskCache::instance().get( m_diskKey, index );
+                FrameCache::instance().put( this, index, frame );
+            }
+            if ( frame )
+            {
+                m_drwHelper.setFrame( frame );
+                cached = true;
+            }
+        }
+    }
+
+    if ( !cached )
+    {
+        IPolyMeshSchema::Sample psamp;
+
+        if ( m_polyMesh.getSchema().isConstant() )
+        {
+            psamp = m_samp;
+        }
+        else if ( m_polyMesh.getSchema().getNumSamples() > 0 )
+        {
+            m_polyMesh.getSchema().get( psamp, ss );
+        }
+
+        // Get the stuff.
+        P3fArraySamplePtr P = psamp.getPositions();
+        Int32ArraySamplePtr indices = psamp.getFaceIndices();
+        Int32ArraySamplePtr counts = psamp.getFaceCounts();
+
+        Box3d bounds;
+        bounds.makeEmpty();
+
+        if ( m_boundsProp && m_boundsProp.getNumSamples() > 0 )
+        {
+            bounds = m_boundsProp.getValue( ss );
+        }
+
+        // Update the mesh hoo-ha.
+        m_drwHelper.update( P, V3fArraySamplePtr(),
+                            indices, counts, bounds );
+        if ( m_index >= 0 && m_drwHelper.valid() )
+        {
+            MeshDrwHelper::FramePtr frame = m_drwHelper.getFrame();
+            FrameCache::instance().put( this, m_index, frame );
+            if ( !m_diskKey.empty() )
+            {
+                DiskCache::instance().put( m_diskKey, m_index, frame );
+            }
+        }
+    }
+
+    // The Object update computed child bounds.
+    // Extend them by this.
+    if ( !m_drwHelper.getBounds().isEmpty() )
+    {
+        m_bounds.extendBy( m_drwHelper.getBounds() );
+    }
+}
 
-    if ( m_polyMesh.getSchema().isConstant() )
+//-*****************************************************************************
+void IPolyMeshDrw::prefetch( chrono_t iSeconds )
+{
+    IObjectDrw::prefetch( iSeconds );
+    if ( !valid() )
     {
-        psamp = m_samp;
+        return;
     }
-    else if ( m_polyMesh.getSchema().getNumSamples() > 0 )
+
+    IPolyMeshSchema &schema = m_polyMesh.getSchema();
+    if ( schema.isConstant() || schema.getNumSamples() == 0 )
     {
-        m_polyMesh.getSchema().get( psamp, ss );
+        return;
     }
 
-    // Get the stuff.
-    P3fArraySamplePtr P = psamp.getPositions();
-    Int32ArraySamplePtr indices = psamp.getFaceIndices();
-    Int32ArraySamplePtr counts = psamp.getFaceCounts();
+    ISampleSelector ss( iSeconds, ISampleSelector::kNearIndex );
+    index_t index = ss.getIndex( schema.getTimeSampling(),
+                                 schema.getNumSamples() );
+    if ( FrameCache::instance().contains( this, index ) )
+    {
+        return;
+    }
+
+    // Frames cached on disk are mapped rather than decoded.
+    if ( !m_diskKey.empty() )
+    {
+        MeshDrwHelper::FramePtr frame =
+            DiskCache::instance().get( m_diskKey, index );
+        if ( frame )
+        {
+            FrameCache::instance().put( this, index, frame );
+            return;
+        }
+    }
+
+    IPolyMeshSchema::Sample psamp;
+    schema.get( psamp, ss );
 
     Box3d bounds;
     bounds.makeEmpty();
@@ -126,18 +232,31 @@ void IPolyMeshDrw::setTime( chrono_t iSeconds )
         bounds = m_boundsProp.getValue( ss );
     }
 
-    // Update the mesh hoo-ha.
-    m_drwHelper.update( P, V3fArraySamplePtr(),
-                        indices, counts, bounds );
+    // Start from the previous frame, if cached, so unchanged topology
+    // is not triangulated again.
+    MeshDrwHelper helper;
+    helper.setConstant( false ); // only animated meshes get here
+    helper.setFrame( FrameCache::instance().peek( this, index - 1 ) );
+    helper.update( psamp.getPositions(), V3fArraySamplePtr(),
+                   psamp.getFaceIndices(), psamp.getFaceCounts(), bounds );
 
-    // The Object update computed child bounds.
-    // Extend them by this.
-    if ( !m_drwHelper.getBounds().isEmpty() )
+    if ( helper.valid() )
     {
-        m_bounds.extendBy( m_drwHelper.getBounds() );
+        MeshDrwHelper::FramePtr frame = helper.getFrame();
+        FrameCache::instance().put( this, index, frame );
+        if ( !m_diskKey.empty() )
+        {
+            DiskCache::instance().put( m_diskKey, index, frame );
+        }
     }
 }
 
+//-*****************************************************************************
+size_t IPolyMeshDrw::getNumPrimitives()
+{
+    return IObjectDrw::getNumPrimitives() + m_drwHelper.getNumTriangles();
+}
+
 //-*****************************************************************************
 void IPolyMeshDrw::draw( const DrawContext &iCtx )
 {
@@ -43,6 +43,7 @@ namespace ABCOPENGL_VERSION_NS {
 ISubDDrw::ISubDDrw( ISubD &iPmesh )
   : IObjectDrw( iPmesh, false )
   , m_subD( iPmesh )
+  , m_index( -1 )
 {
     // Get out if problems.
     if ( !m_subD.valid() )
@@ -52,6 +53,10 @@ ISubDDrw::ISubDDrw( ISubD &iPmesh )
 
     // set constancy on the mesh draw helper
     m_drwHelper.setConstant( m_subD.getSchema().isConstant() );
+    if ( !m_subD.getSchema().isConstant() )
+    {
+        m_diskKey = DiskCache::instance().makeKey( m_subD );
+    }
 
     if ( m_subD.getSchema().getNumSamples() > 0 )
     {
@@ -81,7 +86,7 @@ ISubDDrw::ISubDDrw( ISubD &iPmesh )
 //-*****************************************************************************
 ISubDDrw::~ISubDDrw()
 {
-    // Nothing!
+    FrameCache::instance().erase( this );
 }
 
 //-*****************************************************************************
@@ -102,31 +107,74 @@ void ISubDDrw::setTime( chrono_t iSeconds )
 
     // Use nearest for now.
     ISampleSelector ss( iSeconds, ISampleSelector::kNearIndex );
-    ISubDSchema::Sample psamp;
+    ISubDSchema &schema = m_subD.getSchema();
 
-    if ( m_subD.getSchema().isConstant() )
+    // Animated meshes reuse decoded frames from the frame cache, and
+    // skip all work when the sample index has not changed.
+    bool cached = false;
+    if ( !schema.isConstant() && schema.getNumSamples() > 0 )
     {
-        psamp = m_samp;
+        index_t index = ss.getIndex( schema.getTimeSampling(),
+                                     schema.getNumSamples() );
+        if ( index == m_index && m_drwHelper.valid() )
+        {
+            cached = true;
+        }
+        else
+        {
+            m_index = index;
+            MeshDrwHelper::FramePtr frame =
+                FrameCache::instance().get( this, index );
+            if ( !frame && !m_diskKey.empty() )
+            {
+                frame = DiskCache::instance().get( m_diskKey, index );
+                FrameCache::instance().put( this, index, frame );
+            }
+            if ( frame )
+            {
+                m_drwHelper.setFrame( frame );
+                cached = true;
+            }
+        }
     }
-    else if ( m_subD.getSchema().getNumSamples() > 0 )
+
+    if ( !cached )
     {
-        m_subD.getSchema().get( psamp, ss );
-    }
+        ISubDSchema::Sample psamp;
 
-    // Get the stuff.
-    P3fArraySamplePtr P = psamp.getPositions();
-    Int32ArraySamplePtr indices = psamp.getFaceIndices();
-    Int32ArraySamplePtr counts = psamp.getFaceCounts();
+        if ( m_subD.getSchema().isConstant() )
+        {
+            psamp = m_samp;
+        }
+        else if ( m_subD.getSchema().getNumSamples() > 0 )
+        {
+            m_subD.getSchema().get( psamp, ss );
+        }
 
-    Box3d bounds;
-    bounds.makeEmpty();
+        // Get the stuff.
+        P3fArraySamplePtr P = psamp.getPositions();
+        Int32ArraySamplePtr indices = psamp.getFaceIndices();
+        Int32ArraySamplePtr counts = psamp.getFaceCounts();
 
-    if ( m_boundsProp && m_boundsProp.getNumSamples() > 0 )
-    { bounds = m_boundsProp.getValue( ss ); }
+        Box3d bounds;
+        bounds.makeEmpty();
+
+        if ( m_boundsProp && m_boundsProp.getNumSamples() > 0 )
+        { bounds = m_boundsProp.getValue( ss ); }
 
-    // Update the mesh hoo-ha.
-    m_drwHelper.update( P, V3fArraySamplePtr(),
-                        indices, counts, bounds );
+        // Update the mesh hoo-ha.
+        m_drwHelper.update( P, V3fArraySamplePtr(),
+                            indices, counts, bounds );
+        if ( m_index >= 0 && m_drwHelper.valid() )
+        {
+            MeshDrwHelper::FramePtr frame = m_drwHelper.getFrame();
+            FrameCache::instance().put( this, m_index, frame );
+            if ( !m_diskKey.empty() )
+            {
+                DiskCache::instance().put( m_diskKey, m_index, frame );
+            }
+        }
+    }
 
     if ( !m_drwHelper.valid() )
     {
@@ -142,6 +190,77 @@ void ISubDDrw::setTime( chrono_t iSeconds )
     }
 }
 
+//-*****************************************************************************
+void ISubDDrw::prefetch( chrono_t iSeconds )
+{
+    IObjectDrw::prefetch( iSeconds );
+    if ( !valid() )
+    {
+        return;
+    }
+
+    ISubDSchema &schema = m_subD.getSchema();
+    if ( schema.isConstant() || schema.getNumSamples() == 0 )
+    {
+        return;
+    }
+
+    ISampleSelector ss( iSeconds, ISampleSelector::kNearIndex );
+    index_t index = ss.getIndex( schema.getTimeSampling(),
+                                 schema.getNumSamples() );
+    if ( FrameCache::instance().contains( this, index ) )
+    {
+        return;
+    }
+
+    // Frames cached on disk are mapped rather than decoded.
+    if ( !m_diskKey.empty() )
+    {
+        MeshDrwHelper::FramePtr frame =
+            DiskCache::instance().get( m_diskKey, index );
+        if ( frame )
+        {
+            FrameCache::instance().put( this, index, frame );
+            return;
+        }
+    }
+
+    ISubDSchema::Sample psamp;
+    schema.get( psamp, ss );
+
+    Box3d bounds;
+    bounds.makeEmpty();
+
+    if ( m_boundsProp && m_boundsProp.getNumSamples() > 0 )
+    {
+        bounds = m_boundsProp.getValue( ss );
+    }
+
+    // Start from the previous frame, if cached, so unchanged topology
+    // is not triangulated again.
+    MeshDrwHelper helper;
+    helper.setConstant( false ); // only animated meshes get here
+    helper.setFrame( FrameCache::instance().peek( this, index - 1 ) );
+    helper.update( psamp.getPositions(), V3fArraySamplePtr(),
+                   psamp.getFaceIndices(), psamp.getFaceCounts(), bounds );
+
+    if ( helper.valid() )
+    {
+        MeshDrwHelper::FramePtr frame = helper.getFrame();
+        FrameCache::instance().put( this, index, frame );
+        if ( !m_diskKey.empty() )
+        {
+            DiskCache::instance().put( m_diskKey, index, frame );
+        }
+    }
+}
+
+//-*****************************************************************************
+size_t ISubDDrw::getNumPrimitives()
+{
+    return IObjectDrw::getNumPrimitives() + m_drwHelper.getNumTriangles();
+}
+
 //-*****************************************************************************
 void ISubDDrw::draw( const DrawContext &iCtx )
 {
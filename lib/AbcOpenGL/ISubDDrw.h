@@ -41,6 +41,8 @@
 #include "Foundation.h"
 #include "IObjectDrw.h"
 #include "MeshDrwHelper.h"
+#include "FrameCache.h"
+#include "DiskCache.h"
 
 namespace AbcOpenGL {
 namespace ABCOPENGL_VERSION_NS {
@@ -58,6 +60,10 @@ public:
 
     virtual void setTime( chrono_t iSeconds );
 
+    virtual void prefetch( chrono_t iSeconds );
+
+    virtual size_t getNumPrimitives();
+
     virtual void draw( const DrawContext & iCtx );
 
 protected:
@@ -65,6 +71,12 @@ protected:
     ISubDSchema::Sample m_samp;
     IBox3dProperty m_boundsProp;
     MeshDrwHelper m_drwHelper;
+
+    // sample index currently held by the draw helper
+    index_t m_index;
+
+    // disk cache key prefix, empty when not cached on disk
+    std::string m_diskKey;
 };
 
 } // End namespace ABCOPENGL_VERSION_NS
@@ -177,8 +177,19 @@ void IXformDrw::draw( const DrawContext & iCtx )
         glLoadMatrixd( ( const GLdouble * )&cameraLocal[0][0] );
     }
 
-    // Now draw.
-    IObjectDrw::draw( iCtx );
+    // Now draw, with the cull frustum moved into our space.
+    if ( iCtx.cull() )
+    {
+        DrawContext ctx( iCtx );
+        ctx.setFrustum( m_inherits ?
+            iCtx.getFrustum().transformed( m_localToParent ) :
+            iCtx.getWorldFrustum().transformed( m_localToParent ) );
+        IObjectDrw::draw( ctx );
+    }
+    else
+    {
+        IObjectDrw::draw( iCtx );
+    }
 
     // And back out, restore the matrix.
     glMatrixMode( GL_MODELVIEW );
@@ -39,15 +39,80 @@
 namespace AbcOpenGL {
 namespace ABCOPENGL_VERSION_NS {
 
+//-*****************************************************************************
+// bytes held in mesh buffer objects and buffer objects waiting to be
+// deleted, helpers can be destroyed on any thread
+static size_t g_bufferBytes = 0;
+static std::vector<GLuint> g_deletedBuffers;
+static Alembic::Util::mutex g_bufferMutex;
+
+//-*****************************************************************************
+bool hasBufferObjects()
+{
+#ifdef PLATFORM_DARWIN
+    return true;
+#else
+#ifndef ABCVIEW_GLEW_MX
+    // GLEW entry points are loaded once a context is current
+    static bool initialized = false;
+    if ( !initialized )
+    {
+        initialized = ( glewInit() == GLEW_OK );
+        if ( !initialized ) { return false; }
+    }
+#endif
+    return GLEW_VERSION_1_5 ? true : false;
+#endif
+}
+
+//-*****************************************************************************
+size_t getBufferBytes()
+{
+    Alembic::Util::scoped_lock l( g_bufferMutex );
+    return g_bufferBytes;
+}
+
+//-*****************************************************************************
+void flushBufferDeletes()
+{
+    std::vector<GLuint> buffers;
+    {
+        Alembic::Util::scoped_lock l( g_bufferMutex );
+        buffers.swap( g_deletedBuffers );
+    }
+    if ( !buffers.empty() )
+    {
+        GL_NOISY( glDeleteBuffers( ( GLsizei )buffers.size(), &buffers[0] ) );
+    }
+}
+
+//-*****************************************************************************
+static void bufferData( GLenum iTarget, size_t &ioBytes, size_t iBytes,
+                        const GLvoid *iData, GLenum iUsage )
+{
+    GL_NOISY( glBufferData( iTarget, ( GLsizeiptr )iBytes, iData, iUsage ) );
+    Alembic::Util::scoped_lock l( g_bufferMutex );
+    g_bufferBytes -= ioBytes;
+    g_bufferBytes += iBytes;
+    ioBytes = iBytes;
+}
+
 //-*****************************************************************************
 MeshDrwHelper::MeshDrwHelper()
 {
+    for ( int i = 0; i < 3; ++i )
+    {
+        m_buffers[i] = 0;
+        m_bufferBytes[i] = 0;
+    }
+    m_isConstant = false;
     makeInvalid();
 }
 
 //-*****************************************************************************
 MeshDrwHelper::~MeshDrwHelper()
 {
+    releaseBuffers();
     makeInvalid();
 }
 
@@ -83,7 +148,10 @@ void MeshDrwHelper::update( P3fArraySamplePtr iP,
     m_meshP = iP;
     m_meshIndices = iIndices;
     m_meshCounts = iCounts;
-    m_triangles.clear ();
+
+    // Frames in the frame cache may still share the old triangles.
+    m_triangles.reset( new TriArray );
+    TriArray &triangles = *m_triangles;
 
     // Check stuff.
     if ( !m_meshP ||
@@ -162,13 +230,13 @@ void MeshDrwHelper::update( P3fArraySamplePtr iP,
         // Make triangles to fill this face.
         if ( goodFace && count > 2 )
         {
-            m_triangles.push_back(
+            triangles.push_back(
                 Tri( ( unsigned int )(*m_meshIndices)[faceIndexBegin+0],
                      ( unsigned int )(*m_meshIndices)[faceIndexBegin+1],
                      ( unsigned int )(*m_meshIndices)[faceIndexBegin+2] ) );
             for ( size_t c = 3; c < count; ++c )
             {
-                m_triangles.push_back(
+                triangles.push_back(
                     Tri( ( unsigned int )(*m_meshIndices)[faceIndexBegin+0],
                          ( unsigned int )(*m_meshIndices)[faceIndexBegin+c-1],
                          ( unsigned int )(*m_meshIndices)[faceIndexBegin+c]
@@ -237,27 +305,29 @@ void MeshDrwHelper::updateNormals( V3fArraySamplePtr iN )
 
     // Now see if we need to calculate normals.
     if ( ( m_meshN && iN == m_meshN ) ||
-         ( isConstant() && m_customN.size() > 0 ) )
+         ( isConstant() && m_customN && m_customN->size() > 0 ) )
     {
         return;
     }
 
     size_t numPoints = m_meshP->size();
     m_meshN = iN;
-    m_customN.clear();
+    m_customN.reset();
 
     // Right now we only handle "vertex varying" normals,
     // which have the same cardinality as the points
     if ( !m_meshN || m_meshN->size() != numPoints )
     {
-        // Make some custom normals.
+        // Make some custom normals. These are always freshly allocated,
+        // as cached frames may share the previous ones.
         m_meshN.reset();
-        m_customN.resize( numPoints );
-        std::fill( m_customN.begin(), m_customN.end(), V3f( 0.0f ) );
+        m_customN.reset( new std::vector<V3f>( numPoints, V3f( 0.0f ) ) );
+        std::vector<V3f> &customN = *m_customN;
+        const TriArray &triangles = *m_triangles;
 
-        for ( size_t tidx = 0; tidx < m_triangles.size(); ++tidx )
+        for ( size_t tidx = 0; tidx < triangles.size(); ++tidx )
         {
-            const Tri &tri = m_triangles[tidx];
+            const Tri &tri = triangles[tidx];
 
             const V3f &A = (*m_meshP)[tri[0]];
             const V3f &B = (*m_meshP)[tri[1]];
@@ -267,15 +337,15 @@ void MeshDrwHelper::updateNormals( V3fArraySamplePtr iN )
             V3f AC = C - A;
 
             V3f wN = AC.cross( AB );
-            m_customN[tri[0]] += wN;
-            m_customN[tri[1]] += wN;
-            m_customN[tri[2]] += wN;
+            customN[tri[0]] += wN;
+            customN[tri[1]] += wN;
+            customN[tri[2]] += wN;
         }
 
         // Normalize normals.
         for ( size_t nidx = 0; nidx < numPoints; ++nidx )
         {
-            m_customN[nidx].normalize();
+            customN[nidx].normalize();
         }
     }
 }
@@ -283,7 +353,12 @@ void MeshDrwHelper::updateNormals( V3fArraySamplePtr iN )
 //-*****************************************************************************
 void MeshDrwHelper::drawBounds( const DrawContext & iCtx ) const
 {
-    drawBoundingBox( m_bounds );
+    for ( size_t inst = 0; inst < iCtx.numInstances(); ++inst )
+    {
+        iCtx.pushInstance( inst );
+        drawBoundingBox( m_bounds );
+        iCtx.popInstance();
+    }
 }
 
 //-*****************************************************************************
@@ -352,24 +427,30 @@ void drawBoundingBox( const Box3d bounds, const int mode )
 void MeshDrwHelper::draw( const DrawContext & iCtx ) const
 {
     // Bail if invalid.
-    if ( !m_valid || m_triangles.size() < 1 || !m_meshP )
+    if ( !m_valid || !m_triangles || m_triangles->size() < 1 || !m_meshP )
     {
         return;
     }
 
+    const TriArray &triangles = *m_triangles;
     const V3f *points = m_meshP->get();
     const V3f *normals = NULL;
     if ( m_meshN  && ( m_meshN->size() == m_meshP->size() ) )
     {
         normals = m_meshN->get();
     }
-    else if ( m_customN.size() == m_meshP->size() )
+    else if ( m_customN && m_customN->size() == m_meshP->size() )
     {
-        normals = &(m_customN.front());
+        normals = &(m_customN->front());
     }
 
 #ifndef SIMPLE_ABC_VIEWER_NO_GL_CLIENT_STATE
 //#if 0
+    if ( iCtx.useBuffers() && hasBufferObjects() )
+    {
+        drawBuffers( iCtx, normals );
+    }
+    else
     {
         GL_NOISY( glEnableClientState( GL_VERTEX_ARRAY ) );
         if ( normals )
@@ -382,10 +463,16 @@ void MeshDrwHelper::draw( const DrawContext & iCtx ) const
         GL_NOISY( glVertexPointer( 3, GL_FLOAT, 0,
                                    ( const GLvoid * )points ) );
 
-        GL_NOISY( glDrawElements( GL_TRIANGLES,
-                                  ( GLsizei )m_triangles.size() * 3,
-                                  GL_UNSIGNED_INT,
-                                  ( const GLvoid * )&(m_triangles[0]) ) );
+        // arrays are bound once for all instances
+        for ( size_t inst = 0; inst < iCtx.numInstances(); ++inst )
+        {
+            iCtx.pushInstance( inst );
+            GL_NOISY( glDrawElements( GL_TRIANGLES,
+                                      ( GLsizei )triangles.size() * 3,
+                                      GL_UNSIGNED_INT,
+                                      ( const GLvoid * )&(triangles[0]) ) );
+            iCtx.popInstance();
+        }
 
         if ( normals )
         {
@@ -394,52 +481,152 @@ void MeshDrwHelper::draw( const DrawContext & iCtx ) const
         GL_NOISY( glDisableClientState( GL_VERTEX_ARRAY ) );
     }
 #else
-    glBegin( GL_TRIANGLES );
-
-    for ( size_t i = 0; i < m_triangles.size(); ++i )
+    for ( size_t inst = 0; inst < iCtx.numInstances(); ++inst )
     {
-        const Tri &tri = m_triangles[i];
-        const V3f &vertA = points[tri[0]];
-        const V3f &vertB = points[tri[1]];
-        const V3f &vertC = points[tri[2]];
+        iCtx.pushInstance( inst );
+        glBegin( GL_TRIANGLES );
 
-        if ( normals )
+        for ( size_t i = 0; i < triangles.size(); ++i )
         {
-            const V3f &normA = normals[tri[0]];
-            glNormal3fv( ( const GLfloat * )&normA );
-            glVertex3fv( ( const GLfloat * )&vertA );
+            const Tri &tri = triangles[i];
+            const V3f &vertA = points[tri[0]];
+            const V3f &vertB = points[tri[1]];
+            const V3f &vertC = points[tri[2]];
 
-            const V3f &normB = normals[tri[1]];
-            glNormal3fv( ( const GLfloat * )&normB );
-            glVertex3fv( ( const GLfloat * )&vertB );
+            if ( normals )
+            {
+                const V3f &normA = normals[tri[0]];
+                glNormal3fv( ( const GLfloat * )&normA );
+                glVertex3fv( ( const GLfloat * )&vertA );
 
-            const V3f &normC = normals[tri[2]];
-            glNormal3fv( ( const GLfloat * )&normC );
-            glVertex3fv( ( const GLfloat * )&vertC );
-        }
-        else
-        {
-            V3f AB = vertB - vertA;
-            V3f AC = vertC - vertA;
-            V3f N = AC.cross( AB );
-            if ( N.length() > 1.0e-4f )
+                const V3f &normB = normals[tri[1]];
+                glNormal3fv( ( const GLfloat * )&normB );
+                glVertex3fv( ( const GLfloat * )&vertB );
+
+                const V3f &normC = normals[tri[2]];
+                glNormal3fv( ( const GLfloat * )&normC );
+                glVertex3fv( ( const GLfloat * )&vertC );
+            }
+            else
             {
-                N.normalize();
-                glNormal3fv( ( const GLfloat * )&N );
+                V3f AB = vertB - vertA;
+                V3f AC = vertC - vertA;
+                V3f N = AC.cross( AB );
+                if ( N.length() > 1.0e-4f )
+                {
+                    N.normalize();
+                    glNormal3fv( ( const GLfloat * )&N );
+                }
+
+                glVertex3fv( ( const GLfloat * )&vertA );
+
+                glVertex3fv( ( const GLfloat * )&vertB );
+
+                glVertex3fv( ( const GLfloat * )&vertC );
             }
 
-            glVertex3fv( ( const GLfloat * )&vertA );
+        }
 
-            glVertex3fv( ( const GLfloat * )&vertB );
+        glEnd();
+        iCtx.popInstance();
+    }
 
-            glVertex3fv( ( const GLfloat * )&vertC );
+#endif
+}
+
+//-*****************************************************************************
+void MeshDrwHelper::drawBuffers( const DrawContext & iCtx,
+                                 const V3f *normals ) const
+{
+    const TriArray &triangles = *m_triangles;
+
+    // animated meshes are uploaded again when their sample changes
+    GLenum usage = m_isConstant ? GL_STATIC_DRAW : GL_DYNAMIC_DRAW;
+
+    if ( !m_buffers[0] )
+    {
+        GL_NOISY( glGenBuffers( 3, m_buffers ) );
+    }
+
+    GL_NOISY( glEnableClientState( GL_VERTEX_ARRAY ) );
+    GL_NOISY( glBindBuffer( GL_ARRAY_BUFFER, m_buffers[0] ) );
+    if ( m_bufferP != m_meshP )
+    {
+        bufferData( GL_ARRAY_BUFFER, m_bufferBytes[0],
+                    m_meshP->size() * sizeof( V3f ),
+                    ( const GLvoid * )m_meshP->get(), usage );
+        m_bufferP = m_meshP;
+    }
+    GL_NOISY( glVertexPointer( 3, GL_FLOAT, 0, ( const GLvoid * )0 ) );
+
+    if ( normals )
+    {
+        GL_NOISY( glEnableClientState( GL_NORMAL_ARRAY ) );
+        GL_NOISY( glBindBuffer( GL_ARRAY_BUFFER, m_buffers[1] ) );
+        if ( m_bufferMeshN != m_meshN || m_bufferCustomN != m_customN )
+        {
+            bufferData( GL_ARRAY_BUFFER, m_bufferBytes[1],
+                        m_meshP->size() * sizeof( V3f ),
+                        ( const GLvoid * )normals, usage );
+            m_bufferMeshN = m_meshN;
+            m_bufferCustomN = m_customN;
         }
+        GL_NOISY( glNormalPointer( GL_FLOAT, 0, ( const GLvoid * )0 ) );
+    }
 
+    GL_NOISY( glBindBuffer( GL_ELEMENT_ARRAY_BUFFER, m_buffers[2] ) );
+    if ( m_bufferTriangles != m_triangles )
+    {
+        bufferData( GL_ELEMENT_ARRAY_BUFFER, m_bufferBytes[2],
+                    triangles.size() * sizeof( Tri ),
+                    ( const GLvoid * )&(triangles[0]), usage );
+        m_bufferTriangles = m_triangles;
     }
 
-    glEnd();
+    // buffers are bound once for all instances
+    for ( size_t inst = 0; inst < iCtx.numInstances(); ++inst )
+    {
+        iCtx.pushInstance( inst );
+        GL_NOISY( glDrawElements( GL_TRIANGLES,
+                                  ( GLsizei )triangles.size() * 3,
+                                  GL_UNSIGNED_INT,
+                                  ( const GLvoid * )0 ) );
+        iCtx.popInstance();
+    }
 
-#endif
+    GL_NOISY( glBindBuffer( GL_ELEMENT_ARRAY_BUFFER, 0 ) );
+    GL_NOISY( glBindBuffer( GL_ARRAY_BUFFER, 0 ) );
+    if ( normals )
+    {
+        GL_NOISY( glDisableClientState( GL_NORMAL_ARRAY ) );
+    }
+    GL_NOISY( glDisableClientState( GL_VERTEX_ARRAY ) );
+}
+
+//-*****************************************************************************
+void MeshDrwHelper::releaseBuffers() const
+{
+    // there may be no context current here, or one from another share
+    // group, so the buffers are deleted by the next flushBufferDeletes()
+    if ( m_buffers[0] )
+    {
+        Alembic::Util::scoped_lock l( g_bufferMutex );
+        g_deletedBuffers.insert( g_deletedBuffers.end(),
+                                 m_buffers, m_buffers + 3 );
+        for ( int i = 0; i < 3; ++i )
+        {
+            g_bufferBytes -= m_bufferBytes[i];
+        }
+    }
+    for ( int i = 0; i < 3; ++i )
+    {
+        m_buffers[i] = 0;
+        m_bufferBytes[i] = 0;
+    }
+    m_bufferP.reset();
+    m_bufferMeshN.reset();
+    m_bufferCustomN.reset();
+    m_bufferTriangles.reset();
 }
 
 //-*****************************************************************************
@@ -449,10 +636,82 @@ void MeshDrwHelper::makeInvalid()
     m_meshN.reset();
     m_meshIndices.reset();
     m_meshCounts.reset();
-    m_customN.clear();
+    m_customN.reset();
     m_valid = false;
     m_bounds.makeEmpty();
-    m_triangles.clear();
+    m_triangles.reset();
+}
+
+//-*****************************************************************************
+size_t MeshDrwHelper::Frame::bytes() const
+{
+    typedef Int32ArraySample::value_type int32;
+
+    size_t total = sizeof( Frame );
+    if ( P )
+    {
+        total += P->size() * sizeof( V3f );
+    }
+    if ( N )
+    {
+        total += N->size() * sizeof( V3f );
+    }
+    if ( indices )
+    {
+        total += indices->size() * sizeof( int32 );
+    }
+    if ( counts )
+    {
+        total += counts->size() * sizeof( int32 );
+    }
+    if ( customN )
+    {
+        total += customN->size() * sizeof( V3f );
+    }
+    if ( triangles )
+    {
+        total += triangles->size() * sizeof( Tri );
+    }
+    return total;
+}
+
+//-*****************************************************************************
+MeshDrwHelper::FramePtr MeshDrwHelper::getFrame() const
+{
+    FramePtr frame;
+    if ( !m_valid )
+    {
+        return frame;
+    }
+
+    frame.reset( new Frame );
+    frame->P = m_meshP;
+    frame->N = m_meshN;
+    frame->indices = m_meshIndices;
+    frame->counts = m_meshCounts;
+    frame->customN = m_customN;
+    frame->triangles = m_triangles;
+    frame->bounds = m_bounds;
+    return frame;
+}
+
+//-*****************************************************************************
+void MeshDrwHelper::setFrame( FramePtr iFrame )
+{
+    if ( !iFrame || !iFrame->P || !iFrame->triangles )
+    {
+        makeInvalid();
+        return;
+    }
+
+    m_meshP = iFrame->P;
+    m_meshN = iFrame->N;
+    m_meshIndices = iFrame->indices;
+    m_meshCounts = iFrame->counts;
+    m_customN = iFrame->customN;
+    m_triangles = iFrame->triangles;
+    m_bounds = iFrame->bounds;
+    m_valid = true;
 }
 
 //-*****************************************************************************
@@ -48,12 +48,46 @@ namespace ABCOPENGL_VERSION_NS {
 ABC_OPENGL_EXPORT void 
 drawBoundingBox( const Box3d bounds, const int mode = GL_LINES );
 
+//-*****************************************************************************
+//! Returns true if the current GL context supports vertex buffer objects.
+ABC_OPENGL_EXPORT bool hasBufferObjects();
+
+//! Returns the number of bytes held in mesh buffer objects.
+ABC_OPENGL_EXPORT size_t getBufferBytes();
+
+//! Deletes the buffer objects released since the last call. Needs a
+//! current context in the share group the buffers were made in.
+ABC_OPENGL_EXPORT void flushBufferDeletes();
+
 //-*****************************************************************************
 //! \brief Both the SubD and PolyMesh classes draw in the same way, so we
 //! create this helper class to do the common work.
 class ABC_OPENGL_EXPORT MeshDrwHelper : private Alembic::Util::noncopyable
 {
 public:
+    typedef Imath::Vec3<unsigned int> Tri;
+    typedef std::vector<Tri> TriArray;
+    typedef Alembic::Util::shared_ptr<TriArray> TriArrayPtr;
+    typedef Alembic::Util::shared_ptr<std::vector<V3f> > V3fVectorPtr;
+
+    //! Draw-ready state of the helper for one sample. A frame shares its
+    //! arrays with the helper, so keeping one in the FrameCache is cheap.
+    struct Frame
+    {
+        P3fArraySamplePtr P;
+        V3fArraySamplePtr N;
+        Int32ArraySamplePtr indices;
+        Int32ArraySamplePtr counts;
+        V3fVectorPtr customN;
+        TriArrayPtr triangles;
+        Box3d bounds;
+
+        //! Approximate memory held by the frame, in bytes. Arrays shared
+        //! with other frames, like constant topology, are counted in each.
+        size_t bytes() const;
+    };
+    typedef Alembic::Util::shared_ptr<Frame> FramePtr;
+
     // Default constructor
     MeshDrwHelper();
 
@@ -86,34 +120,59 @@ public:
     // Return the bounds.
     Box3d getBounds() const { return m_bounds; }
 
+    // Return the number of triangles drawn.
+    size_t getNumTriangles() const
+    { return m_triangles ? m_triangles->size() : 0; }
+
     // And, finally, this draws.
     //static void drawBounds( const Box3d bounds, const C3f *color = NULL );
     void drawBounds( const DrawContext & iCtx ) const;
     void draw( const DrawContext & iCtx ) const;
 
+    // Releases the buffer objects, they are deleted by the next
+    // flushBufferDeletes().
+    void releaseBuffers() const;
+
     // This is a weird thing. Just makes the helper invalid
     // by nulling everything out. For internal use.
     void makeInvalid();
 
+    // Returns a snapshot of the current draw-ready state, or an
+    // empty pointer if the helper is invalid.
+    FramePtr getFrame() const;
+
+    // Restores a snapshot made by getFrame().
+    void setFrame( FramePtr iFrame );
+
 protected:
     void computeBounds();
 
-    typedef Imath::Vec3<unsigned int> Tri;
-    typedef std::vector<Tri> TriArray;
+    // Draws from buffer objects, uploading the arrays that changed
+    // since the last draw.
+    void drawBuffers( const DrawContext & iCtx, const V3f *normals ) const;
 
     P3fArraySamplePtr m_meshP;
     V3fArraySamplePtr m_meshN;
     Int32ArraySamplePtr m_meshIndices;
     Int32ArraySamplePtr m_meshCounts;
 
-    std::vector<V3f> m_customN;
+    V3fVectorPtr m_customN;
 
     bool m_valid;
     bool m_isConstant;
 
     Box3d m_bounds;
 
-    TriArray m_triangles;
+    TriArrayPtr m_triangles;
+
+    // Buffer objects for positions, normals and triangle indices, and
+    // the arrays last uploaded to them.
+    mutable GLuint m_buffers[3];
+    mutable size_t m_bufferBytes[3];
+    mutable P3fArraySamplePtr m_bufferP;
+    mutable V3fArraySamplePtr m_bufferMeshN;
+    mutable V3fVectorPtr m_bufferCustomN;
+    mutable TriArrayPtr m_bufferTriangles;
 };
 
 } // End namespace ABCOPENGL_VERSION_NS
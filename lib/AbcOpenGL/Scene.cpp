@@ -97,7 +97,9 @@ Scene::Scene( const std::string &fileName, bool verbose )
 {
     Timer playbackTimer;
 
+    // Extra Ogawa streams let prefetch threads read alongside drawing.
     Alembic::AbcCoreFactory::IFactory factory;
+    factory.setOgawaNumStreams( 4 );
     m_archive = factory.getArchive( fileName );
 
     m_topObject = IObject( m_archive, kTop );
@@ -164,6 +166,15 @@ void Scene::setTime( chrono_t iSeconds )
     m_bounds = m_drawable->getBounds();
 }
 
+//-*****************************************************************************
+void Scene::prefetch( chrono_t iSeconds )
+{
+    if ( m_drawable && m_minTime < m_maxTime )
+    {
+        m_drawable->prefetch( iSeconds );
+    }
+}
+
 //-*****************************************************************************
 int Scene::processHits( GLint hits, GLuint buffer[] )
 {
@@ -240,7 +251,8 @@ void Scene::drawBounds( SceneState &s_state, const int mode )
 }
 
 //-*****************************************************************************
-void Scene::draw( SceneState &s_state, bool visibleOnly, bool boundsOnly )
+void Scene::draw( SceneState &s_state, bool visibleOnly, bool boundsOnly,
+                  bool cull, bool useBuffers )
 {
     ABCA_ASSERT( m_archive && m_topObject &&
                  m_drawable && m_drawable->valid(),
@@ -260,10 +272,69 @@ void Scene::draw( SceneState &s_state, bool visibleOnly, bool boundsOnly )
     dctx.setPointSize( s_state.pointSize );
     dctx.setVisibleOnly( visibleOnly );
     dctx.setBoundsOnly( boundsOnly );
+    dctx.setCull( cull );
+    dctx.setUseBuffers( useBuffers );
+
+    // build the frustum once, xforms transform it down the hierarchy
+    if ( cull )
+    {
+        Frustum frustum;
+        frustum.setFromGL();
+        dctx.setFrustum( frustum );
+        dctx.setWorldFrustum( frustum );
+    }
+
+    m_cullStats.reset();
+    dctx.setCullStats( &m_cullStats );
 
     m_drawable->draw( dctx );
 
 }
 
+//-*****************************************************************************
+void Scene::drawInstances( SceneState &s_state,
+                           const std::vector<M44d> &instances,
+                           const std::vector<C3f> &colors,
+                           bool visibleOnly, bool boundsOnly,
+                           bool useBuffers )
+{
+    ABCA_ASSERT( m_archive && m_topObject &&
+                 m_drawable && m_drawable->valid(),
+                 "Invalid Scene: " << m_fileName );
+
+    if ( instances.empty() ) { return; }
+
+    glEnable( GL_LIGHTING );
+
+    // clear the object index for GL picking
+    OBJECT_MAP.clear();
+
+    // Get the matrix
+    M44d currentMatrix;
+    glGetDoublev( GL_MODELVIEW_MATRIX, ( GLdouble * )&(currentMatrix[0][0]) );
+
+    // leaves apply the instances on top of the modelview they are drawn
+    // with, so move each instance transform into view space
+    M44d cameraToWorld = currentMatrix.inverse();
+    std::vector<M44d> viewInstances( instances.size() );
+    for ( size_t i = 0; i < instances.size(); ++i )
+    {
+        viewInstances[i] = cameraToWorld * instances[i] * currentMatrix;
+    }
+
+    DrawContext dctx;
+    dctx.setWorldToCamera( currentMatrix );
+    dctx.setPointSize( s_state.pointSize );
+    dctx.setVisibleOnly( visibleOnly );
+    dctx.setBoundsOnly( boundsOnly );
+    dctx.setUseBuffers( useBuffers );
+    dctx.setInstances( &viewInstances, &colors );
+
+    // instances are not culled, so there are no stats to keep
+    m_cullStats.reset();
+
+    m_drawable->draw( dctx );
+}
+
 } // End namespace ABCOPENGL_VERSION_NS
 } // End namespace AbcOpenGL
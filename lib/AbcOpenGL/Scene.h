@@ -104,6 +104,16 @@ public:
     //! ...
     void setTime( chrono_t newTime );
 
+    //! Decode the samples for the given time into the frame cache,
+    //! without changing the current time. Safe to call from other threads.
+    //! ...
+    void prefetch( chrono_t newTime );
+
+    //! Return the number of primitives drawn at the current time.
+    //! ...
+    size_t getNumPrimitives() const
+    { return m_drawable ? m_drawable->getNumPrimitives() : 0; }
+
     //! Return the bounds at the current time.
     //! ...
     Box3d getBounds() const { return m_bounds; }
@@ -117,7 +127,25 @@ public:
     //! ...
     void drawBounds( SceneState &s_state, const int mode = GL_LINES );
     void draw( SceneState &s_state, bool visibleOnly = false, 
-                                    bool boundsOnly = false);
+                                    bool boundsOnly = false,
+                                    bool cull = false,
+                                    bool useBuffers = false );
+
+    //! Draws the scene once per instance transform, in the same space
+    //! as the camera matrix, with the matching color. The hierarchy is
+    //! traversed once and each leaf binds its arrays once for all
+    //! instances. Objects are not culled.
+    //! ...
+    void drawInstances( SceneState &s_state,
+                        const std::vector<M44d> &instances,
+                        const std::vector<C3f> &colors,
+                        bool visibleOnly = false,
+                        bool boundsOnly = false,
+                        bool useBuffers = false );
+
+    //! Return the objects drawn and culled by the last draw.
+    //! ...
+    const CullStats &getCullStats() const { return m_cullStats; }
 
 protected:
     std::string m_fileName;
@@ -129,6 +157,7 @@ protected:
     Box3d m_bounds;
 
     DrawablePtr m_drawable;
+    CullStats m_cullStats;
 };
 
 } // End namespace ABCOPENGL_VERSION_NS
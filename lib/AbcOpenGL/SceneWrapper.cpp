@@ -61,8 +61,16 @@ public:
         m_scene.drawBounds(m_state, mode);
     }
 
-    void draw( bool visibleOnly, bool boundsOnly ) {
-        m_scene.draw(m_state, visibleOnly, boundsOnly);
+    void draw( bool visibleOnly, bool boundsOnly, bool cull,
+               bool useBuffers ) {
+        m_scene.draw(m_state, visibleOnly, boundsOnly, cull, useBuffers);
+    }
+
+    void drawInstances( const std::vector<M44d> &instances,
+                        const std::vector<C3f> &colors,
+                        bool visibleOnly, bool boundsOnly, bool useBuffers ) {
+        m_scene.drawInstances(m_state, instances, colors, visibleOnly,
+                              boundsOnly, useBuffers);
     }
 
     void playForward(int fps) {
@@ -104,10 +112,23 @@ public:
         return m_scene.isConstant();
     }
 
+    size_t getNumPrimitives() {
+        return m_scene.getNumPrimitives();
+    }
+
+    const CullStats &getCullStats() {
+        return m_scene.getCullStats();
+    }
+
     void setTime(chrono_t newTime) {
+        m_currentSeconds = newTime;
         m_scene.setTime(newTime);
     }
 
+    void prefetch(chrono_t newTime) {
+        m_scene.prefetch(newTime);
+    }
+
     Imath::Box<Imath::Vec3<double> > bounds() {
         return m_scene.getBounds();
     }
@@ -137,9 +158,19 @@ void SceneWrapper::drawBounds(const int mode)
     m_state->drawBounds(mode);
 }
 
-void SceneWrapper::draw(bool visibleOnly, bool boundsOnly)
+void SceneWrapper::draw(bool visibleOnly, bool boundsOnly, bool cull,
+                        bool useBuffers)
+{
+    m_state->draw(visibleOnly, boundsOnly, cull, useBuffers);
+}
+
+void SceneWrapper::drawInstances(const std::vector<M44d> &instances,
+                                 const std::vector<C3f> &colors,
+                                 bool visibleOnly, bool boundsOnly,
+                                 bool useBuffers)
 {
-    m_state->draw(visibleOnly, boundsOnly);
+    m_state->drawInstances(instances, colors, visibleOnly, boundsOnly,
+                           useBuffers);
 }
 
 void SceneWrapper::setTime(chrono_t newTime)
@@ -147,6 +178,11 @@ void SceneWrapper::setTime(chrono_t newTime)
     m_state->setTime(newTime);
 }
 
+void SceneWrapper::prefetch(chrono_t newTime)
+{
+    m_state->prefetch(newTime);
+}
+
 void SceneWrapper::playForward(int fps)
 {
     m_state->playForward( fps );
@@ -182,6 +218,21 @@ bool SceneWrapper::isConstant()
     return m_state->isConstant();
 }
 
+size_t SceneWrapper::getNumPrimitives()
+{
+    return m_state->getNumPrimitives();
+}
+
+size_t SceneWrapper::getNumDrawn()
+{
+    return m_state->getCullStats().drawn;
+}
+
+size_t SceneWrapper::getNumCulled()
+{
+    return m_state->getCullStats().culled;
+}
+
 Imath::Box<Imath::Vec3<double> > SceneWrapper::bounds()
 {
     return m_state->bounds();
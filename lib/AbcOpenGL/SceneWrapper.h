@@ -57,11 +57,20 @@ public:
 
     std::string selection(int x, int y, GLCamera &camera);
     void drawBounds( const int mode = GL_LINES );
-    void draw(bool visibleOnly = false, bool boundsOnly = false);
+    void draw(bool visibleOnly = false, bool boundsOnly = false,
+              bool cull = false, bool useBuffers = false);
+    void drawInstances(const std::vector<M44d> &instances,
+                       const std::vector<C3f> &colors,
+                       bool visibleOnly = false, bool boundsOnly = false,
+                       bool useBuffers = false);
 
     void setTime(chrono_t newTime);
+    void prefetch(chrono_t newTime);
     void playForward(int fps);
     bool isConstant();
+    size_t getNumPrimitives();
+    size_t getNumDrawn();
+    size_t getNumCulled();
 
     Imath::Box<Imath::Vec3<double> > bounds();
 
@@ -68,7 +68,6 @@ TODO:
 - draggable, pop-out widgets
 - support object paths in args
 - save split window layouts
-- better per-time data caching
 - socket connections
 - unit tests
 """
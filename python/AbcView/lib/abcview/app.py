@@ -56,12 +56,13 @@ import abcview
 from abcview import log, style, config
 from abcview.io import Session, Scene, Camera, ICamera
 from abcview.gl import GLCamera, GLICamera, GLScene
-from abcview.gl import get_final_matrix
+from abcview.gl import get_final_matrix, set_frame_cache_budget
+from abcview.gl import set_disk_cache
 from abcview.widget.console_widget import AbcConsoleWidget
-from abcview.widget.viewer_widget import GLWidget
+from abcview.widget.viewer_widget import GLWidget, PlaybackClock
 from abcview.widget.time_slider import TimeSlider
 from abcview.widget.tree_widget import *
-from abcview.utils import json
+from abcview.utils import json, get_object_info, get_sample_table
 
 __all__ = ['create_app', 'AbcView', 'io2gl', 'version_check', ]
 
@@ -123,6 +124,10 @@ def io2gl(item, viewer=None):
         item.__class__ = GLScene
         item.init()
 
+        # start loading in the background right away
+        if item.loaded:
+            item.load_async()
+
     elif item.type() == Camera.type():
         _translation = item.translation
         _rotation = item.rotation
@@ -484,6 +489,9 @@ class AbcView(QtGui.QMainWindow):
         # overrides are used for deferring frame range overrides
         self._overrides = {}
 
+        # scene to take the frame range from once it has loaded
+        self._frames_scene = None
+
         # for storing session data
         self.settings = QtCore.QSettings("Alembic", 
                            "-".join([config.__prog__, config.__version__]))
@@ -545,6 +553,8 @@ class AbcView(QtGui.QMainWindow):
         self.viewer.state.signal_current_frame.connect(self.handle_update_frame)
         self.viewer.state.signal_play_fwd.connect(self.handle_state_play_fwd)
         self.viewer.state.signal_play_stop.connect(self.handle_state_play_stop)
+        self.viewer.state.signal_scene_loaded.connect(self.handle_scene_loaded)
+        self.viewer.state.signal_timeline_changed.connect(self.handle_timeline_changed)
         self.viewer.signal_scene_selected.connect(self.handle_scene_selected)
         self.viewer.signal_object_selected.connect(self.handle_object_selected)
         self.viewer.signal_clear_selection.connect(self.objects_tree.clearSelection)
@@ -555,6 +565,8 @@ class AbcView(QtGui.QMainWindow):
         self.time_slider.setFocus(True)
         self.time_slider.signal_play_fwd.connect(self.handle_play)
         self.time_slider.signal_play_stop.connect(self.handle_stop)
+        self.time_slider.signal_scrub_start.connect(self.handle_scrub_start)
+        self.time_slider.signal_scrub_stop.connect(self.handle_scrub_stop)
         #self.time_slider.signal_frame_changed.connect(self.handle_time_slider_change)
         self.time_slider.signal_first_frame_changed.connect(self.handle_first_frame_change)
         self.time_slider.signal_last_frame_changed.connect(self.handle_last_frame_change)
@@ -850,6 +862,9 @@ class AbcView(QtGui.QMainWindow):
         :param scene: GLScene object.
         """
         assert scene.type() == GLScene.type(), "Invalid scene"
+        if scene.is_loading():
+            self._frames_scene = scene
+            return
         self.viewer.state.min_time = scene.min_time()
         self.viewer.state.max_time = scene.max_time()
         self.time_slider.set_minimum(scene.min_time() * self.session.frames_per_second)
@@ -1095,6 +1110,18 @@ class AbcView(QtGui.QMainWindow):
         """
         self.viewer.state.stop()
 
+    def handle_scrub_start(self):
+        """
+        Time slider drag start handler.
+        """
+        self.viewer.state.set_scrubbing(True)
+
+    def handle_scrub_stop(self):
+        """
+        Time slider drag stop handler, restores full detail.
+        """
+        self.viewer.state.set_scrubbing(False)
+
     @make_dirty
     def handle_item_removed(self, item=None):
         self.viewer.state.stop()
@@ -1168,7 +1195,7 @@ class AbcView(QtGui.QMainWindow):
             ts = p.getTimeSampling()
             t = self.time_slider.value() \
                     / float(self.viewer.state.frames_per_second)
-            index = ts.getNearIndex(t, len(p.samples))    
+            index = get_sample_table(ts, len(p.samples)).index(t)
             item = self.samples_tree.topLevelItem(index)
             self.samples_tree.clearSelection()
             self.samples_tree.setItemSelected(item, True)
@@ -1263,7 +1290,7 @@ class AbcView(QtGui.QMainWindow):
     def handle_object_selection(self):
         for scene in self.viewer.state.scenes:
             scene.selected = False
-        self.viewer.updateGL()
+        self.viewer.schedule_update()
 
     def handle_item_selected(self, item):
         """
@@ -1273,7 +1300,7 @@ class AbcView(QtGui.QMainWindow):
         """
         if type(item) == SceneTreeWidgetItem:
             item.object.selected = True
-        self.viewer.updateGL()
+        self.viewer.schedule_update()
 
     @wait
     def handle_item_loaded(self, item):
@@ -1285,6 +1312,7 @@ class AbcView(QtGui.QMainWindow):
         def load(item):
             if type(item) == SceneTreeWidgetItem:
                 self.viewer.add_scene(item.object)
+                item.set_loading(item.object.is_loading())
             elif type(item) == SessionTreeWidgetItem:
                 for child in item.children():
                     load(child)
@@ -1293,6 +1321,41 @@ class AbcView(QtGui.QMainWindow):
         self.splash.updateProgress(self.splash.progress.value() + 1)
         load(item)
 
+    def handle_scene_loaded(self, scene):
+        """
+        Background scene load handler, updates the splash screen and
+        the scene's tree item.
+
+        :param scene: GLScene
+        """
+        log.debug("[%s.handle_scene_loaded] %s" % (self, scene))
+        self.splash.setMessage("loaded %s" % scene.name)
+        tree = getattr(scene, "tree", None)
+        if tree is not None:
+            tree.set_loading(False)
+
+        # frame range deferred until the scene knew its time range
+        if scene is self._frames_scene:
+            self._frames_scene = None
+            self.set_frames_from_scene(scene)
+            if self._overrides.get("first_frame"):
+                first_frame = self._overrides.get("first_frame")
+                self.viewer.state.min_frame = first_frame
+                self.time_slider.set_minimum(first_frame)
+            if self._overrides.get("last_frame"):
+                last_frame = self._overrides.get("last_frame")
+                self.viewer.state.max_frame = last_frame
+                self.time_slider.set_maximum(last_frame)
+
+    def handle_timeline_changed(self, timeline):
+        """
+        Session timeline rebuilt handler, updates the time slider's
+        sample density.
+
+        :param timeline: SessionTimeline
+        """
+        self.time_slider.set_density(timeline.first_frame, timeline.density())
+
     @wait
     def handle_item_unloaded(self, item):
         """
@@ -1393,13 +1456,12 @@ class AbcView(QtGui.QMainWindow):
             obj = item.object
         if obj.getFullName() == "/":
             self.handle_frame_scene()
-        md = obj.getMetaData()
-        if alembic.AbcGeom.IPolyMesh.matches(md) or \
-           alembic.AbcGeom.ISubD.matches(md):
+        kind = get_object_info(obj).kind
+        if kind in ("IPolyMesh", "ISubD"):
             meshObj = alembic.AbcGeom.IPolyMesh(obj.getParent(), obj.getName())
             mesh = meshObj.getSchema()
             bounds_prop = mesh.getSelfBoundsProperty()
-        elif alembic.AbcGeom.IXform.matches(md):
+        elif kind == "IXform":
             meshObj = alembic.AbcGeom.IXform(obj.getParent(), obj.getName())
             mesh = meshObj.getSchema()
             bounds_prop = mesh.getChildBoundsProperty()
@@ -1415,8 +1477,8 @@ class AbcView(QtGui.QMainWindow):
 
         # get the bounds value from the bounds property
         ts = bounds_prop.getTimeSampling()
-        index = ts.getNearIndex(self.viewer.state.current_time, 
-                        bounds_prop.getNumSamples())
+        index = get_sample_table(ts, bounds_prop.getNumSamples()).index(
+                        self.viewer.state.current_time)
         bounds = bounds_prop.getValue(index) #iss)
         log.debug("bounds at index %s: %s" % (index, bounds))
   
@@ -1546,7 +1608,8 @@ def create_app(files = None,
            mode = None,
            review = False,
            reset = False,
-           verbose = False
+           verbose = False,
+           realtime = False
           ):
     """
     Creates a new instance of an :py:class:`.AbcView` application.
@@ -1562,6 +1625,7 @@ def create_app(files = None,
     :param review: use review settings
     :param reset: reset layout settings
     :param verbose: verbose standard out
+    :param realtime: drop frames during playback to keep real time
     :return: exit code
     """
     assert version_check()
@@ -1575,6 +1639,13 @@ def create_app(files = None,
     if verbose:
         log.setLevel(logging.DEBUG)
 
+    # decoded mesh frames are kept in RAM up to this budget
+    set_frame_cache_budget(config.FRAME_CACHE_MB)
+
+    # decoded mesh frames are also kept on disk, if configured
+    if config.DISK_CACHE_DIR:
+        set_disk_cache(config.DISK_CACHE_DIR, config.DISK_CACHE_MB)
+
     # settings
     if reset:
         win.reset_settings()
@@ -1595,6 +1666,10 @@ def create_app(files = None,
     elif mode is not None:
         win.set_default_mode(mode)
 
+    # playback mode
+    if realtime:
+        win.viewer.state.playback_mode = PlaybackClock.REAL_TIME
+
     # defer file loading until event loop starts
     win.set_load_files(files)
 
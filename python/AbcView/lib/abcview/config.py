@@ -57,3 +57,67 @@ USER_SCRIPT_DIR = os.getenv("ABCVIEW_SCRIPT_PATH", "").split(_path_sep_)
 
 # script editor
 SCRIPT_EDITOR = os.getenv("ABCVIEW_SCRIPT_EDITOR", "gvim")
+
+# number of worker threads used to load scenes in the background
+LOAD_THREADS = int(os.getenv("ABCVIEW_LOAD_THREADS", 4))
+
+# maximum number of per-time values cached for each scene
+CACHE_SIZE = int(os.getenv("ABCVIEW_CACHE_SIZE", 1000))
+
+# memory budget in megabytes for decoded mesh frames, shared by all scenes
+FRAME_CACHE_MB = int(os.getenv("ABCVIEW_FRAME_CACHE_MB", 1024))
+
+# number of worker threads decoding upcoming frames during playback,
+# 0 disables read-ahead (HDF5 archives, which are not thread-safe, are
+# never read ahead)
+PREFETCH_THREADS = int(os.getenv("ABCVIEW_PREFETCH_THREADS", 2))
+
+# playback mode, "every frame" or "real time" (drops frames to keep sync)
+PLAYBACK_MODE = os.getenv("ABCVIEW_PLAYBACK_MODE", "every frame")
+
+# prepare scenes for a new time on a worker thread while the viewer keeps
+# drawing the last completed frame (not for HDF5 archives)
+ASYNC_TIME = os.getenv("ABCVIEW_ASYNC_TIME", "0") not in ("0", "")
+
+# step expensive scenes down to points or bounds while scrubbing or playing
+# when frames take longer than the fps budget
+ADAPTIVE_LOD = os.getenv("ABCVIEW_ADAPTIVE_LOD", "0") not in ("0", "")
+
+# directory for draw-ready mesh frames kept on disk between sessions,
+# disabled when empty
+DISK_CACHE_DIR = os.getenv("ABCVIEW_DISK_CACHE", "")
+
+# size cap in megabytes for the disk cache, least recently used frames
+# are deleted first
+DISK_CACHE_MB = int(os.getenv("ABCVIEW_DISK_CACHE_MB", 10240))
+
+# half-width of the ground grid and number of lines on each side of the
+# axes, the grid is scaled by powers of ten to cover the scene bounds
+GRID_EXTENT = float(os.getenv("ABCVIEW_GRID_EXTENT", 10.0))
+GRID_SUBDIVISIONS = int(os.getenv("ABCVIEW_GRID_SUBDIVISIONS", 10))
+GRID_FIT = os.getenv("ABCVIEW_GRID_FIT", "1") not in ("0", "")
+
+# check for errors after every GL call made from Python, slow, for debugging
+GL_ERROR_CHECKING = os.getenv("ABCVIEW_GL_ERROR_CHECKING", "0") not in ("0", "")
+
+# log Python-side GL call counts and time per paint stage (at info level)
+GL_PROFILE = os.getenv("ABCVIEW_GL_PROFILE", "0") not in ("0", "")
+
+# skip scenes and objects that are entirely outside the camera view
+FRUSTUM_CULLING = os.getenv("ABCVIEW_FRUSTUM_CULLING", "1") not in ("0", "")
+
+# split viewers share one GL context group, so geometry uploaded to the
+# GPU for one pane is reused by the others
+SHARE_CONTEXTS = os.getenv("ABCVIEW_SHARE_CONTEXTS", "1") not in ("0", "")
+
+# keep mesh vertex, normal and index data in GPU buffer objects instead
+# of sending it from client memory on every draw
+GPU_BUFFERS = os.getenv("ABCVIEW_GPU_BUFFERS", "1") not in ("0", "")
+
+# draw scenes loaded more than once from the same file in one pass, with
+# an instance transform and color per copy
+INSTANCING = os.getenv("ABCVIEW_INSTANCING", "1") not in ("0", "")
+
+# point clouds larger than this many points per viewport are drawn as a
+# decimated subset, 0 draws every point
+POINT_BUDGET = int(os.getenv("ABCVIEW_POINT_BUDGET", 1000000))
@@ -36,14 +36,25 @@
 
 import os
 import sys
+import math
+import time
+import Queue
+import threading
 from functools import wraps
+from contextlib import contextmanager
+from collections import OrderedDict
 
+import numpy
 import imath
 import alembic
 kWrapExisting = alembic.Abc.WrapExistingFlag.kWrapExisting
 
+# returned by getMaxNumSamplesForTimeSamplingIndex for older archives
+kMaxNumSamplesNotFound = 2 ** 32 - 1
+
 import OpenGL
-OpenGL.ERROR_CHECKING = True
+from abcview import config
+OpenGL.ERROR_CHECKING = config.GL_ERROR_CHECKING
 from OpenGL.GL import *
 from OpenGL.GLU import *
 
@@ -58,7 +69,8 @@ except ImportError:
 import abcview
 from abcview import log
 from abcview.io import Mode
-from abcview.utils import memoized
+from abcview.utils import get_object_info, clear_object_info
+from abcview.utils import LRUCache, get_sample_table, set_sample_range
 
 __doc__ = """
 When loading a Session object into the AbcView GUI, the IO objects are
@@ -73,21 +85,101 @@ __all__ = ["GLCamera", "GLICamera", "GLScene", ]
 ARCHIVES = {}
 SCENES = {}
 
+# archive core checks, keyed on filepath
+OGAWA = {}
+
+# local and world matrix caches, keyed by (archive, path, sample key)
+LOCAL_MATRICES = LRUCache(100000)
+WORLD_MATRICES = LRUCache(100000)
+
+def _sample_index(info, sec):
+    """
+    Returns the sample index of an object at a given time, or 0 for
+    constant objects.
+    """
+    if not info.animated:
+        return 0
+    return info.sample_table.index(sec)
+
+def _local_matrix(obj, sec=0):
+    """
+    Returns the cached local matrix of an IXform, or None for other
+    objects, along with the sample key it was read with.
+
+    :param obj: Alembic IObject
+    :param sec: time in seconds
+    :return: (M44d or None, sample key)
+    """
+    info = get_object_info(obj)
+    if info.kind != "IXform":
+        return None, ()
+    index = _sample_index(info, sec)
+    key = (obj.getArchive().getName(), obj.getFullName(), index)
+    matrix = LOCAL_MATRICES.get(key)
+    if matrix is None:
+        xs = alembic.AbcGeom.IXform(obj, kWrapExisting).getSchema()
+        matrix = xs.getValue(index).getMatrix()
+        LOCAL_MATRICES.put(key, matrix)
+    if info.animated:
+        return matrix, (index,)
+    return matrix, ()
+
+def _world_matrix(obj, sec=0):
+    """
+    Returns the cached world matrix of an object, including its own
+    transform, and the signature of the animated sample indices it was
+    built from. Constant subtrees have an empty signature, so they are
+    computed once and reused at every time.
+
+    :param obj: Alembic IObject
+    :param sec: time in seconds
+    :return: (M44d, signature tuple)
+    """
+    parent = obj.getParent()
+    if parent:
+        parent_xf, parent_sig = _world_matrix(parent, sec)
+    else:
+        parent_xf, parent_sig = None, ()
+    local, local_sig = _local_matrix(obj, sec)
+    if local is None:
+        return parent_xf, parent_sig
+    sig = parent_sig + local_sig
+    key = (obj.getArchive().getName(), obj.getFullName(), sig)
+    xf = WORLD_MATRICES.get(key)
+    if xf is None:
+        if parent_xf is None:
+            xf = imath.M44d(local)
+        else:
+            xf = local * parent_xf
+        WORLD_MATRICES.put(key, xf)
+    return xf, sig
+
+def clear_matrix_cache(name=None):
+    """
+    Drops cached matrices for one archive, or all of them.
+
+    :param name: archive file name, or None to clear everything
+    """
+    if name is None:
+        LOCAL_MATRICES.clear()
+        WORLD_MATRICES.clear()
+    else:
+        LOCAL_MATRICES.discard(lambda key: key[0] == name)
+        WORLD_MATRICES.discard(lambda key: key[0] == name)
+
 def accumXform(xf, obj, sec=0):
-    if alembic.AbcGeom.IXform.matches(obj.getHeader()):
-        x = alembic.AbcGeom.IXform(obj, kWrapExisting)
-        xs = x.getSchema()
-        ts = xs.getTimeSampling()
-        index = ts.getNearIndex(sec, xs.getNumSamples())
-        xf *= xs.getValue(index).getMatrix()
+    local, _ = _local_matrix(obj, sec)
+    if local is not None:
+        xf *= local
 
 def get_final_matrix(obj, sec=0):
     xf = imath.M44d()
     xf.makeIdentity()
     parent = obj.getParent()
-    while parent:
-        accumXform(xf, parent, sec)
-        parent = parent.getParent()
+    if parent:
+        world, _ = _world_matrix(parent, sec)
+        if world is not None:
+            xf *= world
     return xf
 
 def draw_bounding_box(bounds, mode=GL_LINES):
@@ -100,6 +192,318 @@ def draw_bounding_box(bounds, mode=GL_LINES):
     """
     alembicgl.drawBounds(bounds, mode)
 
+def set_point_budget(points, in_view=0):
+    """
+    Sets the number of points drawn in the viewport about to be drawn,
+    split across its point clouds in proportion to their points in view.
+    Clouds are drawn as a stable subset, which gets denser as the camera
+    zooms in on part of them.
+
+    :param points: number of points, 0 to draw every point
+    :param in_view: get_points_in_view() after the last draw of the
+                    same viewport, 0 if unknown
+    """
+    alembicgl.setPointBudget(max(0, int(points)), max(0, int(in_view)))
+
+def set_frame_cache_budget(megabytes):
+    """
+    Sets the memory budget for decoded mesh frames, shared by all scenes.
+
+    :param megabytes: budget in megabytes
+    """
+    alembicgl.setFrameCacheBudget(max(0, int(megabytes)) * 1024 * 1024)
+
+def set_disk_cache(directory, megabytes):
+    """
+    Keeps decoded mesh frames in a directory on disk between sessions,
+    creating it if needed.
+
+    :param directory: cache directory
+    :param megabytes: size cap in megabytes
+    """
+    alembicgl.setDiskCache(os.path.expanduser(directory),
+                           max(0, int(megabytes)) * 1024 * 1024)
+
+def get_points_in_view():
+    """
+    Returns the number of points in view of the point clouds drawn
+    since the last call to set_point_budget().
+    """
+    return alembicgl.getPointsInView()
+
+def flush_buffer_deletes():
+    """
+    Deletes the mesh buffer objects released since the last call, e.g.
+    by scenes that were cancelled or reloaded. Call with a GL context
+    current in the share group the buffers were made in.
+    """
+    alembicgl.flushBufferDeletes()
+
+def _to_box(data):
+    """
+    Converts a (2, 3) array of min/max points to a Box3d.
+    """
+    (x0, y0, z0), (x1, y1, z1) = data
+    return imath.Box3d(imath.V3d(float(x0), float(y0), float(z0)),
+                       imath.V3d(float(x1), float(y1), float(z1)))
+
+class Frustum(object):
+    """
+    The six clip planes of the current GL view volume, in the space of
+    the modelview matrix they were read with. ::
+
+        >>> frustum = Frustum.from_gl()
+        >>> frustum.intersects(scene.bounds(seconds))
+        True
+    """
+    def __init__(self, matrix):
+        """
+        :param matrix: 4x4 object-to-clip matrix, row vector convention
+        """
+        m = numpy.asarray(matrix, dtype=numpy.float64).reshape(4, 4)
+        planes = []
+        for i in range(3):
+            planes.append(m[:, 3] + m[:, i])
+            planes.append(m[:, 3] - m[:, i])
+        self.planes = numpy.array(planes)
+
+    def __repr__(self):
+        return "<Frustum %s>" % id(self)
+
+    @classmethod
+    def from_gl(cls):
+        """
+        Returns the frustum of the current modelview and projection.
+        """
+        modelview = numpy.asarray(glGetDoublev(GL_MODELVIEW_MATRIX))
+        projection = numpy.asarray(glGetDoublev(GL_PROJECTION_MATRIX))
+        return cls(numpy.dot(modelview.reshape(4, 4),
+                             projection.reshape(4, 4)))
+
+    def intersects(self, bounds):
+        """
+        Returns False if the bounds are entirely outside the frustum.
+        Empty bounds are treated as visible.
+
+        :param bounds: imath.Box3d
+        """
+        if bounds is None or bounds.isEmpty():
+            return True
+        bmin, bmax = bounds.min(), bounds.max()
+        lo = numpy.array((bmin[0], bmin[1], bmin[2]))
+        hi = numpy.array((bmax[0], bmax[1], bmax[2]))
+        normals = self.planes[:, :3]
+        corner = numpy.where(normals > 0, hi, lo)
+        distance = (normals * corner).sum(axis=1) + self.planes[:, 3]
+        return bool((distance >= 0).all())
+
+def pick_ray(x, y, height, modelview, projection, viewport):
+    """
+    Returns the origin and direction of the ray from the camera through
+    a widget position, in the space of the modelview matrix.
+
+    :param x: widget x position
+    :param y: widget y position, from the top
+    :param height: widget height
+    :param modelview: 4x4 GL modelview matrix
+    :param projection: 4x4 GL projection matrix
+    :param viewport: GL viewport (x, y, width, height)
+    :return: (origin, direction) numpy arrays
+    """
+    m = numpy.dot(numpy.asarray(modelview).reshape(4, 4),
+                  numpy.asarray(projection).reshape(4, 4))
+    inv = numpy.linalg.inv(m)
+    vx, vy, w, h = viewport
+    nx = 2.0 * (x - vx) / float(w) - 1.0
+    ny = 2.0 * (height - y - vy) / float(h) - 1.0
+    near = numpy.dot((nx, ny, -1.0, 1.0), inv)
+    far = numpy.dot((nx, ny, 1.0, 1.0), inv)
+    near = near[:3] / near[3]
+    far = far[:3] / far[3]
+    return near, far - near
+
+def transform_ray(origin, direction, matrix):
+    """
+    Returns a ray multiplied by a 4x4 matrix. Ray parameters are kept,
+    so hit distances can be compared across spaces.
+
+    :param origin: ray origin
+    :param direction: ray direction
+    :param matrix: 4x4 matrix, row vector convention
+    """
+    m = numpy.asarray(matrix, dtype=numpy.float64)
+    return numpy.dot(origin, m[:3, :3]) + m[3, :3], \
+           numpy.dot(direction, m[:3, :3])
+
+def intersect_boxes(origin, direction, lo, hi):
+    """
+    Slab test of a ray against many boxes.
+
+    :param origin: ray origin
+    :param direction: ray direction
+    :param lo: (n, 3) array of box min points
+    :param hi: (n, 3) array of box max points
+    :return: (hit, tnear) arrays, tnear is clamped to the ray origin
+    """
+    direction = numpy.where(numpy.abs(direction) < 1e-300, 1e-300, direction)
+    inv = 1.0 / direction
+    t0 = (lo - origin) * inv
+    t1 = (hi - origin) * inv
+    tnear = numpy.maximum(numpy.minimum(t0, t1).max(axis=-1), 0.0)
+    tfar = numpy.maximum(t0, t1).min(axis=-1)
+    return tfar >= tnear, tnear
+
+class BVH(object):
+    """
+    Bounding volume hierarchy over a list of boxes, built by splitting
+    at the median of the longest axis. Nodes are kept in flat numpy
+    arrays. ::
+
+        >>> bvh = BVH([((0, 0, 0), (1, 1, 1))], ["/cube"])
+        >>> bvh.intersect((0.5, 0.5, -5), (0, 0, 1))
+        (5.0, '/cube')
+    """
+    LEAF_SIZE = 4
+
+    def __init__(self, boxes, items):
+        """
+        :param boxes: sequence of n (min, max) points
+        :param items: list of n values returned on hits
+        """
+        self.items = list(items)
+        self.__boxes = numpy.asarray(boxes, dtype=numpy.float64).reshape(-1, 2, 3)
+        self.__order = numpy.arange(len(self.__boxes))
+        nodes = []
+        if len(self.__boxes):
+            self._build(0, len(self.__boxes), nodes)
+        self.__lo = numpy.array([n[0] for n in nodes]).reshape(-1, 3)
+        self.__hi = numpy.array([n[1] for n in nodes]).reshape(-1, 3)
+        self.__nodes = [n[2:] for n in nodes]
+        self.__boxes = self.__boxes[self.__order]
+        self.items = [self.items[i] for i in self.__order]
+
+    def __repr__(self):
+        return "<BVH %d>" % len(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _build(self, start, end, nodes):
+        index = self.__order[start:end]
+        boxes = self.__boxes[index]
+        lo = boxes[:, 0].min(axis=0)
+        hi = boxes[:, 1].max(axis=0)
+        node = len(nodes)
+        nodes.append([lo, hi, -1, -1, start, end])
+        if end - start > self.LEAF_SIZE:
+            axis = int(numpy.argmax(hi - lo))
+            centers = boxes[:, 0, axis] + boxes[:, 1, axis]
+            self.__order[start:end] = index[numpy.argsort(centers,
+                                                          kind="mergesort")]
+            mid = (start + end) // 2
+            nodes[node][2] = self._build(start, mid, nodes)
+            nodes[node][3] = self._build(mid, end, nodes)
+        return node
+
+    def bounds(self):
+        """
+        Returns the (min, max) points of the root node, or None if empty.
+        """
+        if not len(self.items):
+            return None
+        return self.__lo[0], self.__hi[0]
+
+    def intersect(self, origin, direction, tmax=numpy.inf):
+        """
+        Returns the nearest hit of a ray as (t, item), or None.
+
+        :param origin: ray origin
+        :param direction: ray direction
+        :param tmax: ignore hits further than this ray parameter
+        """
+        if not len(self.items):
+            return None
+        origin = numpy.asarray(origin, dtype=numpy.float64)
+        direction = numpy.asarray(direction, dtype=numpy.float64)
+        best = None
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            hit, tnear = intersect_boxes(origin, direction,
+                                         self.__lo[node], self.__hi[node])
+            if not hit or tnear > tmax:
+                continue
+            left, right, start, end = self.__nodes[node]
+            if left < 0:
+                boxes = self.__boxes[start:end]
+                hits, tnears = intersect_boxes(origin, direction,
+                                               boxes[:, 0], boxes[:, 1])
+                for i in numpy.flatnonzero(hits):
+                    if tnears[i] <= tmax:
+                        tmax = float(tnears[i])
+                        best = (tmax, self.items[start + i])
+            else:
+                stack.append(right)
+                stack.append(left)
+        return best
+
+def object_bounds(top, seconds=0):
+    """
+    Returns the self bounds of the geometry under an object in archive
+    space, as a list of (min, max) points and a list of object paths.
+
+    :param top: Alembic IObject
+    :param seconds: time in seconds
+    """
+    boxes = []
+    paths = []
+    def _walk(obj):
+        for child in obj.children:
+            kind = get_object_info(child).kind
+            if kind in ("IPolyMesh", "ISubD", "IPoints", "ICurves", "INuPatch"):
+                schema = getattr(alembic.AbcGeom, kind)(child,
+                                 kWrapExisting).getSchema()
+                prop = schema.getSelfBoundsProperty()
+                if prop.valid() and prop.getNumSamples():
+                    box = prop.getValue(_sample_index(get_object_info(child),
+                                                      seconds))
+                    if not box.isEmpty():
+                        xf = get_final_matrix(child, seconds)
+                        m = numpy.array([[xf[i][j] for j in range(4)]
+                                         for i in range(4)])
+                        bmin, bmax = box.min(), box.max()
+                        corners = numpy.array([(x, y, z)
+                                   for x in (bmin[0], bmax[0])
+                                   for y in (bmin[1], bmax[1])
+                                   for z in (bmin[2], bmax[2])])
+                        corners = numpy.dot(corners, m[:3, :3]) + m[3, :3]
+                        boxes.append((corners.min(axis=0), corners.max(axis=0)))
+                        paths.append(child.getFullName())
+            _walk(child)
+    _walk(top)
+    return boxes, paths
+
+def pick(scenes, origin, direction, seconds=0):
+    """
+    Casts a ray against the visible scenes and returns the nearest hit
+    as (scene, object path or None, t), or None.
+
+    :param scenes: list of GLScene objects
+    :param origin: world space ray origin
+    :param direction: world space ray direction
+    :param seconds: time in seconds
+    """
+    best = None
+    tmax = numpy.inf
+    for scene in scenes:
+        if not scene.visible or scene.mode == Mode.OFF:
+            continue
+        hit = scene.intersect(origin, direction, seconds, tmax)
+        if hit is not None:
+            tmax = hit[0]
+            best = (scene, hit[1], hit[0])
+    return best
+
 def require_loaded(func):
     """
     Load decorator
@@ -121,12 +525,66 @@ class IArchive(alembic.Abc.IArchive):
         # placeholder for top-most xform schema
         self._bounds_cp = None
 
+        # bounds samples as an (N, 2, 3) array of min/max points
+        self._bounds_table = None
+        self._bounds_data = None
+        self._bounds_loaded = False
+
+        # sample tables of the animated time samplings
+        self._samplings = None
+
     def uid(self):
         return id(self)
 
     def __repr__(self):
         return "<IArchive %s>" % self.uid()
 
+    def _find_bounds_property(self, limit=2):
+        """
+        Walks down the first branch of the hierarchy, up to "limit"
+        levels, looking for a valid childBnds property.
+
+        :param limit: number of levels to walk
+        :return: childBnds property or None
+        """
+        def walk(obj, l=0):
+            if l > limit:
+                return None
+            if get_object_info(obj).kind == "IXform":
+                xs = alembic.AbcGeom.IXform(obj, kWrapExisting).getSchema()
+                cp = xs.getChildBoundsProperty()
+                if cp.valid():
+                    return cp
+            if obj.getNumChildren() > 0:
+                return walk(obj.getChild(0), l+1)
+            return None
+        return walk(self.getTop())
+
+    def _load_bounds(self):
+        """
+        Resolves the childBnds property once and reads every sample into
+        the bounds timeline array.
+        """
+        if self._bounds_loaded:
+            return
+        self._bounds_loaded = True
+        cp = self._find_bounds_property()
+        if cp is None:
+            return
+        num_samples = cp.getNumSamples()
+        if num_samples == 0:
+            return
+        data = numpy.empty((num_samples, 2, 3), dtype=numpy.float64)
+        for index in range(num_samples):
+            value = cp.getValue(index)
+            bmin = value.min()
+            bmax = value.max()
+            data[index] = ((bmin[0], bmin[1], bmin[2]),
+                           (bmax[0], bmax[1], bmax[2]))
+        self._bounds_cp = cp
+        self._bounds_table = get_sample_table(cp.getTimeSampling(), num_samples)
+        self._bounds_data = data
+
     def bounds(self, seconds=0):
         """
         Attempts to get the top-most childBnds property value for
@@ -137,29 +595,417 @@ class IArchive(alembic.Abc.IArchive):
         """
         #log.debug("[%s.bounds] %s" % (repr(self), seconds))
         
+        index = self.bounds_index(seconds)
+        if index is None:
+            return None
+        return _to_box(self._bounds_data[index])
+
+    def bounds_index(self, seconds=0):
+        """
+        Returns the childBnds sample index for a given time in seconds.
+
+        :param seconds: time in seconds
+        :return: sample index, or None if there is no childBnds property
+        """
         if seconds is None:
             seconds = 0
+        self._load_bounds()
+        if self._bounds_data is None:
+            return None
+        return self._bounds_table.index(seconds)
 
-        # limit the levels to walk
-        limit = 2
-
-        def walk(obj, l=0):
-            if l > limit:
+    def _load_samplings(self):
+        """
+        Collects the time samplings that have more than one sample. Sets
+        the list to False if sample counts are not stored in the archive.
+        """
+        if self._samplings is not None:
+            return
+        samplings = []
+        for i in range(self.getNumTimeSamplings()):
+            num_samples = self.getMaxNumSamplesForTimeSamplingIndex(i)
+            if num_samples >= kMaxNumSamplesNotFound:
+                self._samplings = False
                 return
-            if alembic.AbcGeom.IXform.matches(obj.getMetaData()):
-                x = alembic.AbcGeom.IXform(obj.getParent(), obj.getName())
-                xs = x.getSchema()
-                cp = xs.getChildBoundsProperty()
-                if cp.valid():
-                    ts = cp.getTimeSampling()
-                    index = ts.getNearIndex(seconds, 
-                                    cp.getNumSamples())
-                    return cp.getValue(index)
+            if num_samples > 1:
+                samplings.append(get_sample_table(self.getTimeSampling(i),
+                                                  num_samples))
+        self._samplings = samplings
 
-            for i in range(obj.getNumChildren()):
-                return walk(obj.getChild(i), l+1)
+    def sample_key(self, seconds=0):
+        """
+        Returns a key made of the nearest sample index of every animated
+        time sampling in the archive. No sample in the archive changes
+        between two times with the same key.
+
+        :param seconds: time in seconds
+        :return: tuple of sample indices, or None if unknown
+        """
+        self._load_samplings()
+        if self._samplings is False:
             return None
-        return walk(self.getTop())
+        return tuple([table.index(seconds) for table in self._samplings])
+
+class SceneLoader(object):
+    """
+    Pool of worker threads that build SceneWrapper objects in the
+    background. Callbacks are called from the worker thread with the
+    wrapper once it has loaded, failed or been cancelled.
+    """
+    def __init__(self, num_threads=config.LOAD_THREADS):
+        self.num_threads = max(1, num_threads)
+        self.callbacks = []
+        self.__queue = Queue.Queue()
+        self.__threads = []
+        self.__lock = threading.Lock()
+
+    def __repr__(self):
+        return "<SceneLoader %s>" % id(self)
+
+    def _start(self):
+        with self.__lock:
+            while len(self.__threads) < self.num_threads:
+                thread = threading.Thread(target=self._run)
+                thread.setDaemon(True)
+                thread.start()
+                self.__threads.append(thread)
+
+    def _run(self):
+        while True:
+            wrapper = self.__queue.get()
+            try:
+                wrapper.load("SceneLoader", background=True)
+            finally:
+                self.__queue.task_done()
+            for func in list(self.callbacks):
+                try:
+                    func(wrapper)
+                except Exception, e:
+                    log.warn("[%s] %s" % (self, str(e)))
+
+    def pending(self):
+        """
+        Returns the number of wrappers waiting to be loaded.
+        """
+        return self.__queue.qsize()
+
+    def submit(self, wrapper):
+        """
+        Queues a SceneWrapper to be loaded by the next free worker.
+
+        :param wrapper: SceneWrapper object
+        """
+        self._start()
+        self.__queue.put(wrapper)
+
+# background scene loader
+LOADER = SceneLoader()
+
+class FramePrefetcher(object):
+    """
+    Decodes upcoming frames into the frame cache on worker threads, ahead
+    of playback. How far ahead to read adapts to the time it takes to
+    decode a frame compared to the time budget of one frame.
+    """
+    # limits on the number of frames to read ahead
+    MIN_AHEAD = 1
+    MAX_AHEAD = 48
+
+    def __init__(self, num_threads=config.PREFETCH_THREADS):
+        self.num_threads = num_threads
+        self.__queue = Queue.Queue()
+        self.__threads = []
+        self.__lock = threading.Lock()
+
+        # frames queued per wrapper, and frames still wanted per wrapper
+        self.__pending = set()
+        self.__wanted = {}
+
+        # moving average of decode times per wrapper, in seconds
+        self.__decode_time = {}
+
+    def __repr__(self):
+        return "<FramePrefetcher %s>" % id(self)
+
+    def _start(self):
+        with self.__lock:
+            while len(self.__threads) < self.num_threads:
+                thread = threading.Thread(target=self._run)
+                thread.setDaemon(True)
+                thread.start()
+                self.__threads.append(thread)
+
+    def _run(self):
+        while True:
+            wrapper, frame, seconds = self.__queue.get()
+            key = (id(wrapper), frame)
+            try:
+                if frame in self.__wanted.get(id(wrapper), ()):
+                    start = time.time()
+                    wrapper.prefetch(seconds)
+                    self._update_decode_time(wrapper, time.time() - start)
+            except Exception, e:
+                log.warn("[%s] %s" % (self, str(e)))
+            finally:
+                with self.__lock:
+                    self.__pending.discard(key)
+                self.__queue.task_done()
+
+    def _update_decode_time(self, wrapper, elapsed):
+        average = self.__decode_time.get(id(wrapper))
+        if average is None:
+            average = elapsed
+        self.__decode_time[id(wrapper)] = 0.8 * average + 0.2 * elapsed
+
+    def decode_time(self, wrapper):
+        """
+        Returns the average decode time of a frame in seconds.
+
+        :param wrapper: SceneWrapper object
+        """
+        return self.__decode_time.get(id(wrapper), 0.0)
+
+    def ahead(self, wrapper, fps):
+        """
+        Returns the number of frames to read ahead, enough to cover the
+        time it takes to decode one frame at the given fps.
+
+        :param wrapper: SceneWrapper object
+        :param fps: playback frames per second
+        """
+        ahead = int(math.ceil(self.decode_time(wrapper) * fps)) + 1
+        return max(self.MIN_AHEAD, min(self.MAX_AHEAD, ahead))
+
+    def schedule(self, wrapper, frame, fps, first_frame, last_frame):
+        """
+        Queues the frames following "frame" for decoding, wrapping around
+        at the end of the frame range. Queued frames that are no longer
+        upcoming are skipped.
+
+        :param wrapper: SceneWrapper object
+        :param frame: current frame
+        :param fps: playback frames per second
+        :param first_frame: first frame of the playback range
+        :param last_frame: last frame of the playback range
+        """
+        if self.num_threads < 1 or not wrapper.loaded:
+            return
+        self._start()
+        count = last_frame - first_frame + 1
+        if count < 2:
+            return
+        frames = []
+        for offset in range(1, min(self.ahead(wrapper, fps), count - 1) + 1):
+            frames.append(first_frame + (frame - first_frame + offset) % count)
+        self.__wanted[id(wrapper)] = set(frames)
+        for f in frames:
+            key = (id(wrapper), f)
+            with self.__lock:
+                if key in self.__pending:
+                    continue
+                self.__pending.add(key)
+            self.__queue.put((wrapper, f, f / float(fps)))
+
+    def cancel(self, wrapper=None):
+        """
+        Drops queued frames for one wrapper, or for all of them.
+
+        :param wrapper: SceneWrapper object, or None
+        """
+        if wrapper is None:
+            self.__wanted.clear()
+        else:
+            self.__wanted.pop(id(wrapper), None)
+
+# playback read-ahead
+PREFETCHER = FramePrefetcher()
+
+class TimeUpdater(object):
+    """
+    Worker thread that decodes the frames of a requested time into the
+    frame cache, so the main thread only swaps in the result. Only the
+    latest request is kept: a request still pending, or being decoded,
+    when a newer one arrives is dropped. Callbacks are called from the
+    worker thread with the request serial once its frames are ready.
+    """
+    def __init__(self):
+        self.callbacks = []
+        self.serial = 0
+        self.dropped = 0
+        self.__request = None
+        self.__thread = None
+        self.__cond = threading.Condition()
+
+    def __repr__(self):
+        return "<TimeUpdater %s>" % id(self)
+
+    def _start(self):
+        with self.__cond:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self._run)
+                self.__thread.setDaemon(True)
+                self.__thread.start()
+
+    def _run(self):
+        while True:
+            with self.__cond:
+                while self.__request is None:
+                    self.__cond.wait()
+                serial, seconds, wrappers = self.__request
+                self.__request = None
+            for wrapper in wrappers:
+                if self.__request is not None:
+                    break
+                try:
+                    wrapper.prefetch(seconds)
+                except Exception, e:
+                    log.warn("[%s] %s" % (self, str(e)))
+            if self.__request is not None:
+                continue
+            for func in list(self.callbacks):
+                try:
+                    func(serial)
+                except Exception, e:
+                    log.warn("[%s] %s" % (self, str(e)))
+
+    def request(self, seconds, wrappers):
+        """
+        Requests the frames of a set of scenes at a given time.
+
+        :param seconds: time in seconds
+        :param wrappers: list of loaded SceneWrapper objects
+        :return: request serial passed to callbacks
+        """
+        self._start()
+        with self.__cond:
+            if self.__request is not None:
+                self.dropped += 1
+            self.serial += 1
+            self.__request = (self.serial, seconds, wrappers)
+            self.__cond.notify()
+            return self.serial
+
+# asynchronous time updates
+TIME_UPDATER = TimeUpdater()
+
+class GLProfiler(object):
+    """
+    Counts the GL calls made from Python and the time spent in each paint
+    stage. Installing the profiler wraps the gl* and glu* functions in a
+    module's namespace, so calls made by AbcOpenGL are not counted, but
+    their time is included in the stage that made them. A summary is
+    logged at info level every "interval" frames. ::
+
+        >>> with PROFILER.stage("grid"):
+        ...     glDrawArrays(GL_LINES, 0, 84)
+    """
+    def __init__(self, enabled=False, interval=100):
+        """
+        :param enabled: count calls and time stages
+        :param interval: number of frames between logged summaries
+        """
+        self.enabled = enabled
+        self.interval = interval
+        self.frames = 0
+        self.calls = 0
+        self.stages = OrderedDict()
+        self.__stage = None
+
+    def __repr__(self):
+        return "<GLProfiler %s>" % id(self)
+
+    def install(self, module):
+        """
+        Wraps the GL functions in a module's namespace with call counters.
+        Does nothing unless the profiler is enabled.
+
+        :param module: module object, e.g. sys.modules[__name__]
+        """
+        if not self.enabled:
+            return
+        for name, func in vars(module).items():
+            if name.startswith("gl") and callable(func) and \
+                    not getattr(func, "_profiled", False):
+                setattr(module, name, self._wrap(func))
+
+    def _wrap(self, func):
+        def wrapper(*args, **kwargs):
+            self.calls += 1
+            if self.__stage is not None:
+                self.__stage[1] += 1
+            return func(*args, **kwargs)
+        wrapper._profiled = True
+        wrapper.__name__ = getattr(func, "__name__", "gl")
+        return wrapper
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Context manager that times a paint stage and counts its GL calls.
+
+        :param name: stage name
+        """
+        if not self.enabled:
+            yield
+            return
+        record = self.stages.setdefault(name, [0.0, 0])
+        outer = self.__stage
+        self.__stage = record
+        start = time.time()
+        try:
+            yield
+        finally:
+            record[0] += time.time() - start
+            self.__stage = outer
+
+    def timed(self, name):
+        """
+        Decorator that runs a function as a paint stage.
+
+        :param name: stage name
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def frame_done(self):
+        """
+        Marks the end of a painted frame, logging and resetting the
+        counters every "interval" frames.
+        """
+        if not self.enabled:
+            return
+        self.frames += 1
+        if self.frames >= self.interval:
+            log.info(self.report())
+            self.reset()
+
+    def report(self):
+        """
+        Returns a summary of calls and milliseconds per frame by stage.
+        """
+        frames = float(max(self.frames, 1))
+        lines = ["[GLProfiler] %d frames, %.1f GL calls/frame"
+                 % (self.frames, self.calls / frames)]
+        for name, (seconds, calls) in self.stages.items():
+            lines.append("  %-12s %8.3f ms %8.1f calls" % (name,
+                         seconds * 1000.0 / frames, calls / frames))
+        return "\n".join(lines)
+
+    def reset(self):
+        """
+        Resets the counters.
+        """
+        self.frames = 0
+        self.calls = 0
+        self.stages.clear()
+
+# counts Python-side GL calls and paint stage times
+PROFILER = GLProfiler(config.GL_PROFILE)
 
 class SceneWrapper(alembicgl.SceneWrapper):
     """
@@ -168,20 +1014,59 @@ class SceneWrapper(alembicgl.SceneWrapper):
     def __init__(self, filepath):
         self.filepath = str(filepath)
         self.loaded = False
+        self.loading = False
+        self.cancelled = False
         self.bad = False
+        self.__lock = threading.Lock()
 
-    def load(self, func_name="load"):
+    def load(self, func_name="load", background=False):
         """
-        Defers actually loading the scene until necessary.
+        Defers actually loading the scene until necessary. Returns at once
+        while a background load of this scene is running, so callers see
+        the scene as not loaded yet instead of waiting for it.
+
+        :param background: True when called by the background loader
         """
-        if not self.loaded and not self.bad:
-            log.debug("[%s] reading %s" % (func_name, self.filepath))
+        if self.loaded or self.bad or self.cancelled:
+            return
+        if self.loading and not background:
+            return
+        with self.__lock:
             try:
-                super(SceneWrapper, self).__init__(self.filepath)
-                self.loaded = True
-            except Exception, e:
-                log.warn("BAD ARCHIVE: %s\n%s" % (self.filepath, str(e)))
-                self.bad = True
+                if self.loaded or self.bad or self.cancelled:
+                    return
+                log.debug("[%s] reading %s" % (func_name, self.filepath))
+                try:
+                    super(SceneWrapper, self).__init__(self.filepath)
+                    # a load cancelled while building is discarded
+                    self.loaded = not self.cancelled
+                except Exception, e:
+                    log.warn("BAD ARCHIVE: %s\n%s" % (self.filepath, str(e)))
+                    self.bad = True
+            finally:
+                self.loading = False
+
+    def load_async(self):
+        """
+        Queues this scene to be loaded by the background loader.
+        """
+        if self.loaded or self.bad or self.loading or self.cancelled:
+            return
+        self.loading = True
+        LOADER.submit(self)
+
+    def cancel(self):
+        """
+        Cancels a background load. If the scene is already being built,
+        the result is discarded once it finishes. A cancelled wrapper
+        never loads, a new one is needed to load the file again.
+
+        :return: True if a load was cancelled
+        """
+        if self.loading:
+            self.cancelled = True
+            return True
+        return False
 
     def uid(self):
         return id(self)
@@ -190,49 +1075,99 @@ class SceneWrapper(alembicgl.SceneWrapper):
         return "<SceneWrapper %s>" % self.uid()
 
     @require_loaded
-    def draw(self, visible_only=True, bounds_only=False):
+    def draw(self, visible_only=True, bounds_only=False, cull=False,
+             buffers=False):
         """
         draws the scene
         
         :param visible_only: drawing depends on visible property being set
         :param bounds_only: draw object level bounding boxes only
+        :param cull: skip objects outside the view frustum
+        :param buffers: keep mesh data in GPU buffer objects
         """
-        if not self.bad:
-            super(SceneWrapper, self).draw(visible_only, bounds_only)
+        if self.loaded:
+            super(SceneWrapper, self).draw(visible_only, bounds_only, cull,
+                                           buffers)
+
+    @require_loaded
+    def draw_instances(self, instances, colors, visible_only=True,
+                       bounds_only=False, buffers=False):
+        """
+        draws the scene once per instance transform
+        
+        :param instances: list of 4x4 matrices, flattened to 16 values
+        :param colors: list of rgb colors, one per instance
+        :param visible_only: drawing depends on visible property being set
+        :param bounds_only: draw object level bounding boxes only
+        :param buffers: keep mesh data in GPU buffer objects
+        """
+        if self.loaded:
+            self.drawInstances(instances, colors, visible_only, bounds_only,
+                               buffers)
+
+    def cull_stats(self):
+        """
+        Returns the number of objects drawn and culled by the last draw.
+        """
+        if not self.loaded:
+            return 0, 0
+        return self.getNumDrawn(), self.getNumCulled()
 
     @require_loaded
     def draw_bounds(self, mode=GL_LINES):
         """draws scene level bounding box"""
-        if not self.bad:
+        if self.loaded:
             super(SceneWrapper, self).drawBounds(mode)
 
     @require_loaded
     def bounds(self):
-        if self.bad:
+        if not self.loaded:
             return imath.Box3d(imath.V3d(1, 1, 1), 
                                imath.V3d(1, 1, 1))
         return super(SceneWrapper, self).bounds()
 
     @require_loaded
     def get_time(self):
-        if self.bad:
+        if not self.loaded:
             return 0
-        return self.scene.getCurrentTime()
+        return self.getCurrentTime()
 
     @require_loaded
     def set_time(self, value):
-        if not self.bad:
+        if self.loaded:
             self.setTime(value)
 
     @require_loaded
+    def is_constant(self):
+        if not self.loaded:
+            return True
+        return self.isConstant()
+
+    @require_loaded
+    def num_primitives(self):
+        if not self.loaded:
+            return 0
+        return self.getNumPrimitives()
+
     def min_time(self):
-        if self.bad:
+        """
+        Returns the start time, or 0 while loading in the background.
+        """
+        if self.loading:
+            return 0
+        self.load("min_time")
+        if not self.loaded:
             return 0
         return self.getMinTime()
 
-    @require_loaded
     def max_time(self):
-        if self.bad:
+        """
+        Returns the end time, or 0 while loading in the background.
+        """
+        if self.loading:
+            return 0
+        self.load("max_time")
+        if not self.loaded:
             return 0
         return self.getMaxTime()
 
@@ -260,6 +1195,20 @@ def get_archive(filepath):
         ARCHIVES[filepath] = IArchive(str(filepath))
     return ARCHIVES[filepath]
 
+def is_ogawa(filepath):
+    """
+    Returns True if the archive at filepath uses the Ogawa core, which
+    can be read from several threads at once. HDF5 archives can not.
+    """
+    filepath = str(filepath)
+    if filepath not in OGAWA:
+        try:
+            with open(filepath, "rb") as f:
+                OGAWA[filepath] = f.read(5) == "Ogawa"
+        except IOError:
+            OGAWA[filepath] = False
+    return OGAWA[filepath]
+
 def get_scene(filepath):
     """
     caches alembicgl scenes
@@ -668,6 +1617,8 @@ class GLScene(abcview.io.Scene):
     def init(self):
         self.visible = True
         self.selected = False
+        self.__state = LRUCache(config.CACHE_SIZE)
+        self.__mtime = None
         self.clear()
 
     @property
@@ -686,6 +1637,8 @@ class GLScene(abcview.io.Scene):
         return self.width() / float(self.height())
 
     def load(self):
+        if self.__scene is not None and self.__scene.cancelled:
+            self.__scene = None
         name = self.archive.getName()
         min = self.min_time()
         max = self.max_time()
@@ -696,23 +1649,236 @@ class GLScene(abcview.io.Scene):
             self.loaded = False
             self.visible = False
 
+    def load_async(self):
+        """
+        Starts loading the scene in the background. Until it has loaded,
+        the scene is drawn as a bounding box.
+        """
+        if self.__scene is not None and self.__scene.cancelled:
+            self.__scene = None
+        self.scene.load_async()
+
+    def is_loading(self):
+        """
+        Returns True if the scene is still loading in the background.
+        """
+        return self.scene.loading and not self.scene.cancelled
+
+    def uses_wrapper(self, wrapper):
+        """
+        Returns True if this scene draws with the given SceneWrapper,
+        without creating one.
+
+        :param wrapper: SceneWrapper object
+        """
+        return self.__scene is wrapper
+
+    def cancel_load(self):
+        """
+        Cancels a background load and drops the partially loaded scene,
+        so the next load starts from scratch.
+
+        :return: True if a load was cancelled
+        """
+        wrapper = self.scene
+        if not wrapper.loading or wrapper.cancelled:
+            return False
+
+        # the wrapper is shared with other loaded scenes of the same
+        # file, which still want it, so this scene takes a cancelled
+        # wrapper of its own
+        state = getattr(self, "state", None)
+        shared = [s for s in (state.scenes if state else [])
+                  if s is not self and s.loaded and s.__scene is wrapper]
+        if not shared:
+            wrapper.cancel()
+            if SCENES.get(self.filepath) is wrapper:
+                del SCENES[self.filepath]
+        else:
+            wrapper = SceneWrapper(self.filepath)
+            wrapper.cancelled = True
+
+        # keep the cancelled wrapper, so nothing loads this scene again
+        # until load_async() is called
+        self.__scene = wrapper
+        self.__sample_key = None
+        return True
+
     def clear(self):
         self.selected = []
         self.__archive = None
         self.__scene = None
+        self.__sample_key = None
+        self.__state.clear()
+
+    def check_mtime(self):
+        """
+        Drops cached state and reloads the scene when the file on disk
+        has been rewritten. Polled by GLState every MTIME_INTERVAL.
+
+        :return: True if the scene is being reloaded
+        """
+        try:
+            mtime = os.path.getmtime(self.filepath)
+        except (OSError, TypeError):
+            return False
+        if self.__mtime is None:
+            self.__mtime = mtime
+            return False
+        if mtime == self.__mtime:
+            return False
+        log.debug("[%s.check_mtime] %s changed" % (self, self.filepath))
+        self.__mtime = mtime
+        wrapper = self.__scene
+        if wrapper is not None:
+            wrapper.cancel()
+        if SCENES.get(self.filepath) is wrapper:
+            SCENES.pop(self.filepath, None)
+        if self.__archive is not None:
+            name = self.__archive.getName()
+            clear_object_info(name)
+            clear_matrix_cache(name)
+            ARCHIVES.pop(self.filepath, None)
+        self.clear()
+        if self.loaded:
+            self.load_async()
+        return True
 
-    def draw(self, visible_only=True, bounds_only=False):
+    def _cached(self, key, func, *args):
+        """
+        Returns the cached value for key, calling func(*args) on a miss.
+        """
+        value = self.__state.get(key)
+        if value is None:
+            value = func(*args)
+            self.__state.put(key, value)
+        return value
+
+    def draw(self, visible_only=True, bounds_only=False, cull=False,
+             buffers=False):
         """
         draws the scene
         
         :param visible_only: drawing depends on visible property being set
         :param bounds_only: draw object level bounding boxes only
+        :param cull: skip objects outside the view frustum
+        :param buffers: keep mesh data in GPU buffer objects, uploaded
+                        once for static meshes and again only when an
+                        animated mesh's sample changes
         """
+        if self.is_loading():
+            bounds = self.archive.bounds(self.state.current_time)
+            if bounds is not None:
+                draw_bounding_box(bounds)
+            return
         try:
-            self.scene.draw(visible_only, bounds_only)
+            self.scene.draw(visible_only, bounds_only, cull, buffers)
+        except RuntimeError, e:
+            log.error(str(e))
+
+    def instance_key(self):
+        """
+        Returns a key that is equal for scenes that can be drawn as
+        instances of one another, i.e. scenes of the same file at the
+        same sample time.
+        """
+        return self.filepath, self.__sample_key
+
+    def draw_instances(self, scenes, colors, visible_only=True,
+                       bounds_only=False, buffers=False):
+        """
+        Draws this scene once for each of "scenes", with their transform
+        overrides and colors, in a single traversal of the hierarchy.
+        The scenes must share this scene's instance key.
+
+        :param scenes: list of GLScene instances
+        :param colors: list of rgb colors, one per scene
+        :param visible_only: drawing depends on visible property being set
+        :param bounds_only: draw object level bounding boxes only
+        :param buffers: keep mesh data in GPU buffer objects
+        """
+        if self.is_loading():
+            return
+        instances = [s.override_matrix().ravel().tolist() for s in scenes]
+        try:
+            self.scene.draw_instances(instances, colors, visible_only,
+                                      bounds_only, buffers)
         except RuntimeError, e:
             log.error(str(e))
     
+    def override_matrix(self):
+        """
+        Returns the 4x4 matrix of the translate, rotate and scale
+        overrides, in row vector convention, as applied by the viewer.
+        """
+        m = numpy.identity(4)
+        if not self.has_xform_overrides():
+            return m
+        m[:3, :3] *= numpy.asarray(self.scale, dtype=numpy.float64)[:, None]
+        angle, ax, ay, az = self.rotate
+        axis = numpy.array((ax, ay, az), dtype=numpy.float64)
+        length = numpy.sqrt((axis * axis).sum())
+        if angle and length > 0:
+            x, y, z = axis / length
+            a = math.radians(angle)
+            c, s, t = math.cos(a), math.sin(a), 1.0 - math.cos(a)
+            rotation = numpy.array(((t*x*x + c, t*x*y + s*z, t*x*z - s*y),
+                                    (t*x*y - s*z, t*y*y + c, t*y*z + s*x),
+                                    (t*x*z + s*y, t*y*z - s*x, t*z*z + c)))
+            m[:3, :3] = numpy.dot(m[:3, :3], rotation)
+        m[3, :3] = self.translate
+        return m
+
+    def pick_bvh(self, seconds=0):
+        """
+        Returns the BVH of object bounds at a given time, cached per
+        sample key.
+
+        :param seconds: time in seconds
+        """
+        key = self.archive.sample_key(seconds)
+        if key is None:
+            key = seconds
+        return self._cached(("bvh", key), lambda: BVH(*object_bounds(
+                                                  self.top(), seconds)))
+
+    def intersect(self, origin, direction, seconds=0, tmax=numpy.inf):
+        """
+        Returns the nearest hit of a world space ray as (t, object path),
+        or None. Falls back to the scene bounds, with a None path, when
+        no object bounds are available.
+
+        :param origin: world space ray origin
+        :param direction: world space ray direction
+        :param seconds: time in seconds
+        :param tmax: ignore hits further than this ray parameter
+        """
+        if self.has_xform_overrides():
+            origin, direction = transform_ray(origin, direction,
+                                    numpy.linalg.inv(self.override_matrix()))
+        bounds = self.bounds(seconds)
+        if bounds is None or bounds.isEmpty():
+            return None
+        bmin, bmax = bounds.min(), bounds.max()
+        hit, tnear = intersect_boxes(origin, direction,
+                                     numpy.array((bmin[0], bmin[1], bmin[2])),
+                                     numpy.array((bmax[0], bmax[1], bmax[2])))
+        if not hit or tnear > tmax:
+            return None
+        if not self.is_loading():
+            bvh = self.pick_bvh(seconds)
+            if len(bvh):
+                return bvh.intersect(origin, direction, tmax)
+        return float(tnear), None
+
+    def cull_stats(self):
+        """
+        Returns the number of objects drawn and culled by the last draw.
+        """
+        if self.is_loading():
+            return 0, 0
+        return self.scene.cull_stats()
+
     def draw_bounds(self, seconds=0, mode=GL_LINES):
         """
         Draw scene-level bounding box for a given time in secs.
@@ -726,7 +1892,7 @@ class GLScene(abcview.io.Scene):
             draw_bounding_box(bounds, mode)
         
         # because instantiating the SceneWrapper is slow
-        else:
+        elif not self.is_loading():
             try:
                 self.scene.draw_bounds(mode)
             except RuntimeError, e:
@@ -740,39 +1906,292 @@ class GLScene(abcview.io.Scene):
         """
         return not self.scene.bad
 
-    @memoized
-    def selection(self, x, y, camera):
-        log.debug("[%s.selection] %s %s %s" % (self, x, y, camera))
-        if camera:
-            return self.scene.selection(int(x), int(y), camera)
-        return None
-    
-    def set_time(self, value):
+    def is_constant(self):
+        """
+        Returns True if nothing in the scene is animated. Scenes are
+        classified once, after they have loaded.
+        """
+        if self.is_loading() or not self.drawable():
+            return False
+        return self._cached("constant", self.scene.is_constant)
+
+    def cost(self):
+        """
+        Returns the drawing cost of the scene as its number of triangles,
+        points and curve vertices, counted once after it has loaded.
+        """
+        if self.is_loading() or not self.drawable():
+            return 0
+        return self._cached("cost", self.scene.num_primitives)
+
+    def set_time(self, value, key=None):
+        """
+        Sets the scene time. Skipped when no sample in the archive
+        changes between the last time set and "value".
+
+        :param value: time in seconds
+        :param key: precomputed sample key for "value", see SessionTimeline
+        """
+        if self.is_loading():
+            return
         if self.drawable() and self.visible and self.mode != Mode.OFF:
+            if key is None:
+                key = self.archive.sample_key(value)
+            if key is not None and key == self.__sample_key:
+                return
             self.scene.set_time(value)
+            self.__sample_key = key
    
-    @memoized
     def get_time(self):
         return self.scene.get_time()
    
+    def prefetch(self, frame, fps, first_frame, last_frame):
+        """
+        Reads the frames following "frame" ahead on worker threads.
+        """
+        if self.is_loading() or not self.visible or self.mode == Mode.OFF:
+            return
+        if not self.thread_safe():
+            return
+        if self.drawable():
+            PREFETCHER.schedule(self.scene, frame, fps, first_frame,
+                                last_frame)
+
+    def thread_safe(self):
+        """
+        Returns True if samples can be decoded on worker threads while
+        the viewer reads the scene, i.e. for Ogawa archives.
+        """
+        return is_ogawa(self.filepath)
+
+    def needs_update(self, value):
+        """
+        Returns True if set_time would update the scene at "value".
+
+        :param value: time in seconds
+        """
+        if self.is_loading() or not self.drawable():
+            return False
+        if not self.visible or self.mode == Mode.OFF or self.is_constant():
+            return False
+        key = self.archive.sample_key(value)
+        return key is None or key != self.__sample_key
+
     def play_forward(self, fps=24):
         if self.visible and self.drawable():
             self.scene.playForward(fps)
    
-    @memoized
     def min_time(self):
-        return self.scene.min_time()
+        if self.is_loading():
+            return 0
+        return self._cached("min_time", self.scene.min_time)
    
-    @memoized
     def max_time(self):
-        return self.scene.max_time()
+        if self.is_loading():
+            return 0
+        return self._cached("max_time", self.scene.max_time)
  
-    @memoized
     def bounds(self, seconds=0):
-        bounds = self.archive.bounds(seconds)
-        if bounds is None:
-            bounds = self.scene.bounds()
-        return bounds
+        """
+        Returns the scene bounds at a given time in seconds, from the
+        archive's childBnds table when it has one. Otherwise returns None
+        while the scene is loading in the background. Bounds computed by
+        the scene are cached by the sample key of its current time.
+        """
+        index = self.archive.bounds_index(seconds)
+        if index is not None:
+            return _to_box(self.archive._bounds_data[index])
+        if self.is_loading():
+            return None
+        if self.__sample_key is None:
+            return self.scene.bounds()
+        return self._cached(("bounds", self.__sample_key), self.scene.bounds)
 
     def top(self):
         return self.archive.getTop()
+
+class SceneBounds(object):
+    """
+    Union of the bounds of the visible scenes, with their transform
+    overrides applied. Results are cached per sample key of each scene,
+    and dropped when scenes are added, removed, loaded, shown or hidden,
+    or when their transform overrides change.
+    """
+    def __init__(self, maxsize=100):
+        """
+        :param maxsize: number of sample times to keep bounds for
+        """
+        self.__cache = LRUCache(maxsize)
+        self.__signature = None
+
+    def __repr__(self):
+        return "<SceneBounds %s>" % id(self)
+
+    def invalidate(self):
+        """
+        Drops all cached bounds.
+        """
+        self.__cache.clear()
+        self.__signature = None
+
+    def _signature(self, scenes):
+        return tuple([(id(s), s.visible, s.loaded, s.is_loading(),
+                       tuple(s.translate), tuple(s.rotate), tuple(s.scale))
+                      for s in scenes])
+
+    def _drawn(self, scenes):
+        return [s for s in scenes if s.visible and s.loaded and
+                not s.is_loading() and s.drawable()]
+
+    def bounds(self, scenes, seconds=0):
+        """
+        Returns the union of the bounds of the scenes at a given time in
+        seconds, or None if no scene has bounds.
+
+        :param scenes: list of GLScene objects
+        :param seconds: time in seconds
+        :return: imath.Box3d or None
+        """
+        signature = self._signature(scenes)
+        if signature != self.__signature:
+            self.__cache.clear()
+            self.__signature = signature
+        drawn = self._drawn(scenes)
+        keys = [s.archive.sample_key(seconds) for s in drawn]
+        key = tuple([seconds if k is None else k for k in keys])
+        data = self.__cache.get(key)
+        if data is None:
+            data = self._union(drawn, seconds)
+            self.__cache.put(key, data)
+        if data is False:
+            return None
+        return _to_box(data)
+
+    def _union(self, scenes, seconds):
+        lo = numpy.empty((0, 3))
+        hi = numpy.empty((0, 3))
+        for scene in scenes:
+            bounds = scene.bounds(seconds)
+            if bounds is None or bounds.isEmpty():
+                continue
+            bmin, bmax = bounds.min(), bounds.max()
+            corners = numpy.array([(x, y, z) for x in (bmin[0], bmax[0])
+                                             for y in (bmin[1], bmax[1])
+                                             for z in (bmin[2], bmax[2])])
+            if scene.has_xform_overrides():
+                m = scene.override_matrix()
+                corners = numpy.dot(corners, m[:3, :3]) + m[3, :3]
+            lo = numpy.vstack((lo, corners.min(axis=0)))
+            hi = numpy.vstack((hi, corners.max(axis=0)))
+        if not len(lo):
+            return False
+        return lo.min(axis=0), hi.max(axis=0)
+
+class SessionTimeline(object):
+    """
+    Merged timeline of sample changes for a list of scenes over a frame
+    range. For every frame it records the sample key of each scene and
+    which scenes get a new sample at that frame, so time changes can
+    skip scenes without evaluating their time samplings.
+    """
+    def __init__(self, scenes, fps, first_frame, last_frame):
+        """
+        :param scenes: list of GLScene objects
+        :param fps: frames per second
+        :param first_frame: first frame of the range
+        :param last_frame: last frame of the range
+        """
+        self.fps = float(fps)
+        self.first_frame = int(first_frame)
+        self.last_frame = int(max(first_frame, last_frame))
+        self.__keys = {}
+        self.__changes = [[] for f in range(len(self))]
+
+        # sample tables cover the same frames as the session
+        set_sample_range(self.fps, self.first_frame, self.last_frame)
+        self.build(scenes)
+
+    def __repr__(self):
+        return "<SessionTimeline %d-%d>" % (self.first_frame, self.last_frame)
+
+    def __len__(self):
+        return self.last_frame - self.first_frame + 1
+
+    def build(self, scenes):
+        """
+        Reads the sample keys of every scene at every frame.
+
+        :param scenes: list of GLScene objects
+        """
+        start = time.time()
+        for scene in scenes:
+            keys = []
+            last = None
+            for offset in range(len(self)):
+                key = scene.archive.sample_key(
+                        (self.first_frame + offset) / self.fps)
+                if key is None:
+                    keys = None
+                    break
+                if offset > 0 and key != last:
+                    self.__changes[offset].append(scene)
+                keys.append(key)
+                last = key
+            if keys is not None:
+                self.__keys[scene] = keys
+        log.debug("[%s.build] %d scenes in %.3fs" 
+                  % (self, len(scenes), time.time() - start))
+
+    def matches(self, fps, first_frame, last_frame):
+        """
+        Returns True if this timeline was built for the given fps and
+        frame range.
+        """
+        return self.fps == float(fps) and \
+               self.first_frame == int(first_frame) and \
+               self.last_frame == int(max(first_frame, last_frame))
+
+    def _offset(self, frame):
+        """
+        Returns the index of an integer frame in range, or None.
+        """
+        if frame != int(frame):
+            return None
+        offset = int(frame) - self.first_frame
+        if offset < 0 or offset >= len(self):
+            return None
+        return offset
+
+    def key(self, scene, frame):
+        """
+        Returns the precomputed sample key of a scene at a frame, or None
+        if the frame or scene is not covered by this timeline.
+
+        :param scene: GLScene object
+        :param frame: frame number
+        """
+        offset = self._offset(frame)
+        if offset is None or scene not in self.__keys:
+            return None
+        return self.__keys[scene][offset]
+
+    def changes(self, frame):
+        """
+        Returns the scenes that get a new sample at a given frame,
+        compared with the frame before it.
+
+        :param frame: frame number
+        """
+        offset = self._offset(frame)
+        if offset is None:
+            return []
+        return self.__changes[offset]
+
+    def density(self):
+        """
+        Returns the number of scenes changing at each frame in range.
+        """
+        return [len(changes) for changes in self.__changes]
+
+# count the GL calls made from this module
+PROFILER.install(sys.modules[__name__])
@@ -44,7 +44,7 @@ import uuid
 import imath
 import alembic
 from abcview import config, log
-from abcview.utils import get_object
+from abcview.utils import get_object, get_sample_index
 from abcview.utils import json
 
 __doc__ = """
@@ -616,14 +616,11 @@ class ICamera(CameraBase):
 
         :param seconds: time in secs (derives index)
         """
-        #TODO: (mem)cache sample lookups
         cp = self.icamera.getParent()
         xform = alembic.AbcGeom.IXform(cp.getParent(), 
                                        cp.getName())
         xs = xform.getSchema()
-        ts = xs.getTimeSampling()
-        index = ts.getNearIndex(seconds, 
-                                xs.getNumSamples())
+        index = get_sample_index(cp, seconds)
         return xs.getValue(index)
 
     def _icamera_sample(self, seconds):
@@ -632,9 +629,7 @@ class ICamera(CameraBase):
         
         :param seconds: time in secs (derives index)
         """
-        ts = self.schema().getTimeSampling()
-        index = ts.getNearIndex(seconds, 
-                                self.schema().getNumSamples())
+        index = get_sample_index(self.icamera, seconds)
         return self.schema().getValue(index)
 
     def translation(self, seconds=0):
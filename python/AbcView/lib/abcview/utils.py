@@ -35,9 +35,14 @@
 #-******************************************************************************
 
 import re
-import alembic
+import threading
+from collections import namedtuple, OrderedDict
 from functools import partial
 
+import numpy
+import alembic
+kWrapExisting = alembic.Abc.WrapExistingFlag.kWrapExisting
+
 # Python 2.5 backwards-compatibility import logic for json
 JSON = None
 try:
@@ -62,8 +67,259 @@ def get_schema_info(obj):
 
     :return: Tuple of strings.
     """
+    info = get_object_info(obj)
+    return info.schema, info.title, info.base
+
+# typed Alembic classes used to classify objects, in match order
+SCHEMA_TYPES = [
+    ("IXform", alembic.AbcGeom.IXform),
+    ("IPolyMesh", alembic.AbcGeom.IPolyMesh),
+    ("ISubD", alembic.AbcGeom.ISubD),
+    ("IPoints", alembic.AbcGeom.IPoints),
+    ("ICurves", alembic.AbcGeom.ICurves),
+    ("INuPatch", alembic.AbcGeom.INuPatch),
+    ("ICamera", alembic.AbcGeom.ICamera),
+]
+
+# classification record stored for each object in a SchemaTable
+ObjectInfo = namedtuple("ObjectInfo", ["schema", "title", "base", "kind",
+                                       "animated", "num_samples",
+                                       "time_sampling", "sample_table"])
+
+def classify_object(obj):
+    """
+    Reads the metadata and schema of an Alembic object once and returns
+    an ObjectInfo record. The kind is the name of the matching typed
+    class, e.g. 'IXform' or 'IPolyMesh', or None for untyped objects.
+
+    :param obj: Alembic IObject.
+    :return: ObjectInfo
+    """
     md = obj.getMetaData()
-    return md.get('schema'), md.get('schemaObjTitle'), md.get('schemaBaseType')
+    schema = md.get('schema')
+    title = md.get('schemaObjTitle')
+    base = md.get('schemaBaseType')
+    for kind, klass in SCHEMA_TYPES:
+        if klass.matches(md):
+            s = klass(obj, kWrapExisting).getSchema()
+            ts = s.getTimeSampling()
+            num_samples = s.getNumSamples()
+            table = None
+            if not s.isConstant():
+                table = get_sample_table(ts, num_samples)
+            return ObjectInfo(schema, title, base, kind, not s.isConstant(),
+                              num_samples, ts, table)
+    return ObjectInfo(schema, title, base, None, False, 0, None, None)
+
+class SchemaTable(object):
+    """
+    Per-archive classification of objects, keyed by full path. Records are
+    filled lazily the first time an object is looked up, and lookups are
+    safe to make from multiple threads.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.__lock = threading.Lock()
+        self.__table = {}
+
+    def __repr__(self):
+        return "<SchemaTable %s (%d)>" % (self.name, len(self.__table))
+
+    def __len__(self):
+        return len(self.__table)
+
+    def __contains__(self, path):
+        return path in self.__table
+
+    def get(self, obj):
+        """
+        Returns the ObjectInfo record for a given object.
+
+        :param obj: Alembic IObject.
+        :return: ObjectInfo
+        """
+        path = obj.getFullName()
+        info = self.__table.get(path)
+        if info is None:
+            info = classify_object(obj)
+            with self.__lock:
+                info = self.__table.setdefault(path, info)
+        return info
+
+    def clear(self):
+        with self.__lock:
+            self.__table.clear()
+
+# schema tables, keyed by archive name
+SCHEMA_TABLES = {}
+_schema_tables_lock = threading.Lock()
+
+def get_schema_table(name):
+    """
+    Returns the SchemaTable for a given archive name, creating it if needed.
+
+    :param name: archive file name
+    :return: SchemaTable
+    """
+    table = SCHEMA_TABLES.get(name)
+    if table is None:
+        with _schema_tables_lock:
+            table = SCHEMA_TABLES.setdefault(name, SchemaTable(name))
+    return table
+
+def get_object_info(obj):
+    """
+    Returns the cached ObjectInfo record for an Alembic object. ::
+
+        >>> info = get_object_info(obj)
+        >>> info.kind, info.animated, info.num_samples
+        ('IXform', True, 100)
+
+    :param obj: Alembic IObject.
+    :return: ObjectInfo
+    """
+    return get_schema_table(obj.getArchive().getName()).get(obj)
+
+def clear_object_info(name=None):
+    """
+    Drops cached classifications for one archive, or all of them.
+
+    :param name: archive file name, or None to clear every table
+    """
+    with _schema_tables_lock:
+        if name is None:
+            SCHEMA_TABLES.clear()
+        elif name in SCHEMA_TABLES:
+            del SCHEMA_TABLES[name]
+
+# session frame range and fps that sample tables cover, or None
+SAMPLE_RANGE = None
+
+def set_sample_range(fps, first_frame, last_frame):
+    """
+    Sets the frames that sample tables cover. Tables are rebuilt lazily
+    the next time they are used.
+
+    :param fps: frames per second
+    :param first_frame: first frame of the session range
+    :param last_frame: last frame of the session range
+    """
+    global SAMPLE_RANGE
+    if fps <= 0:
+        SAMPLE_RANGE = None
+    else:
+        SAMPLE_RANGE = (float(fps), int(first_frame),
+                        int(max(first_frame, last_frame)))
+
+class SampleTable(object):
+    """
+    Frame to sample index lookup table for one TimeSampling and sample
+    count. Indices for every frame of the session range are computed at
+    once with NumPy, following TimeSampling.getNearIndex, so resolving
+    the index at a whole frame is a single array lookup. Other times
+    fall back to getNearIndex.
+    """
+    def __init__(self, ts, num_samples):
+        self.ts = ts
+        self.num_samples = num_samples
+        self.__range = None
+        self.__table = None
+
+    def __repr__(self):
+        return "<SampleTable %d samples>" % self.num_samples
+
+    def sample_times(self):
+        """
+        Returns the time of every sample as an array.
+        """
+        tst = self.ts.getTimeSamplingType()
+        stored = numpy.array(self.ts.getStoredTimes(), dtype=numpy.float64)
+        indices = numpy.arange(self.num_samples)
+        if tst.isAcyclic():
+            return stored[:self.num_samples]
+        spc = tst.getNumSamplesPerCycle()
+        tpc = tst.getTimePerCycle()
+        return stored[indices % spc] + (indices // spc) * tpc
+
+    def _build(self, sample_range):
+        fps, first_frame, last_frame = sample_range
+        times = numpy.arange(first_frame, last_frame + 1) / fps
+        samples = self.sample_times()
+        last = len(samples) - 1
+        eps = 1e-9
+        floor = numpy.searchsorted(samples, times + eps, "right") - 1
+        ceil = numpy.searchsorted(samples, times - eps, "left")
+        floor = floor.clip(0, last)
+        ceil = ceil.clip(0, last)
+        dfloor = numpy.abs(times - samples[floor])
+        dceil = numpy.abs(samples[ceil] - times)
+        near = numpy.where(dfloor < dceil, floor, ceil)
+        # times halfway between two samples follow getNearIndex itself
+        ties = numpy.flatnonzero((numpy.abs(dfloor - dceil) < eps) &
+                                 (floor != ceil))
+        for i in ties:
+            near[i] = self.ts.getNearIndex(times[i], self.num_samples)
+        self.__table = near.astype(numpy.int32)
+        self.__range = sample_range
+
+    def index(self, seconds):
+        """
+        Returns the nearest sample index at a given time.
+
+        :param seconds: time in seconds
+        :return: sample index
+        """
+        if self.num_samples <= 1:
+            return 0
+        sample_range = SAMPLE_RANGE
+        if sample_range is not None:
+            fps, first_frame, last_frame = sample_range
+            frame = seconds * fps
+            whole = int(round(frame))
+            if abs(frame - whole) < 1e-6 and first_frame <= whole <= last_frame:
+                if self.__range != sample_range:
+                    self._build(sample_range)
+                return int(self.__table[whole - first_frame])
+        return self.ts.getNearIndex(seconds, self.num_samples)
+
+# sample tables shared by equal time samplings and sample counts
+SAMPLE_TABLES = {}
+_sample_tables_lock = threading.Lock()
+
+def get_sample_table(ts, num_samples):
+    """
+    Returns the shared SampleTable for a TimeSampling and sample count. ::
+
+        >>> table = get_sample_table(ts, 100)
+        >>> table.index(1.5)
+        36
+
+    :param ts: TimeSampling object
+    :param num_samples: number of samples
+    :return: SampleTable
+    """
+    tst = ts.getTimeSamplingType()
+    key = (num_samples, tst.getNumSamplesPerCycle(), tst.getTimePerCycle(),
+           tuple(ts.getStoredTimes()))
+    table = SAMPLE_TABLES.get(key)
+    if table is None:
+        with _sample_tables_lock:
+            table = SAMPLE_TABLES.setdefault(key, SampleTable(ts, num_samples))
+    return table
+
+def get_sample_index(obj, seconds):
+    """
+    Returns the nearest sample index of an object's schema at a given
+    time, or 0 for constant objects.
+
+    :param obj: Alembic IObject.
+    :param seconds: time in seconds
+    :return: sample index
+    """
+    table = get_object_info(obj).sample_table
+    if table is None:
+        return 0
+    return table.index(seconds)
 
 def find_objects(obj, name):
     """
@@ -133,3 +389,94 @@ class memoized(object):
         except KeyError:
             res = cache[key] = self.func(*args, **kw)
         return res
+
+class LRUCache(object):
+    """
+    Thread-safe dict-like cache that holds at most "maxsize" values and
+    evicts the least recently used ones first. If "weigh" is given,
+    maxsize limits the summed weight of the values instead, e.g. their
+    size in bytes. ::
+
+        >>> cache = LRUCache(2)
+        >>> cache.put("a", 1)
+        >>> cache.get("a")
+        1
+    """
+    def __init__(self, maxsize=1000, weigh=None):
+        self.maxsize = maxsize
+        self.weigh = weigh
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+        self.__data = OrderedDict()
+        self.__weight = 0
+
+    def __repr__(self):
+        return "<LRUCache %d/%d>" % (self.size(), self.maxsize)
+
+    def _weight(self, value):
+        if self.weigh is None:
+            return 1
+        return self.weigh(value)
+
+    def size(self):
+        """
+        Returns the number of values, or their summed weight.
+        """
+        return self.__weight
+
+    def __len__(self):
+        return len(self.__data)
+
+    def __contains__(self, key):
+        return key in self.__data
+
+    def get(self, key, default=None):
+        """
+        Returns the value for key, marking it as most recently used.
+
+        :param key: hashable key
+        :param default: returned when the key is not cached
+        """
+        with self.__lock:
+            try:
+                value = self.__data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self.__data[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Stores a value, evicting the oldest values past maxsize.
+
+        :param key: hashable key
+        :param value: value to cache
+        """
+        with self.__lock:
+            if key in self.__data:
+                self.__weight -= self._weight(self.__data.pop(key))
+            self.__data[key] = value
+            self.__weight += self._weight(value)
+            while self.__weight > self.maxsize and len(self.__data) > 1:
+                self.__weight -= self._weight(
+                        self.__data.popitem(last=False)[1])
+
+    def discard(self, func):
+        """
+        Removes every key for which func(key) is true.
+
+        :param func: callable taking a key
+        """
+        with self.__lock:
+            for key in [k for k in self.__data if func(k)]:
+                self.__weight -= self._weight(self.__data.pop(key))
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
+            self.__weight = 0
+            self.hits = 0
+            self.misses = 0
@@ -51,6 +51,8 @@ class Slider(QtGui.QSlider):
         self.__paint_mouse_frame = False
         self.__paint_slider_frame = True
         self.__mouse_down = False
+        self.__density_frame = 0
+        self.__density = []
         self.setSingleStep(1)
         self.setPageStep(1)
 
@@ -60,6 +62,35 @@ class Slider(QtGui.QSlider):
     def length(self):
         return self.maximum() - self.minimum()
 
+    def set_density(self, first_frame, density):
+        """
+        Sets the number of sample changes per frame, drawn as ticks
+        along the bottom of the slider.
+
+        :param first_frame: frame of the first density value
+        :param density: list of sample change counts per frame
+        """
+        self.__density_frame = first_frame
+        self.__density = density
+        self.update()
+
+    def draw_density(self, qp):
+        if not self.__density or self.length() <= 0:
+            return
+        peak = float(max(self.__density))
+        if peak <= 0:
+            return
+        y = self.height() - 4
+        for offset, count in enumerate(self.__density):
+            if count == 0:
+                continue
+            frame = self.__density_frame + offset
+            if frame < self.minimum() or frame > self.maximum():
+                continue
+            x = int(self.width() * (frame - self.minimum()) / float(self.length()))
+            qp.setPen(QtGui.QColor(95, 155, 215, int(75 + 180 * count / peak)))
+            qp.drawLine(x, y, x, self.height())
+
     ## base class overrides
 
     def value(self, xpos=None):
@@ -95,6 +126,7 @@ class Slider(QtGui.QSlider):
 
     def mousePressEvent(self, event):
         self._parent.handle_stop()
+        self._parent.signal_scrub_start.emit()
         self.__mouse_down = True
         self.__paint_mouse_frame = True
 
@@ -111,6 +143,7 @@ class Slider(QtGui.QSlider):
     def mouseReleaseEvent(self, event):
         self.setSliderPosition(self.value(event.pos().x()))
         self.__mouse_down = False
+        self._parent.signal_scrub_stop.emit()
         self.__paint_mouse_frame = False
         super(Slider, self).mouseReleaseEvent(event)
 
@@ -132,6 +165,9 @@ class Slider(QtGui.QSlider):
         style = self.style()
         handle = style.subControlRect(style.CC_Slider, opt, 
                                       style.SC_SliderHandle, self) 
+
+        # sample changes per frame
+        self.draw_density(qp)
         # slider position
         if self.__paint_slider_frame and self.length() > 0:
             rect_s = QtCore.QRect(sr[0], sr[1], sr[2], sr[3])
@@ -159,6 +195,8 @@ class Slider(QtGui.QSlider):
 class TimeSlider(QtGui.QGroupBox):
     signal_play_fwd = QtCore.pyqtSignal()
     signal_play_stop = QtCore.pyqtSignal()
+    signal_scrub_start = QtCore.pyqtSignal()
+    signal_scrub_stop = QtCore.pyqtSignal()
     signal_frame_changed = QtCore.pyqtSignal(int)
     signal_first_frame_changed = QtCore.pyqtSignal(int)
     signal_last_frame_changed = QtCore.pyqtSignal(int)
@@ -240,6 +278,12 @@ class TimeSlider(QtGui.QGroupBox):
     def length(self):
         return self.slider.length()
 
+    def set_density(self, first_frame, density):
+        """
+        Sets the number of sample changes per frame shown on the slider.
+        """
+        self.slider.set_density(first_frame, density)
+
     def value(self):
         return self.slider.value()
 
@@ -47,7 +47,7 @@ import imath
 import alembic
 from abcview.io import Scene, Session, Mode
 from abcview.gl import GLScene
-from abcview.utils import find_objects, get_schema_info
+from abcview.utils import find_objects, get_schema_info, get_object_info
 from abcview import log, style, config
 
 def message(info):
@@ -210,8 +210,7 @@ class ObjectTreeWidgetItem(AbcTreeWidgetItem):
         for child in self.object.children:
             if self.seen:
                 continue
-            md = child.getMetaData()
-            if alembic.AbcGeom.ICameraSchema.matches(md):
+            if get_object_info(child).kind == "ICamera":
                 yield CameraTreeWidgetItem(self, child)
             else:
                 yield ObjectTreeWidgetItem(self, child)
@@ -451,6 +450,21 @@ class SceneTreeWidgetItem(SessionTreeWidgetItem):
         self.g.setStyleSheet("background: rgb(%.2f, %.2f, %.2f);" 
                 % (color.red(), color.green(), color.blue()))
 
+    def set_loading(self, loading):
+        """
+        Marks the item as loading in the background.
+
+        :param loading: True if the scene is still loading
+        """
+        if loading:
+            self.setText('name', "%s (loading)" % self.object.name)
+            self.setForeground(self.treeWidget().colnum('name'),
+                               QtGui.QBrush(QtCore.Qt.gray))
+        else:
+            self.setText('name', self.object.name)
+            self.setForeground(self.treeWidget().colnum('name'),
+                               QtGui.QBrush())
+
     def is_removable(self):
         return True
 
@@ -737,6 +751,16 @@ class ObjectTreeWidget(AbcTreeWidget):
         self.takeTopLevelItem(self.indexOfTopLevelItem(item))
         self.signal_item_removed.emit(item)
 
+    def handle_cancel_load(self, triggered):
+        """
+        cancel loading action handler, stops loading the selected scene
+        and unloads its item.
+        """
+        for item in self.selectedItems():
+            if type(item) == SceneTreeWidgetItem and item.object.cancel_load():
+                item.set_loading(False)
+                item.unload()
+
     def handle_remove_item(self, triggered):
         '''
         remove item action handler, calls remove_item().
@@ -879,6 +903,13 @@ class ObjectTreeWidget(AbcTreeWidget):
             menu.addMenu(self.shading_menu)
             menu.addSeparator()
 
+            # cancel background loading
+            if item.object.is_loading():
+                self.cancel_action = QtGui.QAction("Cancel loading", self)
+                self.connect(self.cancel_action, QtCore.SIGNAL("triggered (bool)"), 
+                        self.handle_cancel_load)
+                menu.addAction(self.cancel_action)
+
             # hide/show
             if item.object.loaded:
                 self.load_action = QtGui.QAction("Hide", self)
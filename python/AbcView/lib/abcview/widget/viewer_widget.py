@@ -35,9 +35,12 @@
 #-******************************************************************************
 
 import os
+import re
 import sys
 import math
+import time
 import traceback
+from collections import deque, defaultdict
 from functools import wraps
 
 from PyQt4 import QtCore
@@ -48,22 +51,37 @@ from PyQt4 import QtOpenGL
 import numpy
 import numpy.linalg as linalg
 import OpenGL
-OpenGL.ERROR_CHECKING = True
+from abcview import config
+OpenGL.ERROR_CHECKING = config.GL_ERROR_CHECKING
 from OpenGL.GL import *
 from OpenGL.GLU import *
 
 # flag opengl errors
 from OpenGL.arrays import numpymodule
-numpymodule.NumpyHandler.ERROR_ON_COPY = True
+numpymodule.NumpyHandler.ERROR_ON_COPY = config.GL_ERROR_CHECKING
 
 import imath
 import alembic
 
 import abcview
 from abcview.io import Mode
-from abcview.gl import GLCamera, GLICamera, GLScene
-from abcview.gl import get_final_matrix
-from abcview import log, style, config
+from abcview.gl import GLCamera, GLICamera, GLScene, LOADER, PREFETCHER
+from abcview.gl import TIME_UPDATER, PROFILER
+from abcview.gl import SessionTimeline, SceneBounds, Frustum, pick_ray, pick
+from abcview.gl import get_final_matrix, set_point_budget, get_points_in_view
+from abcview.gl import flush_buffer_deletes
+from abcview import log, style
+from abcview.utils import get_object_info, get_sample_index
+from abcview.utils import LRUCache
+
+# optional zero-copy conversion of imath arrays
+try:
+    import imathnumpy
+except ImportError:
+    imathnumpy = None
+
+# count the GL calls made from this module
+PROFILER.install(sys.modules[__name__])
 
 # GL drawing mode map
 GL_MODE_MAP = {
@@ -74,6 +92,115 @@ GL_MODE_MAP = {
     Mode.POINT: GL_POINT
 }
 
+# world space normal line segments of whole scenes, keyed on archive,
+# sample key and length, limited by size in bytes
+NORMAL_LINES = LRUCache(256 * 1024 * 1024, weigh=lambda lines: lines.nbytes)
+
+def _to_numpy(array, dtype=numpy.float32):
+    """
+    Converts an imath array to a contiguous numpy array.
+
+    :param array: imath V3fArray, IntArray, etc.
+    :param dtype: numpy dtype of the result
+    """
+    if imathnumpy is not None:
+        return numpy.ascontiguousarray(imathnumpy.arrayToNumpy(array),
+                                       dtype=dtype)
+    if len(array) and hasattr(array[0], "__len__"):
+        return numpy.array([tuple(v) for v in array], dtype=dtype)
+    return numpy.array(list(array), dtype=dtype)
+
+def normal_lines(obj, seconds, length=1.0):
+    """
+    Returns an (n*2, 3) float32 array of line segments from each point
+    to the tip of its normal in world space, or None if the mesh has no
+    normals. Face-varying normals are paired with the point of each face
+    vertex, vertex-varying normals with each point.
+
+    :param obj: IPolyMesh IObject
+    :param seconds: time in seconds
+    :param length: scale applied to the normals
+    """
+    index = get_sample_index(obj, seconds)
+    xf = get_final_matrix(obj, seconds)
+    matrix = tuple(xf[i][j] for i in range(4) for j in range(4))
+
+    mesh = alembic.AbcGeom.IPolyMesh(obj, alembic.Abc.WrapExistingFlag.kWrapExisting)
+    schema = mesh.getSchema()
+    normalsParam = schema.getNormalsParam()
+    if not normalsParam.valid():
+        return None
+
+    iss = alembic.Abc.ISampleSelector(index)
+    points = _to_numpy(schema.getPositionsProperty().getValue(iss))
+    faces = _to_numpy(schema.getFaceIndicesProperty().getValue(iss),
+                      numpy.int64)
+    normals = _to_numpy(normalsParam.getExpandedValue(iss).getVals())
+
+    if len(normals) == len(faces):
+        points = points[faces]
+    elif len(normals) != len(points):
+        log.debug("[normal_lines] unsupported normals scope: %s"
+                  % obj.getFullName())
+        return None
+
+    # row vectors: points by the matrix, normals by its inverse transpose
+    m = numpy.array(matrix, dtype=numpy.float64).reshape(4, 4)
+    points = numpy.dot(points, m[:3, :3]) + m[3, :3]
+    normals = numpy.dot(normals, linalg.inv(m[:3, :3]).T)
+    norms = numpy.sqrt((normals * normals).sum(axis=1))[:, None]
+    normals = normals / numpy.where(norms > 0, norms, 1.0) * length
+
+    lines = numpy.empty((len(points) * 2, 3), dtype=numpy.float32)
+    lines[0::2] = points
+    lines[1::2] = points + normals
+    return lines
+
+def _poly_meshes(obj):
+    """
+    Yields the IPolyMesh objects below obj.
+    """
+    for child in obj.children:
+        if get_object_info(child).kind == "IPolyMesh":
+            yield child
+        for mesh in _poly_meshes(child):
+            yield mesh
+
+def scene_normal_lines(scene, seconds, length=1.0):
+    """
+    Returns the normal line segments of every poly mesh in a scene as a
+    single (n*2, 3) float32 array. Cached per scene and sample key, so
+    the hierarchy is only walked when a sample has changed.
+
+    :param scene: GLScene object
+    :param seconds: time in seconds
+    :param length: scale applied to the normals
+    """
+    sample_key = scene.archive.sample_key(seconds)
+    if sample_key is None:
+        sample_key = seconds
+    # the archive object changes when the file is reloaded
+    key = (scene.archive.getName(), id(scene.archive), sample_key, length)
+    lines = NORMAL_LINES.get(key)
+    if lines is not None:
+        return lines
+
+    arrays = []
+    for obj in _poly_meshes(scene.top()):
+        try:
+            mesh_lines = normal_lines(obj, seconds, length)
+        except Exception, e:
+            log.warn("unhandled exception: %s" % e)
+            continue
+        if mesh_lines is not None and len(mesh_lines):
+            arrays.append(mesh_lines)
+    if arrays:
+        lines = numpy.concatenate(arrays)
+    else:
+        lines = numpy.empty((0, 3), dtype=numpy.float32)
+    NORMAL_LINES.put(key, lines)
+    return lines
+
 def update_camera(func):
     """
     GL camera update decorator
@@ -83,7 +210,7 @@ def update_camera(func):
         func(*args, **kwargs)
         wid = args[0]
         wid.camera.apply()
-        wid.updateGL()
+        wid.schedule_update()
         wid.signal_camera_updated.emit(wid.camera)
         wid.state.signal_state_change.emit()
     return with_wrapped_func
@@ -172,17 +299,357 @@ class GLSplitter(QtGui.QSplitter):
         super(GLSplitter, self).__init__(orientation)
         self.wipe = wipe
 
+class PlaybackClock(object):
+    """
+    Monotonic playback clock. In "every frame" mode each frame is shown in
+    turn, however long drawing takes. In "real time" mode the frame to show
+    is derived from the time elapsed since playback started, so frames are
+    skipped to stay in sync, and counted as dropped.
+    """
+    EVERY_FRAME = "every frame"
+    REAL_TIME = "real time"
+    MODES = (EVERY_FRAME, REAL_TIME)
+
+    # number of frame intervals kept for timing statistics
+    HISTORY = 120
+
+    def __init__(self, mode=EVERY_FRAME):
+        if mode not in self.MODES:
+            log.warn("invalid playback mode: %s" % mode)
+            mode = self.EVERY_FRAME
+        self.mode = mode
+        self.__timer = QtCore.QElapsedTimer()
+        self.reset()
+
+    def __repr__(self):
+        return "<PlaybackClock %s>" % self.mode
+
+    def reset(self):
+        """
+        Clears the frame counters and timing statistics.
+        """
+        self.shown = 0
+        self.dropped = 0
+        self.__start_frame = 0
+        self.__frame = 0
+        self.__last = None
+        self.__intervals = deque(maxlen=self.HISTORY)
+
+    def start(self, frame):
+        """
+        Starts the clock from a given frame.
+
+        :param frame: current frame
+        """
+        self.reset()
+        self.__start_frame = frame
+        self.__frame = frame
+        self.__timer.start()
+
+    def elapsed(self):
+        """
+        Returns seconds elapsed since the clock started.
+        """
+        if not self.__timer.isValid():
+            return 0.0
+        return self.__timer.nsecsElapsed() / 1.0e9
+
+    def next_frame(self, fps, first_frame, last_frame):
+        """
+        Returns the next frame to show, wrapped to the frame range, or
+        None if it is not yet time to show a new frame.
+
+        :param fps: playback frames per second
+        :param first_frame: first frame of the playback range
+        :param last_frame: last frame of the playback range
+        """
+        now = self.elapsed()
+        if self.mode == self.REAL_TIME:
+            step = self.__start_frame + int(now * fps) - self.__frame
+            if step < 1:
+                return None
+            self.dropped += step - 1
+        else:
+            step = 1
+        self.__frame += step
+        self.shown += 1
+        if self.__last is not None:
+            self.__intervals.append(now - self.__last)
+        self.__last = now
+        count = max(1, last_frame - first_frame + 1)
+        return first_frame + (self.__frame - first_frame) % count
+
+    def fps(self):
+        """
+        Returns the measured frames shown per second.
+        """
+        total = sum(self.__intervals)
+        if total <= 0:
+            return 0.0
+        return len(self.__intervals) / total
+
+    def stats(self):
+        """
+        Returns per-frame timing statistics over recent frames, with
+        frame times in milliseconds.
+        """
+        intervals = self.__intervals
+        if not intervals:
+            return {"fps": 0.0, "mean": 0.0, "min": 0.0, "max": 0.0,
+                    "shown": self.shown, "dropped": self.dropped}
+        return {
+            "fps": self.fps(),
+            "mean": 1000.0 * sum(intervals) / len(intervals),
+            "min": 1000.0 * min(intervals),
+            "max": 1000.0 * max(intervals),
+            "shown": self.shown,
+            "dropped": self.dropped,
+        }
+
+class FrameScheduler(QtCore.QObject):
+    """
+    Coalesces viewer repaint requests. Requests made during one pass of
+    the event loop are collected and each viewer is repainted at most
+    once, on a zero-interval single-shot timer. Viewers that are hidden
+    or have no area are skipped; Qt repaints them when they are shown.
+    Callbacks are called once all viewers of a frame have been repainted.
+    """
+    def __init__(self, parent=None):
+        super(FrameScheduler, self).__init__(parent)
+        self.__pending = []
+        self.__timer = QtCore.QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setInterval(0)
+        self.connect(self.__timer, QtCore.SIGNAL("timeout ()"), self.flush)
+
+        # number of requests and actual repaints, for diagnostics
+        self.requests = 0
+        self.repaints = 0
+
+        # called after each flush
+        self.callbacks = []
+
+    def __repr__(self):
+        return "<FrameScheduler %d pending>" % len(self.__pending)
+
+    def schedule(self, viewer):
+        """
+        Requests a deferred repaint of a viewer.
+
+        :param viewer: GLWidget to repaint
+        """
+        self.requests += 1
+        if viewer not in self.__pending:
+            self.__pending.append(viewer)
+        if not self.__timer.isActive():
+            self.__timer.start()
+
+    def discard(self, viewer):
+        """
+        Drops any pending repaint of a viewer.
+
+        :param viewer: GLWidget
+        """
+        if viewer in self.__pending:
+            self.__pending.remove(viewer)
+
+    def flush(self):
+        """
+        Repaints all viewers with pending requests.
+        """
+        pending, self.__pending = self.__pending, []
+        for viewer in pending:
+            try:
+                if not viewer.isVisible():
+                    continue
+                if viewer.width() <= 0 or viewer.height() <= 0:
+                    continue
+                viewer.updateGL()
+                self.repaints += 1
+            except RuntimeError, e:
+                # underlying widget has been deleted
+                log.debug("[%s.flush] %s" % (self, e))
+        for func in list(self.callbacks):
+            func()
+
+class AdaptiveDetail(object):
+    """
+    Adaptive level of detail. While the time slider is dragged, or during
+    playback, frame times are compared with the frame budget and the most
+    expensive scenes, by primitive count, are stepped down to point
+    display and then to bounds, one scene at a time. Full detail returns
+    when the interaction stops.
+    """
+    # frame time, as a fraction of the budget, to step down or up at
+    STEP_DOWN = 1.0
+    STEP_UP = 0.5
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.active = False
+        self.level = 0
+        self.frame_time = 0.0
+        self.__paint_time = 0.0
+
+    def __repr__(self):
+        return "<AdaptiveDetail %d>" % self.level
+
+    def add_paint(self, seconds):
+        """
+        Adds the time one viewer took to draw its scenes to the time of
+        the current frame.
+
+        :param seconds: paint time in seconds
+        """
+        self.__paint_time += seconds
+
+    def frame_done(self, budget, num_scenes):
+        """
+        Updates the level of detail once per frame, from the paint time
+        summed over every viewer that drew the frame.
+
+        :param budget: time available per frame in seconds
+        :param num_scenes: number of drawn scenes
+        """
+        paint_time, self.__paint_time = self.__paint_time, 0.0
+        if paint_time > 0:
+            self.update(paint_time, budget, num_scenes)
+
+    def reset(self):
+        """
+        Returns to full detail.
+        """
+        self.active = False
+        self.level = 0
+
+    def update(self, frame_time, budget, num_scenes):
+        """
+        Records the time taken to draw a frame and, while active, steps
+        the level of detail down or up.
+
+        :param frame_time: time taken to draw the last frame in seconds
+        :param budget: time available per frame in seconds
+        :param num_scenes: number of drawn scenes
+        """
+        self.frame_time = frame_time
+        if not self.enabled or not self.active:
+            return
+        if frame_time > budget * self.STEP_DOWN:
+            self.level = min(self.level + 1, 2 * num_scenes)
+        elif frame_time < budget * self.STEP_UP:
+            self.level = max(self.level - 1, 0)
+
+    def modes(self, scenes):
+        """
+        Returns reduced display modes keyed by scene, empty at full detail.
+        The first "level" scenes by cost drop to points, and past that
+        the first scenes drop to bounds.
+
+        :param scenes: list of GLScene objects
+        :return: dict of GLScene to Mode value
+        """
+        if not self.enabled or not self.active or self.level == 0:
+            return {}
+        ranked = sorted(scenes, key=lambda s: s.cost(), reverse=True)
+        modes = {}
+        for rank, scene in enumerate(ranked):
+            if rank < self.level - len(ranked):
+                modes[scene] = Mode.BOUNDS
+            elif rank < self.level:
+                modes[scene] = Mode.POINT
+        return modes
+
+class GridRenderer(object):
+    """
+    Ground grid drawn from a vertex array that is built once and rebuilt
+    only when the extent, subdivisions or scale change. The spacing is
+    scaled by powers of ten so the grid covers the scene bounds.
+    """
+    def __init__(self, extent=10.0, subdivisions=10):
+        """
+        :param extent: half-width of the grid at scale 1
+        :param subdivisions: number of lines on each side of the axes
+        """
+        self.extent = extent
+        self.subdivisions = subdivisions
+        self.scale = 1.0
+        self.__key = None
+        self.__lines = None
+
+    def __repr__(self):
+        return "<GridRenderer %s>" % (self.extent * self.scale)
+
+    def fit(self, bounds):
+        """
+        Sets the scale to the power of ten at which the grid covers the
+        horizontal extent of the bounds.
+
+        :param bounds: imath.Box3d
+        """
+        if bounds is None or bounds.isEmpty() or self.extent <= 0:
+            self.scale = 1.0
+            return
+        bmin, bmax = bounds.min(), bounds.max()
+        radius = max(abs(bmin[0]), abs(bmax[0]), abs(bmin[2]), abs(bmax[2]))
+        if radius <= 0:
+            self.scale = 1.0
+            return
+        self.scale = 10.0 ** math.ceil(math.log10(radius / self.extent))
+
+    def lines(self):
+        """
+        Returns the (n*2, 3) float32 array of grid line end points,
+        rebuilding it if the grid settings changed.
+        """
+        key = (self.extent, self.subdivisions, self.scale)
+        if key != self.__key:
+            size = self.extent * self.scale
+            n = max(1, int(self.subdivisions))
+            steps = numpy.linspace(-size, size, 2 * n + 1)
+            lines = numpy.zeros((len(steps), 4, 3), dtype=numpy.float32)
+            lines[:, 0, 0] = lines[:, 1, 0] = steps
+            lines[:, 0, 2], lines[:, 1, 2] = -size, size
+            lines[:, 2, 0], lines[:, 3, 0] = -size, size
+            lines[:, 2, 2] = lines[:, 3, 2] = steps
+            self.__lines = lines.reshape(-1, 3)
+            self.__key = key
+        return self.__lines
+
+    def draw(self):
+        """
+        Draws the grid in a single call.
+        """
+        lines = self.lines()
+        glDisable(GL_LIGHTING)
+        glColor3f(0.5, 0.5, 0.5)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        try:
+            glVertexPointer(3, GL_FLOAT, 0, lines)
+            glDrawArrays(GL_LINES, 0, len(lines))
+        finally:
+            glDisableClientState(GL_VERTEX_ARRAY)
+
 class GLState(QtCore.QObject):
     """
     Global GL viewer state manager. Manages list of Cameras and Scenes, 
     which can be shared between viewers.
     """
     SECOND = 1000.0
+
+    # milliseconds between checks for scene files rewritten on disk
+    MTIME_INTERVAL = 1000.0
+
     signal_state_change = QtCore.pyqtSignal()
     signal_play_fwd = QtCore.pyqtSignal()
     signal_play_stop = QtCore.pyqtSignal()
     signal_current_time = QtCore.pyqtSignal(float)
     signal_current_frame = QtCore.pyqtSignal(int)
+    signal_scene_loaded = QtCore.pyqtSignal(GLScene)
+    signal_timeline_changed = QtCore.pyqtSignal(SessionTimeline)
+
+    # emitted from loader threads, handled in the main thread
+    signal_wrapper_loaded = QtCore.pyqtSignal(object)
+    signal_time_ready = QtCore.pyqtSignal(int)
 
     def __init__(self, fps=24.0):
         """
@@ -192,6 +659,21 @@ class GLState(QtCore.QObject):
         self.timer = QtCore.QTimer(self)
         self.active_viewer = None
         self.frames_per_second = fps
+        self.clock = PlaybackClock(config.PLAYBACK_MODE)
+        self.scheduler = FrameScheduler(self)
+        self.scheduler.callbacks.append(self._frame_done)
+        self.async_time = config.ASYNC_TIME
+        self.detail = AdaptiveDetail(config.ADAPTIVE_LOD)
+        self.cull = config.FRUSTUM_CULLING
+        self.buffers = config.GPU_BUFFERS
+        self.instancing = config.INSTANCING
+        # buffer objects are only valid in the context group that created
+        # them, so they are disabled once a viewer fails to share
+        self.shared_contexts = True
+        # root viewer of the share group holding the buffer objects
+        self.buffer_group = None
+        self.scene_bounds = SceneBounds()
+        self.__time_request = None
         self.clear()
         
         # for calculating frames per second during playback
@@ -201,6 +683,21 @@ class GLState(QtCore.QObject):
         self.connect(self.__fps_timer, QtCore.SIGNAL("timeout ()"), 
                 self._fps_timer_cb)
 
+        # reload scenes whose files are rewritten on disk
+        self.__mtime_timer = QtCore.QTimer(self)
+        self.__mtime_timer.setInterval(self.MTIME_INTERVAL)
+        self.connect(self.__mtime_timer, QtCore.SIGNAL("timeout ()"), 
+                self._mtime_timer_cb)
+        self.__mtime_timer.start()
+
+        # background scene loading
+        self.signal_wrapper_loaded.connect(self._wrapper_loaded_cb)
+        LOADER.callbacks.append(self.signal_wrapper_loaded.emit)
+
+        # asynchronous time updates
+        self.signal_time_ready.connect(self._time_ready_cb)
+        TIME_UPDATER.callbacks.append(self.signal_time_ready.emit)
+
     def uid(self):
         return id(self)
 
@@ -215,6 +712,14 @@ class GLState(QtCore.QObject):
 
         # stores all the GLScene objects
         self.__scenes = []
+        self.scene_bounds.invalidate()
+
+        # merged sample-change timeline, rebuilt on demand
+        self.__timeline = None
+
+        # timeline and frame the scenes were last updated to, and the
+        # scenes that timeline doesn't cover
+        self.__synced = (None, None, [])
 
         # stores all the GLCamera objects
         self.__cameras = {}
@@ -230,9 +735,6 @@ class GLState(QtCore.QObject):
         # "is playing" bool toggle
         self.__playing = False
 
-        # frames per second tracker
-        self.__fps_counter = 0
-
         # update all the viewers
         self.signal_state_change.emit()
 
@@ -265,7 +767,9 @@ class GLState(QtCore.QObject):
                 self.__scenes.append(scene)
             else:
                 scene.visible = True
+            scene.load_async()
             scene.set_time(self.current_time)
+            self.__timeline = None
         self.signal_state_change.emit()
 
     def add_file(self, filepath):
@@ -287,6 +791,7 @@ class GLState(QtCore.QObject):
         scene.visible = False
         if scene in self.__scenes:
             self.__scenes.remove(scene)
+            self.__timeline = None
         self.signal_state_change.emit()
 
     def add_camera(self, camera):
@@ -321,6 +826,37 @@ class GLState(QtCore.QObject):
         """
         return self.__cameras.get(name)
 
+    def _frame_done(self):
+        """
+        Frame scheduler callback, updates the level of detail from the
+        time all viewers took to draw the frame.
+        """
+        if self.frames_per_second > 0:
+            self.detail.frame_done(1.0 / self.frames_per_second,
+                                   len(self.scenes))
+
+    def _wrapper_loaded_cb(self, wrapper):
+        """
+        Background load callback, syncs scenes using the loaded wrapper
+        to the current time.
+
+        :param wrapper: SceneWrapper object
+        """
+        for scene in self.scenes:
+            if not scene.uses_wrapper(wrapper) or wrapper.cancelled:
+                continue
+            log.debug("[%s._wrapper_loaded_cb] %s" % (self, scene))
+            self.__timeline = None
+            if scene.visible:
+                scene.set_time(self.current_time)
+            self.signal_scene_loaded.emit(scene)
+
+        # rebuild the timeline once everything has loaded
+        if self.__timeline is None and \
+           not [s for s in self.scenes if s.is_loading()]:
+            self.timeline()
+        self.signal_state_change.emit()
+
     def _get_time(self):
         return self.__time
 
@@ -330,16 +866,78 @@ class GLState(QtCore.QObject):
             return
         self.__time = new_time
         self.__frame = new_time * self.frames_per_second
-        for scene in self.scenes:
-            if scene.visible:
-                scene.set_time(new_time)
         #log.debug("[%s._set_time] %s" % (self, self.__time))
+        frame = int(round(new_time * self.frames_per_second))
+
+        # decode in the background and keep drawing the last frame, unless
+        # a scene can't be read from a worker thread (HDF5)
+        if self.async_time and not self.is_playing():
+            scenes = [scene for scene in self.scenes
+                      if scene.needs_update(new_time)]
+            if scenes and all(scene.thread_safe() for scene in scenes):
+                self.signal_current_time.emit(new_time) 
+                self.signal_current_frame.emit(frame)
+                self.__time_request = TIME_UPDATER.request(new_time,
+                        [scene.scene for scene in scenes])
+                return
+        self.__time_request = None
+        self._update_scenes(new_time)
+
+        # listeners see the new time together with the new geometry
         self.signal_current_time.emit(new_time) 
-        self.signal_current_frame.emit(int(round(new_time * self.frames_per_second)))
+        self.signal_current_frame.emit(frame)
+
+    def _update_scenes(self, new_time):
+        """
+        Sets the time on all animated scenes and updates the viewers.
+
+        :param new_time: time in seconds
+        """
+        # use precomputed sample keys on whole frames
+        timeline = self.timeline()
+        frame = int(round(new_time * self.frames_per_second))
+        if abs(frame - new_time * self.frames_per_second) > 1e-6:
+            timeline = None
+
+        # stepping to the next frame only touches the scenes whose samples
+        # change there, plus the scenes the timeline doesn't cover
+        synced_timeline, synced_frame, uncovered = self.__synced
+        if timeline is not None and timeline is synced_timeline \
+                and frame == synced_frame + 1:
+            scenes = timeline.changes(frame) + uncovered
+        else:
+            scenes = self.scenes
+            if timeline is not None:
+                uncovered = [s for s in scenes
+                             if timeline.key(s, frame) is None]
+
+        for scene in scenes:
+            if scene.visible and not scene.is_constant():
+                key = None
+                if timeline is not None:
+                    key = timeline.key(scene, frame)
+                scene.set_time(new_time, key)
+
+        if timeline is not None:
+            self.__synced = (timeline, frame, uncovered)
+        else:
+            self.__synced = (None, None, [])
 
         # update other viewers
         self.signal_state_change.emit()
-        
+
+    def _time_ready_cb(self, serial):
+        """
+        Asynchronous time update callback, swaps in the decoded frames
+        unless a newer time has been requested since.
+
+        :param serial: TimeUpdater request serial
+        """
+        if serial != self.__time_request:
+            return
+        self.__time_request = None
+        self._update_scenes(self.__time)
+
     current_time = property(_get_time, _set_time, doc="set/get current time")
 
     def _get_frame(self):
@@ -378,16 +976,54 @@ class GLState(QtCore.QObject):
         """
         #log.debug("[%s.time_range] %s, %s" % (self, self.__min, self.__max))
         if self.__min == None or self.__max == None:
-            if self.scenes:
-                for scene in self.scenes:
-                    if self.__min is None or scene.min_time() < min:
-                        self.__min = scene.min_time()
-                    if self.__max is None or scene.max_time() > max:
-                        self.__max = scene.max_time()
-            else:
-                self.__min, self.__max = 0, 0
+            # scenes still loading in the background don't know their
+            # range yet, so it is not kept until they have loaded
+            loaded = [s for s in self.scenes if not s.is_loading()]
+            low, high = self.__min, self.__max
+            for scene in loaded:
+                if low is None or scene.min_time() < low:
+                    low = scene.min_time()
+                if high is None or scene.max_time() > high:
+                    high = scene.max_time()
+            if low is None or high is None:
+                return (low or 0, high or 0)
+            if len(loaded) < len(self.scenes):
+                return (low, high)
+            self.__min, self.__max = low, high
         return (self.__min, self.__max)
 
+    def bounds(self, seconds=None):
+        """
+        Returns the union of the visible scene bounds, with transform
+        overrides applied, or None.
+
+        :param seconds: time in seconds, defaults to the current time
+        """
+        if seconds is None:
+            seconds = self.current_time
+        return self.scene_bounds.bounds(self.scenes, seconds)
+
+    def timeline(self):
+        """
+        Returns the merged sample-change timeline of the loaded scenes
+        over the current frame range, rebuilding it when scenes or the
+        frame range have changed.
+
+        :return: SessionTimeline object, or None
+        """
+        if self.frames_per_second <= 0:
+            return None
+        first_frame, last_frame = self.frame_range()
+        first_frame = int(round(first_frame))
+        last_frame = int(round(last_frame))
+        if self.__timeline is None or not self.__timeline.matches(
+                self.frames_per_second, first_frame, last_frame):
+            scenes = [s for s in self.scenes if not s.is_loading()]
+            self.__timeline = SessionTimeline(scenes, self.frames_per_second,
+                                              first_frame, last_frame)
+            self.signal_timeline_changed.emit(self.__timeline)
+        return self.__timeline
+
     def _get_min_frame(self):
         return self.frame_range()[0]
 
@@ -429,14 +1065,35 @@ class GLState(QtCore.QObject):
         """
         return self.__playing
 
+    def _get_playback_mode(self):
+        return self.clock.mode
+
+    def _set_playback_mode(self, mode):
+        if mode not in PlaybackClock.MODES:
+            raise Exception("Invalid playback mode: %s" % mode)
+        self.clock.mode = mode
+        if self.is_playing():
+            self.stop()
+            self.play()
+
+    playback_mode = property(_get_playback_mode, _set_playback_mode,
+                             doc="set/get playback mode")
+
     def play(self):
         """
         Plays loaded scenes by activating timer and setting callback
         """
-        self.timer.setInterval(self.SECOND / (float(self.frames_per_second)))
+        interval = self.SECOND / float(self.frames_per_second)
+
+        # poll the clock more often than the frame rate in real time mode
+        if self.clock.mode == PlaybackClock.REAL_TIME:
+            interval /= 2.0
+        self.timer.setInterval(interval)
         self.connect(self.timer, QtCore.SIGNAL("timeout ()"), self._play_fwd_cb)
+        self.clock.start(int(round(self.current_frame)))
         self.timer.start()
         self.__fps_timer.start()
+        self.detail.active = True
         self.signal_play_fwd.emit()
 
     def _play_fwd_cb(self):
@@ -444,11 +1101,24 @@ class GLState(QtCore.QObject):
         Play callback, sets current time for all scenes
         """
         self.__playing = True
-        min_time, max_time = self.time_range()
-        self.current_time += 1.0 / float(self.frames_per_second)
-        if self.current_time > max_time:
-            self.current_time = min_time
-        self.__fps_counter += 1
+        first_frame, last_frame = self.frame_range()
+        frame = self.clock.next_frame(self.frames_per_second,
+                                      int(round(first_frame)),
+                                      int(round(last_frame)))
+        if frame is None:
+            return
+        self.current_time = frame / float(self.frames_per_second)
+        self._prefetch()
+
+    def _prefetch(self):
+        """
+        Reads frames ahead of the current frame for visible scenes.
+        """
+        first_frame, last_frame = self.frame_range()
+        frame = int(round(self.current_time * self.frames_per_second))
+        for scene in self.scenes:
+            scene.prefetch(frame, self.frames_per_second,
+                           int(round(first_frame)), int(round(last_frame)))
 
     def stop(self):
         """
@@ -458,17 +1128,45 @@ class GLState(QtCore.QObject):
         self.disconnect(self.timer,  QtCore.SIGNAL("timeout ()"), self._play_fwd_cb)
         self.timer.stop()
         self.__fps_timer.stop()
-        self.__fps_counter = 0
+        PREFETCHER.cancel()
         self.fps = 0.0
+        self._restore_detail()
         self.signal_play_stop.emit()
 
+    def set_scrubbing(self, scrubbing):
+        """
+        Marks the start or end of an interactive time change, e.g. the
+        time slider being dragged.
+
+        :param scrubbing: True while scrubbing
+        """
+        if scrubbing:
+            self.detail.active = True
+        else:
+            self._restore_detail()
+
+    def _restore_detail(self):
+        """
+        Returns all scenes to full detail once interaction stops.
+        """
+        level = self.detail.level
+        self.detail.reset()
+        if level > 0:
+            self.signal_state_change.emit()
+
     def _fps_timer_cb(self):
         """
         Frames per second timer callback
         """
-        self.fps = (self.__fps_counter / float(self.frames_per_second)) * \
-                      self.frames_per_second
-        self.__fps_counter = 0
+        self.fps = self.clock.fps()
+
+    def _mtime_timer_cb(self):
+        """
+        File change timer callback, reloads rewritten scenes.
+        """
+        reloaded = [s for s in self.scenes if s.check_mtime()]
+        if reloaded:
+            self.signal_state_change.emit()
 
 class GLWidget(QtOpenGL.QGLWidget):
     """
@@ -502,10 +1200,11 @@ class GLWidget(QtOpenGL.QGLWidget):
     # error signals
     signal_undrawable_scene = QtCore.pyqtSignal(GLScene, float)
 
-    def __init__(self, parent=None, state=None):
+    def __init__(self, parent=None, state=None, share=None):
         """
         :param parent: parent Qt object
         :param state: GLState object (for shared states)
+        :param share: GLWidget whose GL context and resources to share
         """
         self.camera = None
         format = QtOpenGL.QGLFormat()
@@ -513,7 +1212,14 @@ class GLWidget(QtOpenGL.QGLWidget):
         format.setSampleBuffers(True)
         self.state = state or GLState()
         self.state.signal_state_change.connect(self.handle_state_change)
-        super(GLWidget, self).__init__(format, parent)
+        super(GLWidget, self).__init__(format, parent, share)
+        if share is not None and not self.isSharing():
+            log.warn("[%s] GL context could not be shared with %s"
+                     % (self, share))
+        if share is not None and self.isSharing():
+            self.share_group = share.share_group
+        else:
+            self.share_group = self
         self.setAutoBufferSwap(True)
         self.setMouseTracking(True)
         self.setFocusPolicy(QtCore.Qt.StrongFocus)
@@ -523,7 +1229,6 @@ class GLWidget(QtOpenGL.QGLWidget):
 
         # various matrices and vectors
         self.__bounds_default = imath.Box3d((-5,-5,-5), (5,5,5))
-        self.__bounds = None
         self.__radius = 5.0
         self.__last_pok = False
         self.__last_p2d = QtCore.QPoint()
@@ -531,6 +1236,23 @@ class GLWidget(QtOpenGL.QGLWidget):
         self.__rotating = False
         self.__mode = GL_SELECT
 
+        # view matrices of the last paint, for picking
+        self.__view = None
+
+        # points drawn in this viewport, and the points its clouds had
+        # in view at the last paint
+        self.point_budget = config.POINT_BUDGET or 1000000
+        self.decimate_points = config.POINT_BUDGET > 0
+        self.points_in_view = 0
+
+        # scenes drawn, culled and instanced, and objects drawn and
+        # culled outside of instances, in the last paint
+        self.cull_stats = (0, 0, 0, 0, 0)
+
+        # ground grid, refit when the drawn scenes change
+        self.grid = GridRenderer(config.GRID_EXTENT, config.GRID_SUBDIVISIONS)
+        self.__grid_scenes = None
+
         # viewers must have at least one camera
         self.setup_default_camera()
 
@@ -573,7 +1295,7 @@ class GLWidget(QtOpenGL.QGLWidget):
         log.debug("[%s.add_scene] %s" % (self, scene))
         self.state.add_scene(scene)
         self.signal_scene_opened.emit(scene)
-        self.updateGL()
+        self.schedule_update()
 
     def remove_scene(self, scene):
         """
@@ -584,7 +1306,7 @@ class GLWidget(QtOpenGL.QGLWidget):
         log.debug("[%s.remove_scene] %s" % (self, scene))
         self.state.remove_scene(scene)
         self.signal_scene_removed.emit(scene)
-        self.updateGL()
+        self.schedule_update()
 
     def add_camera(self, camera):
         """
@@ -631,35 +1353,13 @@ class GLWidget(QtOpenGL.QGLWidget):
         return self.width() / float(self.height())
     
     def _get_bounds(self):
-        #TODO: ugly code needs refactor
-        if self.state.scenes:
-            bounds = None
-            for scene in self.state.scenes:
-                if not scene.loaded or not scene.drawable():
-                    continue
-                if bounds is None or \
-                        scene.bounds(self.state.current_time).max() > \
-                        bounds.max():
-                    bounds = scene.bounds(self.state.current_time)
-                    min = bounds.min()
-                    max = bounds.max()
-                    if scene.properties.get("translate"):
-                        max = max * imath.V3d(*scene.translate)
-                        min = min * imath.V3d(*scene.translate)
-                    if scene.properties.get("scale"):
-                        max = max * imath.V3d(*scene.scale)
-                        min = min * imath.V3d(*scene.scale)
-                    bounds = imath.Box3d(min, max)
-            
-            if bounds is None:
-                return self.__bounds_default
-            self.__bounds = bounds
-            return self.__bounds
-        else:
+        bounds = self.state.bounds()
+        if bounds is None:
             return self.__bounds_default
+        return bounds
 
     def _set_bounds(self, bounds):
-        self.__bounds = bounds
+        self.__bounds_default = bounds
 
     bounds = property(_get_bounds, _set_bounds, doc="scene bounding box")
 
@@ -716,7 +1416,12 @@ class GLWidget(QtOpenGL.QGLWidget):
         group2.layout().setSpacing(0)
         group2.layout().setMargin(0)
 
-        new_viewer = GLWidget(self._main, state=self.state)
+        # share buffers uploaded by this viewer with the new pane
+        share = self if config.SHARE_CONTEXTS else None
+        new_viewer = GLWidget(self._main, state=self.state, share=share)
+        if not new_viewer.isSharing():
+            self.state.shared_contexts = False
+        new_viewer.decimate_points = self.decimate_points
 
         self.camera.add_view(new_viewer)
         group2.layout().addWidget(new_viewer)
@@ -767,6 +1472,10 @@ class GLWidget(QtOpenGL.QGLWidget):
         for camera in self.state.cameras:
             camera.remove_view(self)
 
+        # stop repainting this view on state changes
+        self.state.signal_state_change.disconnect(self.handle_state_change)
+        self.state.scheduler.discard(self)
+
         # reassign the viewer attribute on main
         if self._main:
             self._main.viewer = self.parent().other.viewer
@@ -777,71 +1486,34 @@ class GLWidget(QtOpenGL.QGLWidget):
 
     def _paint_normals(self):
         """
-        Paints normals for polys and subds.
+        Paints normals for polys, one vertex array draw per scene.
         """
-        glColor3f(1, 1, 1)
-        def _draw(obj):
-            md = obj.getMetaData()
-            if alembic.AbcGeom.IPolyMesh.matches(md) or alembic.AbcGeom.ISubD.matches(md):
-                meshObj = alembic.AbcGeom.IPolyMesh(obj.getParent(), obj.getName())
-                mesh = meshObj.getSchema()
-                
-                ts = mesh.getTimeSampling()
-                index = ts.getNearIndex(self.state.current_time, mesh.getNumSamples())
-                facesProp = mesh.getFaceIndicesProperty()
-                pointsProp = mesh.getPositionsProperty()
-                normalsProp = mesh.getNormalsParam().getValueProperty()
-
-                for p in [facesProp, pointsProp, normalsProp]:
-                    if not p.valid():
-                        return
-
-                faces = facesProp.getValue(index)
-                points = pointsProp.getValue(index)
-                normals = normalsProp.getValue(index)
-                xf = get_final_matrix(meshObj, self.state.current_time)
-
-                for i, fi in enumerate(faces):
-                    p = points[fi] * xf
-                    n = normals[i]
-                    v = p + n
-                    glBegin(GL_LINES)
-                    glColor3f(0, 1, 0)
-                    glVertex3f(p[0], p[1], p[2])
-                    glVertex3f(v[0], v[1], v[2])
-                    glEnd()
-        
-            for child in obj.children:
-                try:
-                    _draw(child)
-                except Exception, e:
-                    log.warn("unhandled exception: %s" % e)
-
-        for scene in self.state.scenes:
-            _draw(scene.top())
+        glColor3f(0, 1, 0)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        try:
+            for scene in self.state.scenes:
+                if not scene.visible or scene.is_loading():
+                    continue
+                lines = scene_normal_lines(scene, self.state.current_time)
+                if not len(lines):
+                    continue
+                glVertexPointer(3, GL_FLOAT, 0, lines)
+                glDrawArrays(GL_LINES, 0, len(lines))
+        finally:
+            glDisableClientState(GL_VERTEX_ARRAY)
 
     def _paint_grid(self):
         """
         Paints the grid.
         """
-        glDisable(GL_LIGHTING)
-        glColor3f(0.5, 0.5, 0.5)
-        for x in range(-10, 11):
-            if x == 0:
-                continue
-            glBegin(GL_LINES)
-            glVertex3f(x, 0, -10)
-            glVertex3f(x, 0, 10)
-            glVertex3f(-10, 0, x)
-            glVertex3f(10, 0, x)
-            glEnd()
-        
-        glBegin(GL_LINES)
-        glVertex3f(0, 0, -10)
-        glVertex3f(0, 0, 10)
-        glVertex3f(-10, 0, 0)
-        glVertex3f(10, 0, 0)
-        glEnd()
+        if config.GRID_FIT:
+            # refit when scenes are added, removed or finish loading
+            scenes = tuple((id(s), s.loaded, s.is_loading())
+                           for s in self.state.scenes)
+            if scenes != self.__grid_scenes:
+                self.__grid_scenes = scenes
+                self.grid.fit(self.bounds if self.state.scenes else None)
+        self.grid.draw()
 
     def _paint_hud(self):
         """
@@ -876,6 +1548,17 @@ class GLWidget(QtOpenGL.QGLWidget):
         font = QtGui.QFont("Arial", 9)
         self.renderText(self.width()-100, self.height()-10, "%.1f / %.1f FPS" 
                 % (self.state.fps, self.state.frames_per_second), font)
+        if self.state.playback_mode == PlaybackClock.REAL_TIME:
+            self.renderText(self.width()-100, self.height()-25, "%d dropped"
+                    % self.state.clock.dropped, font)
+        if self.state.detail.level > 0:
+            self.renderText(self.width()-100, self.height()-40, "LOD %d"
+                    % self.state.detail.level, font)
+        if self.state.cull:
+            self.renderText(15, self.height()-10,
+                    "%d scenes, %d culled, %d instanced / "
+                    "%d objects, %d culled"
+                    % self.cull_stats, font)
 
         glColor3f(1, 1, 1)
 
@@ -936,11 +1619,18 @@ class GLWidget(QtOpenGL.QGLWidget):
         else:
             return False, v3d
 
+    def schedule_update(self):
+        """
+        Requests a repaint on the next pass of the event loop. Multiple
+        requests made before then result in a single repaint.
+        """
+        self.state.scheduler.schedule(self)
+
     def handle_state_change(self):
         """
         State change signal handler.
         """
-        self.updateGL()
+        self.schedule_update()
 
     def handle_set_camera(self, action):
         """
@@ -964,131 +1654,120 @@ class GLWidget(QtOpenGL.QGLWidget):
         self.camera.mode = mode
         self.setCursor(QtCore.Qt.ArrowCursor)
 
-    def handle_camera_action(self, action):
+    def handle_set_realtime(self, value):
         """
-        New camera menu handler.
+        Real-time playback toggle handler.
 
-        :param action: QAction object
+        :param value: True for real time, False to play every frame
         """
-        action_name = str(action.text().toAscii())
-        if action_name == "New":
-            text, ok = QtGui.QInputDialog.getText(self, "New Camera",
-                                  "Camera Name:", QtGui.QLineEdit.Normal)
-            if ok and not text.isEmpty():
-                name = str(text.toAscii())
-                camera = GLCamera(self, name)
-                self.add_camera(camera)
-                self.set_camera(name)
+        if value:
+            self.state.playback_mode = PlaybackClock.REAL_TIME
+        else:
+            self.state.playback_mode = PlaybackClock.EVERY_FRAME
 
-    def selection(self, x, y):
+    def handle_set_async_time(self, value):
         """
-        Bounding box selection handler. This handles selecting at the 
-        scene level, e.g. GLScenes. Object-level selection is handled
-        in the AbcOpenGL lib. 
+        Asynchronous time updates toggle handler.
 
-        :param x: mouse x position
-        :param y: mouse y position
-        :return: list of GLScene objects
+        :param value: True to decode new times in the background
         """
-        log.debug("[%s.selection] %s %s %s" % (self, x, y, self.camera))
-
-        self.setDisabled(True)
-
-        #--- begin adjustments for fixed aspect ratio cameras
-        #TODO: consolidate this code and same from _paint_fixed()
-
-        # get basic size values for this viewer
-        camera_width = self.camera.get_size(self)[0]
-        camera_height = self.camera.get_size(self)[1]
-        camera_aspect_ratio = camera_width / float(camera_height)
-        
-        # if fixed, lock the aspect ratio
-        if self.camera.fixed:
-            camera_aspect_ratio = self.camera.aspect_ratio
-            if self.aspect_ratio() > self.camera.aspect_ratio:
-                w = int(self.width() / (self.aspect_ratio() \
-                        / camera_aspect_ratio))
-                h = camera_height
-            else:
-                w = camera_width
-                h = int(self.height() * (self.aspect_ratio() \
-                        / camera_aspect_ratio))
-            _x = int(abs(w-self.width()) / 2.0)
-            _y = int(abs(h-self.height()) / 2.0)
-
-        # camera size matches viewer
-        else:
-            _x = _y = 0
-            w = self.width()
-            h = self.height()
-        
-        #--- end fixed ratio adjustments
-
-        MaxSize = 512
+        self.state.async_time = value
 
-        #viewport = glGetIntegerv(GL_VIEWPORT)
-        viewport = [_x, _y, w, h]
-        buffer = glSelectBuffer(MaxSize)
+    def handle_set_adaptive_detail(self, value):
+        """
+        Adaptive level of detail toggle handler.
 
-        glRenderMode(GL_SELECT)
-        glInitNames()
+        :param value: True to reduce detail while scrubbing or playing
+        """
+        self.state.detail.enabled = value
+        if not value:
+            self.state.detail.level = 0
 
-        # adjust mouse y value
-        if self.camera.fixed:
-            y = y - (_y * 2)
+    def handle_set_cull(self, value):
+        """
+        Frustum culling toggle handler.
 
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        gluPickMatrix(x, (viewport[3] - y), 5.0, 5.0, viewport)
+        :param value: True to skip scenes and objects outside the view
+        """
+        self.state.cull = value
+        self.schedule_update()
 
-        # adjust ratio for fixed cameras
-        if self.camera.fixed:
-            ratio = self.camera.aspect_ratio
-        else:
-            ratio = self.aspect_ratio()
+    def handle_set_instancing(self, value):
+        """
+        Instanced drawing toggle handler.
 
-        gluPerspective(self.camera.fovy, camera_aspect_ratio, 
-                       self.camera.near, self.camera.far)
+        :param value: True to draw copies of the same file in one pass
+        """
+        self.state.instancing = value
+        self.schedule_update()
 
-        # draw the scenes
-        for scene in self.state.scenes:
+    def handle_set_decimate_points(self, value):
+        """
+        Point decimation toggle handler.
 
-            # skip non-visible scenes
-            if not scene.visible:
-                continue
+        :param value: True to draw large point clouds as a subset
+        """
+        self.decimate_points = value
+        self.schedule_update()
 
-            #TODO: pick on translated scenes
-            # push local transforms
-            #glPushMatrix()
-            #glTranslatef(*scene.translate)
-            #glRotatef(*scene.rotate)
-            #glScalef(*scene.scale)
+    def handle_set_buffers(self, value):
+        """
+        GPU buffers toggle handler.
 
-            # pick anywhere within the scene bounds
-            if scene.mode != Mode.OFF:
-                mode = GL_POLYGON
+        :param value: True to keep mesh data in GPU buffer objects
+        """
+        self.state.buffers = value
+        self.schedule_update()
 
-            # pick just on the bounding box edges
-            else:
-                mode = GL_LINES
-            
-            # draw scene bounds
-            scene.draw_bounds(self.state.current_time, mode)
+    def handle_camera_action(self, action):
+        """
+        New camera menu handler.
 
-            # pop local transforms
-            #glPopMatrix()
+        :param action: QAction object
+        """
+        action_name = str(action.text().toAscii())
+        if action_name == "New":
+            text, ok = QtGui.QInputDialog.getText(self, "New Camera",
+                                  "Camera Name:", QtGui.QLineEdit.Normal)
+            if ok and not text.isEmpty():
+                name = str(text.toAscii())
+                camera = GLCamera(self, name)
+                self.add_camera(camera)
+                self.set_camera(name)
 
-        #glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
+    @PROFILER.timed("selection")
+    def pick(self, x, y):
+        """
+        Casts a ray from the camera through a mouse position against the
+        bounds of the visible scenes and their objects, including scene
+        transform overrides.
 
-        # get the list of gl picks
-        hits = glRenderMode(GL_RENDER)
+        :param x: mouse x position
+        :param y: mouse y position
+        :return: (GLScene, object path or None, distance) or None
+        """
+        if self.__view is None:
+            return None
+        modelview, projection, viewport = self.__view
+        origin, direction = pick_ray(x, y, self.height(), modelview,
+                                     projection, viewport)
+        return pick(self.state.scenes, origin, direction,
+                    self.state.current_time)
 
-        self.setDisabled(False)
+    def selection(self, x, y):
+        """
+        Scene selection handler. This handles selecting at the scene
+        level, e.g. GLScenes, see pick() for object paths.
 
-        # return list of picked scenes
-        return self.state.scenes[hits[-1].names[-1]] if hits else None
+        :param x: mouse x position
+        :param y: mouse y position
+        :return: nearest GLScene hit, or None
+        """
+        log.debug("[%s.selection] %s %s %s" % (self, x, y, self.camera))
+        hit = self.pick(x, y)
+        if hit is None:
+            return None
+        return hit[0]
 
     def isReady(self):
         if not self.isVisible():
@@ -1129,18 +1808,77 @@ class GLWidget(QtOpenGL.QGLWidget):
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
         # update camera
-        self.camera.apply()
+        with PROFILER.stage("camera"):
+            self.camera.apply()
 
         # adjusts the camera size
-        self._paint_fixed()
+        with PROFILER.stage("fixed"):
+            self._paint_fixed()
+
+        # keep the view matrices for picking
+        self.__view = (glGetDoublev(GL_MODELVIEW_MATRIX),
+                       glGetDoublev(GL_PROJECTION_MATRIX),
+                       glGetIntegerv(GL_VIEWPORT))
         
         # draw the grid lines
         if self.camera.draw_grid:
-            self._paint_grid()
+            with PROFILER.stage("grid"):
+                self._paint_grid()
         
         # draw geom normals
         if self.camera.draw_normals:
-            self._paint_normals()
+            with PROFILER.stage("normals"):
+                self._paint_normals()
+
+        with PROFILER.stage("scenes"):
+            self._paint_scenes()
+
+        # draw the heads-up-display
+        if self.camera.draw_hud:
+            with PROFILER.stage("hud"):
+                self._paint_hud()
+
+        PROFILER.frame_done()
+
+    def _paint_scenes(self):
+        """
+        Paints the visible scenes.
+        """
+        start = time.time()
+
+        # view frustum for scenes without transform overrides
+        cull = self.state.cull
+        frustum = Frustum.from_gl() if cull else None
+        scenes_drawn = scenes_culled = scenes_instanced = 0
+        objects_drawn = objects_culled = 0
+        buffers = self.state.buffers and self.state.shared_contexts
+
+        # released buffer objects are deleted with a context of their
+        # share group current
+        if buffers:
+            self.state.buffer_group = self.share_group
+        if self.share_group is self.state.buffer_group:
+            flush_buffer_deletes()
+
+        # point budget for this viewport, split across its clouds
+        if self.decimate_points:
+            set_point_budget(self.point_budget, self.points_in_view)
+        else:
+            set_point_budget(0)
+
+        # reduced display modes while scrubbing or playing
+        reduced = self.state.detail.modes(
+                [s for s in self.state.scenes if s.visible])
+
+        # scenes loaded more than once from the same file are collected
+        # per instance key and draw mode, and drawn in one pass below
+        counts = defaultdict(int)
+        if self.state.instancing:
+            for scene in self.state.scenes:
+                if scene.visible and not scene.is_loading() \
+                        and scene.drawable():
+                    counts[scene.instance_key()] += 1
+        instances = defaultdict(list)
 
         # draw each scene
         for scene in self.state.scenes:
@@ -1155,9 +1893,12 @@ class GLWidget(QtOpenGL.QGLWidget):
                 continue
 
             # draw mode override
-            mode = GL_MODE_MAP.get(scene.properties.get("mode"), 
-                   GL_MODE_MAP.get(self.camera.mode, GL_LINE)
-                   )
+            abc_mode = scene.properties.get("mode")
+            if abc_mode not in GL_MODE_MAP:
+                abc_mode = self.camera.mode
+            if scene in reduced and abc_mode in GL_MODE_MAP:
+                abc_mode = min(abc_mode, reduced[scene])
+            mode = GL_MODE_MAP.get(abc_mode, GL_LINE)
             if mode > 1:
                 glPolygonMode(GL_FRONT_AND_BACK, mode)
            
@@ -1167,31 +1908,69 @@ class GLWidget(QtOpenGL.QGLWidget):
                 glTranslatef(*scene.translate)
                 glRotatef(*scene.rotate)
                 glScalef(*scene.scale)
+
+            # skip scenes entirely outside the view
+            if cull and not scene.is_loading():
+                if scene.has_xform_overrides():
+                    view = Frustum.from_gl()
+                else:
+                    view = frustum
+                if not view.intersects(scene.bounds(self.state.current_time)):
+                    scenes_culled += 1
+                    if scene.has_xform_overrides():
+                        glPopMatrix()
+                    continue
             
             if scene.selected:
-                glColor3d(0.5, 0.5, 0)
+                color = (0.5, 0.5, 0)
             else:
-                glColor3f(*scene.color)
+                color = tuple(scene.color)
+            glColor3f(*color)
 
             # draw scene bounds
             if self.camera.draw_bounds:
                 scene.draw_bounds(self.state.current_time)
             
-            # draw scene geom
-            if mode != Mode.OFF:
-                scene.draw(self.camera.visible, mode == Mode.BOUNDS)
+            # draw scene geom, instanced scenes are not culled per object
+            # so they are counted apart
+            if mode != Mode.OFF and not scene.is_loading() \
+                    and counts.get(scene.instance_key(), 0) > 1:
+                instances[(scene.instance_key(), mode)].append(
+                        (scene, color))
+                scenes_instanced += 1
+            else:
+                scenes_drawn += 1
+                if mode != Mode.OFF:
+                    scene.draw(self.camera.visible, mode == Mode.BOUNDS,
+                               cull, buffers)
+                    if cull:
+                        drawn, culled = scene.cull_stats()
+                        objects_drawn += drawn
+                        objects_culled += culled
             
             # draw scene labels
-            if self.camera.draw_labels:
+            if self.camera.draw_labels and not scene.is_loading():
                 c = scene.bounds().center()
                 self.renderText(c[0], c[1], c[2], scene.name)
 
             if scene.has_xform_overrides():
                 glPopMatrix()
-        
-        # draw the heads-up-display
-        if self.camera.draw_hud:
-            self._paint_hud()
+
+        # draw the collected instances, one pass per file and mode
+        for (key, mode), group in instances.items():
+            if mode > 1:
+                glPolygonMode(GL_FRONT_AND_BACK, mode)
+            scenes = [scene for scene, color in group]
+            colors = [color for scene, color in group]
+            scenes[0].draw_instances(scenes, colors, self.camera.visible,
+                                     mode == Mode.BOUNDS, buffers)
+
+        self.cull_stats = (scenes_drawn, scenes_culled, scenes_instanced,
+                           objects_drawn, objects_culled)
+        self.points_in_view = get_points_in_view()
+
+        # the level of detail is updated once all viewers have painted
+        self.state.detail.add_paint(time.time() - start)
             
     def resizeGL(self, width, height):
         try:
@@ -1220,7 +1999,7 @@ class GLWidget(QtOpenGL.QGLWidget):
             if not found:
                 self.handle_set_mode(mode)
             self.state.current_frame = self.state.current_frame
-            self.updateGL()
+            self.schedule_update()
             self.setCursor(QtCore.Qt.ArrowCursor)
 
         # space bar - playback control
@@ -1312,19 +2091,10 @@ class GLWidget(QtOpenGL.QGLWidget):
         if self.camera.mode == Mode.OFF:
             return
 
-        # get scene selection hits
-        hit = None
-        for scene in self.state.scenes:
-            if scene.mode == Mode.OFF or not scene.visible:
-                continue
-            x, y = event.pos().x(), event.pos().y()
-            camera = self.camera.views[self]
-            hit = scene.selection(x, y, camera)
-
-        #HACK: need a better/faster way to find the object
-        if hit:
-            name = hit.split("/")[-1]
-            self.signal_object_selected.emit(".*%s" % name)
+        # get the nearest object hit
+        hit = self.pick(event.pos().x(), event.pos().y())
+        if hit and hit[1]:
+            self.signal_object_selected.emit("%s$" % re.escape(hit[1]))
 
     def mousePressEvent(self, event):
         """
@@ -1474,6 +2244,63 @@ class GLWidget(QtOpenGL.QGLWidget):
                     self.camera._set_draw_grid)
             options_menu.addAction(self.gridAct)
 
+            # real time playback toggle menu item
+            self.realtimeAct = QtGui.QAction("Real-time Playback ", self)
+            self.realtimeAct.setCheckable(True)
+            self.realtimeAct.setChecked(
+                    self.state.playback_mode == PlaybackClock.REAL_TIME)
+            self.connect(self.realtimeAct, QtCore.SIGNAL("toggled (bool)"), 
+                    self.handle_set_realtime)
+            options_menu.addAction(self.realtimeAct)
+
+            # asynchronous time updates toggle menu item
+            self.asyncTimeAct = QtGui.QAction("Async Time Updates ", self)
+            self.asyncTimeAct.setCheckable(True)
+            self.asyncTimeAct.setChecked(self.state.async_time)
+            self.connect(self.asyncTimeAct, QtCore.SIGNAL("toggled (bool)"), 
+                    self.handle_set_async_time)
+            options_menu.addAction(self.asyncTimeAct)
+
+            # adaptive level of detail toggle menu item
+            self.detailAct = QtGui.QAction("Adaptive Detail ", self)
+            self.detailAct.setCheckable(True)
+            self.detailAct.setChecked(self.state.detail.enabled)
+            self.connect(self.detailAct, QtCore.SIGNAL("toggled (bool)"), 
+                    self.handle_set_adaptive_detail)
+            options_menu.addAction(self.detailAct)
+
+            # frustum culling toggle menu item
+            self.cullAct = QtGui.QAction("Frustum Culling ", self)
+            self.cullAct.setCheckable(True)
+            self.cullAct.setChecked(self.state.cull)
+            self.connect(self.cullAct, QtCore.SIGNAL("toggled (bool)"), 
+                    self.handle_set_cull)
+            options_menu.addAction(self.cullAct)
+
+            # gpu buffers toggle menu item
+            self.buffersAct = QtGui.QAction("GPU Buffers ", self)
+            self.buffersAct.setCheckable(True)
+            self.buffersAct.setChecked(self.state.buffers)
+            self.connect(self.buffersAct, QtCore.SIGNAL("toggled (bool)"), 
+                    self.handle_set_buffers)
+            options_menu.addAction(self.buffersAct)
+
+            # instancing toggle menu item
+            self.instancingAct = QtGui.QAction("Instancing ", self)
+            self.instancingAct.setCheckable(True)
+            self.instancingAct.setChecked(self.state.instancing)
+            self.connect(self.instancingAct, QtCore.SIGNAL("toggled (bool)"), 
+                    self.handle_set_instancing)
+            options_menu.addAction(self.instancingAct)
+
+            # point decimation toggle menu item
+            self.decimateAct = QtGui.QAction("Decimate Points ", self)
+            self.decimateAct.setCheckable(True)
+            self.decimateAct.setChecked(self.decimate_points)
+            self.connect(self.decimateAct, QtCore.SIGNAL("toggled (bool)"), 
+                    self.handle_set_decimate_points)
+            options_menu.addAction(self.decimateAct)
+
             # visibility toggle menu item
             self.visibleAct = QtGui.QAction("Visible Only ", self)
             self.visibleAct.setShortcut("Shift+V")
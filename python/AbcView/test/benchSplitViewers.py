@@ -0,0 +1,173 @@
+#-******************************************************************************
+#
+# Copyright (c) 2014,
+#  Sony Pictures Imageworks Inc. and
+#  Industrial Light & Magic, a division of Lucasfilm Entertainment Company Ltd.
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+# *       Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+# *       Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+# *       Neither the name of Sony Pictures Imageworks, nor
+# Industrial Light & Magic, nor the names of their contributors may be used
+# to endorse or promote products derived from this software without specific
+# prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#-******************************************************************************
+
+"""
+Compares GPU memory and first-paint (upload) time of a heavy mesh shown
+in one viewer pane and in split panes, with and without shared GL
+contexts, and with and without GPU buffer objects. Needs a display,
+which may be software GL (e.g. LIBGL_ALWAYS_SOFTWARE=1 xvfb-run). ::
+
+    $ python benchSplitViewers.py --size 1000 --panes 4
+    $ python benchSplitViewers.py --size 1000 --panes 4 --no-share
+    $ python benchSplitViewers.py --size 1000 --panes 1 --no-buffers
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import imath
+import alembic
+
+from PyQt4 import QtCore
+from PyQt4 import QtGui
+
+from OpenGL.GL import glGetIntegerv, glGetString, GL_EXTENSIONS
+
+import alembicgl
+
+from abcview import config
+from abcview.gl import GLScene
+from abcview.widget.viewer_widget import GLWidget
+
+# temporary directory for holding test data
+TEMPDIR = tempfile.mkdtemp()
+
+# GL_NVX_gpu_memory_info, current available dedicated memory in kb
+GPU_MEMORY_AVAILABLE_NVX = 0x9049
+
+def write_grid(filepath, size):
+    """
+    Writes a constant poly mesh grid of size x size quads.
+    """
+    oarch = alembic.Abc.OArchive(str(filepath))
+    mesh = alembic.AbcGeom.OPolyMesh(oarch.getTop(), "grid")
+    points = imath.V3fArray((size + 1) * (size + 1))
+    for j in range(size + 1):
+        for i in range(size + 1):
+            points[j * (size + 1) + i] = imath.V3f(i, 0, j)
+    indices = imath.IntArray(size * size * 4)
+    counts = imath.IntArray(size * size)
+    for j in range(size):
+        for i in range(size):
+            f = j * size + i
+            v = j * (size + 1) + i
+            indices[f * 4 + 0] = v
+            indices[f * 4 + 1] = v + size + 1
+            indices[f * 4 + 2] = v + size + 2
+            indices[f * 4 + 3] = v + 1
+            counts[f] = 4
+    sample = alembic.AbcGeom.OPolyMeshSchemaSample(points, indices, counts)
+    mesh.getSchema().set(sample)
+
+def gpu_memory():
+    """
+    Returns the available GPU memory in kb, or None if not supported.
+    """
+    if "GL_NVX_gpu_memory_info" not in (glGetString(GL_EXTENSIONS) or ""):
+        return None
+    return int(glGetIntegerv(GPU_MEMORY_AVAILABLE_NVX))
+
+def wait(app, func, timeout=60.0):
+    start = time.time()
+    while not func() and time.time() - start < timeout:
+        app.processEvents()
+        time.sleep(0.01)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--panes", type=int, default=4)
+    parser.add_argument("--no-share", action="store_true")
+    parser.add_argument("--no-buffers", action="store_true")
+    args = parser.parse_args()
+
+    config.SHARE_CONTEXTS = not args.no_share
+    config.GPU_BUFFERS = not args.no_buffers
+
+    filepath = os.path.join(TEMPDIR, "grid.abc")
+    write_grid(filepath, args.size)
+
+    app = QtGui.QApplication(sys.argv)
+    viewer = GLWidget()
+    group = QtGui.QGroupBox()
+    group.setLayout(QtGui.QVBoxLayout())
+    group.layout().addWidget(viewer)
+    group.resize(800, 600)
+    group.show()
+    wait(app, viewer.isValid)
+
+    viewer.makeCurrent()
+    before = gpu_memory()
+
+    scene = GLScene(filepath)
+    viewer.add_scene(scene)
+    wait(app, lambda: not scene.is_loading())
+
+    # split the first pane until there are enough panes
+    viewers = [viewer]
+    while len(viewers) < args.panes:
+        viewers[0].split()
+        viewers = viewer.camera.views.keys()
+    wait(app, lambda: all(v.isValid() for v in viewers))
+
+    start = time.time()
+    for v in viewers:
+        v.updateGL()
+    first = (time.time() - start) * 1000.0
+
+    start = time.time()
+    for v in viewers:
+        v.updateGL()
+    second = (time.time() - start) * 1000.0
+
+    viewer.makeCurrent()
+    after = gpu_memory()
+
+    print "%d panes, %s contexts, %d quads" % (len(viewers),
+            "separate" if args.no_share else "shared", args.size ** 2)
+    print "first paint:  %8.2f ms" % first
+    print "second paint: %8.2f ms" % second
+    print "gpu buffers:  %8.2f MB" % (alembicgl.getBufferBytes() / 1048576.0)
+    if before is not None and after is not None:
+        print "gpu memory:   %8.2f MB" % ((before - after) / 1024.0)
+    else:
+        print "gpu memory:   n/a (needs GL_NVX_gpu_memory_info)"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#-******************************************************************************
+#
+# Copyright (c) 2014,
+#  Sony Pictures Imageworks Inc. and
+#  Industrial Light & Magic, a division of Lucasfilm Entertainment Company Ltd.
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+# *       Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+# *       Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+# *       Neither the name of Sony Pictures Imageworks, nor
+# Industrial Light & Magic, nor the names of their contributors may be used
+# to endorse or promote products derived from this software without specific
+# prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#-******************************************************************************
+
+"""
+Compares the per-frame cost of get_final_matrix over a deep rig-like
+hierarchy with and without the world-matrix cache. ::
+
+    $ python benchXformCache.py --depth 40 --chains 50 --frames 48
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import imath
+import alembic
+kWrapExisting = alembic.Abc.WrapExistingFlag.kWrapExisting
+
+from abcview import gl
+
+# temporary directory for holding test data
+TEMPDIR = tempfile.mkdtemp()
+
+def write_rig(filepath, depth, chains, frames, fps=24.0):
+    """
+    Writes an archive with "chains" xform chains, each "depth" levels deep,
+    where every fourth level is animated. Returns the leaf object paths.
+    """
+    oarch = alembic.Abc.OArchive(str(filepath))
+    ts = alembic.AbcCoreAbstract.TimeSampling(1.0 / fps, 0.0)
+    tsidx = oarch.addTimeSampling(ts)
+    leaves = []
+    for c in range(chains):
+        parent = oarch.getTop()
+        for d in range(depth):
+            animated = (d % 4 == 0)
+            if animated:
+                xf = alembic.AbcGeom.OXform(parent, "xf%d" % d, tsidx)
+            else:
+                xf = alembic.AbcGeom.OXform(parent, "xf%d" % d)
+            sample = alembic.AbcGeom.XformSample()
+            for f in range(frames if animated else 1):
+                sample.setTranslation(imath.V3d(0.1 * f, 1.0, 0.0))
+                xf.getSchema().set(sample)
+            parent = xf
+        leaves.append(parent.getFullName())
+    return leaves
+
+def uncached_final_matrix(obj, sec=0):
+    """
+    Reference implementation that walks and re-samples every parent.
+    """
+    xf = imath.M44d()
+    xf.makeIdentity()
+    parent = obj.getParent()
+    while parent:
+        if alembic.AbcGeom.IXform.matches(parent.getHeader()):
+            xs = alembic.AbcGeom.IXform(parent, kWrapExisting).getSchema()
+            index = xs.getTimeSampling().getNearIndex(sec, xs.getNumSamples())
+            xf *= xs.getValue(index).getMatrix()
+        parent = parent.getParent()
+    return xf
+
+def get_leaves(archive, paths):
+    objects = []
+    for path in paths:
+        obj = archive.getTop()
+        for name in path.split("/"):
+            if name:
+                obj = obj.getChild(name)
+        objects.append(obj)
+    return objects
+
+def run(func, objects, frames, fps=24.0):
+    """
+    Returns the average time in ms spent per frame.
+    """
+    start = time.time()
+    for f in range(frames):
+        for obj in objects:
+            func(obj, f / fps)
+    return (time.time() - start) * 1000.0 / frames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=40)
+    parser.add_argument("--chains", type=int, default=50)
+    parser.add_argument("--frames", type=int, default=48)
+    args = parser.parse_args()
+
+    filepath = os.path.join(TEMPDIR, "rig.abc")
+    paths = write_rig(filepath, args.depth, args.chains, args.frames)
+    archive = alembic.Abc.IArchive(str(filepath))
+    objects = get_leaves(archive, paths)
+
+    before = run(uncached_final_matrix, objects, args.frames)
+    gl.clear_matrix_cache()
+    cold = run(gl.get_final_matrix, objects, args.frames)
+    warm = run(gl.get_final_matrix, objects, args.frames)
+
+    print "depth %d, %d chains, %d frames" % (args.depth, args.chains,
+                                              args.frames)
+    print "uncached:     %8.2f ms/frame" % before
+    print "cached, cold: %8.2f ms/frame" % cold
+    print "cached, warm: %8.2f ms/frame" % warm
+
+    # sanity check the cached matrices against the reference
+    for obj in objects[:5]:
+        for f in (0, args.frames - 1):
+            a = uncached_final_matrix(obj, f / 24.0)
+            b = gl.get_final_matrix(obj, f / 24.0)
+            assert a.equalWithAbsError(b, 1e-9), obj.getFullName()
+
+if __name__ == "__main__":
+    main()
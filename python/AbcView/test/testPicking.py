@@ -0,0 +1,164 @@
+#-******************************************************************************
+#
+# Copyright (c) 2014,
+#  Sony Pictures Imageworks Inc. and
+#  Industrial Light & Magic, a division of Lucasfilm Entertainment Company Ltd.
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+# *       Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+# *       Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+# *       Neither the name of Sony Pictures Imageworks, nor
+# Industrial Light & Magic, nor the names of their contributors may be used
+# to endorse or promote products derived from this software without specific
+# prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#-******************************************************************************
+
+import os
+import doctest
+import tempfile
+import unittest
+
+import numpy
+from abcview.gl import BVH, GLScene, pick_ray, transform_ray, intersect_boxes
+
+class Test1_PickRay(unittest.TestCase):
+    def test_identity(self):
+        ident = numpy.identity(4)
+        origin, direction = pick_ray(50, 50, 100, ident, ident, (0, 0, 100, 100))
+        self.assertTrue(numpy.allclose(origin, (0, 0, -1)))
+        self.assertTrue(numpy.allclose(direction, (0, 0, 2)))
+
+        # widget y is from the top, GL y is from the bottom
+        origin, direction = pick_ray(0, 0, 100, ident, ident, (0, 0, 100, 100))
+        self.assertTrue(numpy.allclose(origin, (-1, 1, -1)))
+
+    def test_modelview(self):
+        # camera moved back 5 units, row vector convention
+        modelview = numpy.identity(4)
+        modelview[3, 2] = -5.0
+        ident = numpy.identity(4)
+        origin, direction = pick_ray(50, 50, 100, modelview, ident,
+                                     (0, 0, 100, 100))
+        self.assertTrue(numpy.allclose(origin, (0, 0, 4)))
+        self.assertTrue(numpy.allclose(direction, (0, 0, 2)))
+
+class Test2_IntersectBoxes(unittest.TestCase):
+    def test_slab(self):
+        lo = numpy.array(((0, 0, 0), (0, 2, 0), (0, 0, -3)), dtype=float)
+        hi = numpy.array(((1, 1, 1), (1, 3, 1), (1, 1, -2)), dtype=float)
+        hit, tnear = intersect_boxes(numpy.array((0.5, 0.5, -5.0)),
+                                     numpy.array((0.0, 0.0, 1.0)), lo, hi)
+        self.assertEqual(hit.tolist(), [True, False, True])
+        self.assertAlmostEqual(tnear[0], 5.0)
+        self.assertAlmostEqual(tnear[2], 2.0)
+
+    def test_behind(self):
+        hit, tnear = intersect_boxes(numpy.array((0.5, 0.5, 5.0)),
+                                     numpy.array((0.0, 0.0, 1.0)),
+                                     numpy.zeros((1, 3)), numpy.ones((1, 3)))
+        self.assertFalse(hit[0])
+
+    def test_inside(self):
+        hit, tnear = intersect_boxes(numpy.array((0.5, 0.5, 0.5)),
+                                     numpy.array((1.0, 0.0, 0.0)),
+                                     numpy.zeros((1, 3)), numpy.ones((1, 3)))
+        self.assertTrue(hit[0])
+        self.assertEqual(tnear[0], 0.0)
+
+class Test3_BVH(unittest.TestCase):
+    def test_doctest(self):
+        for test in doctest.DocTestFinder().find(BVH, globs={"BVH": BVH}):
+            result = doctest.DocTestRunner(verbose=False).run(test)
+            self.assertEqual(result.failed, 0)
+
+    def test_empty(self):
+        bvh = BVH([], [])
+        self.assertEqual(len(bvh), 0)
+        self.assertEqual(bvh.bounds(), None)
+        self.assertEqual(bvh.intersect((0, 0, 0), (0, 0, 1)), None)
+
+    def test_nearest(self):
+        # two overlapping boxes along the ray, the nearer one wins
+        # regardless of the order they were given in
+        boxes = [((0, 0, 2), (1, 1, 4)), ((0, 0, 0), (1, 1, 3))]
+        for order in (boxes, boxes[::-1]):
+            items = ["/far", "/near"] if order is boxes else ["/near", "/far"]
+            hit = BVH(order, items).intersect((0.5, 0.5, -5), (0, 0, 1))
+            self.assertEqual(hit[1], "/near")
+            self.assertAlmostEqual(hit[0], 5.0)
+
+        # tmax ignores further hits
+        bvh = BVH(boxes, ["/far", "/near"])
+        self.assertEqual(bvh.intersect((0.5, 0.5, -5), (0, 0, 1), 4.0), None)
+
+    def test_split(self):
+        # enough boxes to split below the leaf size
+        boxes = [((i, 0, 0), (i + 0.5, 1, 1)) for i in range(20)]
+        items = ["/box%d" % i for i in range(20)]
+        bvh = BVH(boxes, items)
+        lo, hi = bvh.bounds()
+        self.assertTrue(numpy.allclose(lo, (0, 0, 0)))
+        self.assertTrue(numpy.allclose(hi, (19.5, 1, 1)))
+        for i in (0, 7, 19):
+            hit = bvh.intersect((i + 0.25, 0.5, -1), (0, 0, 1))
+            self.assertEqual(hit, (1.0, "/box%d" % i))
+        self.assertEqual(bvh.intersect((5.75, 0.5, -1), (0, 0, 1)), None)
+
+class Test4_OverrideMatrix(unittest.TestCase):
+    def test_identity(self):
+        scene = GLScene(os.path.join(tempfile.gettempdir(), "none.abc"))
+        self.assertTrue(numpy.allclose(scene.override_matrix(),
+                                       numpy.identity(4)))
+
+    def test_round_trip(self):
+        scene = GLScene(os.path.join(tempfile.gettempdir(), "none.abc"))
+        scene.translate = (1, 2, 3)
+        scene.rotate = (90, 0, 0, 1)
+        scene.scale = (2, 2, 2)
+        m = scene.override_matrix()
+
+        # scale, then rotate, then translate
+        point = numpy.dot((1, 0, 0, 1), m)
+        self.assertTrue(numpy.allclose(point, (1, 4, 3, 1)))
+
+        # a world space ray taken into scene space and back is unchanged
+        origin = numpy.array((3.0, -1.0, 2.0))
+        direction = numpy.array((0.0, 1.0, 0.5))
+        local = transform_ray(origin, direction, numpy.linalg.inv(m))
+        world = transform_ray(local[0], local[1], m)
+        self.assertTrue(numpy.allclose(world[0], origin))
+        self.assertTrue(numpy.allclose(world[1], direction))
+
+        # the world space point hits the unit box at the same t
+        origin = numpy.array((1.0, 4.0, -7.0))
+        direction = numpy.array((0.0, 0.0, 1.0))
+        local = transform_ray(origin, direction, numpy.linalg.inv(m))
+        hit, tnear = intersect_boxes(local[0], local[1],
+                                     numpy.array((0.5, -0.5, -0.5)),
+                                     numpy.array((1.5, 0.5, 0.5)))
+        self.assertTrue(hit)
+        self.assertAlmostEqual(tnear, 9.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -38,7 +38,9 @@ import os
 import unittest
 import tempfile
 
+import alembic
 from abcview.io import idict, Session
+from abcview.utils import LRUCache, SampleTable, set_sample_range
 
 # temporary directory for holding test data
 TEMPDIR = tempfile.mkdtemp()
@@ -171,5 +173,77 @@ class Test2_Session(unittest.TestCase):
         self.assertEqual(s1.properties.get("b"), "bar")
         self.assertEqual(s2.items[0].properties.get("b"), "bar")
 
+class Test3_LRUCache(unittest.TestCase):
+    def test_basic(self):
+        c = LRUCache(2)
+        c.put("a", 1)
+        c.put("b", 2)
+        self.assertEqual(len(c), 2)
+        self.assertEqual(c.get("a"), 1)
+
+        # "b" is now the least recently used value
+        c.put("c", 3)
+        self.assertEqual(len(c), 2)
+        self.assertTrue("a" in c)
+        self.assertFalse("b" in c)
+        self.assertEqual(c.get("b", 0), 0)
+
+    def test_discard(self):
+        c = LRUCache(10)
+        for i in range(5):
+            c.put(("x", i), i)
+            c.put(("y", i), i)
+        c.discard(lambda key: key[0] == "x")
+        self.assertEqual(len(c), 5)
+        self.assertEqual(c.get(("x", 1)), None)
+        self.assertEqual(c.get(("y", 1)), 1)
+
+    def test_weigh(self):
+        c = LRUCache(10, weigh=len)
+        c.put("a", "xxxx")
+        c.put("b", "xxxx")
+        self.assertEqual(c.size(), 8)
+
+        # "a" is evicted to make room
+        c.put("c", "xxxx")
+        self.assertEqual(c.size(), 8)
+        self.assertFalse("a" in c)
+
+        # a value larger than the cache is still kept on its own
+        c.put("d", "x" * 20)
+        self.assertEqual(len(c), 1)
+        self.assertEqual(c.size(), 20)
+
+        c.discard(lambda key: key == "d")
+        self.assertEqual(c.size(), 0)
+
+class Test4_SampleTable(unittest.TestCase):
+    def check(self, ts, num_samples, fps, first_frame, last_frame):
+        set_sample_range(fps, first_frame, last_frame)
+        table = SampleTable(ts, num_samples)
+        for frame in range(first_frame - 5, last_frame + 5):
+            seconds = frame / float(fps)
+            self.assertEqual(table.index(seconds),
+                             ts.getNearIndex(seconds, num_samples))
+
+    def test_uniform(self):
+        ts = alembic.AbcCoreAbstract.TimeSampling(1.0 / 30.0, 0.51)
+        self.check(ts, 100, 24.0, 0, 120)
+        self.check(ts, 100, 30.0, 10, 50)
+
+    def test_cyclic(self):
+        tst = alembic.AbcCoreAbstract.TimeSamplingType(2, 1.0 / 24.0)
+        ts = alembic.AbcCoreAbstract.TimeSampling(tst, [0.0, 0.01])
+        self.check(ts, 50, 24.0, 0, 30)
+
+    def test_acyclic(self):
+        # irregular times, frames 1 and 9 fall exactly halfway between
+        # two samples, and the range starts before and ends after them
+        tst = alembic.AbcCoreAbstract.TimeSamplingType(
+                alembic.AbcCoreAbstract.TimeSamplingType.kAcyclic)
+        times = [0.0, 2 / 24.0, 0.1, 0.25, 0.5, 0.52, 1.0]
+        ts = alembic.AbcCoreAbstract.TimeSampling(tst, times)
+        self.check(ts, len(times), 24.0, -12, 36)
+
 if __name__ == "__main__":
     unittest.main()
@@ -39,6 +39,72 @@
 
 using namespace boost::python;
 
+namespace {
+
+//-*****************************************************************************
+// releases the GIL for the lifetime of the object
+class ReleaseGIL
+{
+public:
+    ReleaseGIL() { m_state = PyEval_SaveThread(); }
+    ~ReleaseGIL() { PyEval_RestoreThread( m_state ); }
+
+private:
+    PyThreadState *m_state;
+};
+
+//-*****************************************************************************
+// builds the scene without holding the GIL, so several archives can be
+// loaded from python worker threads at once
+AbcOpenGL::SceneWrapper *newSceneWrapper( const std::string &fileName,
+                                          bool verbose )
+{
+    ReleaseGIL release;
+    return new AbcOpenGL::SceneWrapper( fileName, verbose );
+}
+
+//-*****************************************************************************
+// decodes upcoming samples without holding the GIL, so python worker
+// threads can prefetch while the main thread draws
+void prefetchScene( AbcOpenGL::SceneWrapper &iScene, double iSeconds )
+{
+    ReleaseGIL release;
+    iScene.prefetch( iSeconds );
+}
+
+//-*****************************************************************************
+// draws a scene once per instance, from sequences of 16 matrix values
+// (row vector convention) and of rgb colors
+void drawSceneInstances( AbcOpenGL::SceneWrapper &iScene,
+                         object iInstances, object iColors,
+                         bool iVisibleOnly, bool iBoundsOnly,
+                         bool iUseBuffers )
+{
+    std::vector<Imath::M44d> instances( len( iInstances ) );
+    for ( size_t i = 0; i < instances.size(); ++i )
+    {
+        object values = iInstances[i];
+        for ( int j = 0; j < 16; ++j )
+        {
+            instances[i][j / 4][j % 4] = extract<double>( values[j] );
+        }
+    }
+
+    std::vector<Imath::C3f> colors( len( iColors ) );
+    for ( size_t i = 0; i < colors.size(); ++i )
+    {
+        object values = iColors[i];
+        colors[i].setValue( extract<float>( values[0] ),
+                            extract<float>( values[1] ),
+                            extract<float>( values[2] ) );
+    }
+
+    iScene.drawInstances( instances, colors, iVisibleOnly, iBoundsOnly,
+                          iUseBuffers );
+}
+
+} // namespace
+
 //-*****************************************************************************
 void register_opengl()
 {
@@ -55,6 +121,48 @@ void register_opengl()
         ( arg( "bounds" ), arg( "mode" ) = 1 ) )
     ;
 
+    // frame cache
+    //
+    def("setFrameCacheBudget",
+        &AbcOpenGL::setFrameCacheBudget,
+        ( arg( "bytes" ) ) )
+    ;
+
+    def("getFrameCacheBudget", &AbcOpenGL::getFrameCacheBudget );
+    def("getFrameCacheSize", &AbcOpenGL::getFrameCacheSize );
+    def("getFrameCacheHits", &AbcOpenGL::getFrameCacheHits );
+    def("getFrameCacheMisses", &AbcOpenGL::getFrameCacheMisses );
+    def("clearFrameCache", &AbcOpenGL::clearFrameCache );
+
+    // point cloud decimation
+    //
+    def("setPointBudget",
+        &AbcOpenGL::setPointBudget,
+        ( arg( "points" ), arg( "in_view" ) = 0 ) )
+    ;
+
+    def("getPointBudget", &AbcOpenGL::getPointBudget );
+    def("getPointsInView", &AbcOpenGL::getPointsInView );
+
+    // mesh buffer objects
+    //
+    def("hasBufferObjects", &AbcOpenGL::hasBufferObjects );
+    def("getBufferBytes", &AbcOpenGL::getBufferBytes );
+    def("flushBufferDeletes", &AbcOpenGL::flushBufferDeletes );
+
+    // disk cache
+    //
+    def("setDiskCache",
+        &AbcOpenGL::setDiskCache,
+        ( arg( "directory" ), arg( "bytes" ) ) )
+    ;
+
+    def("getDiskCacheDirectory", &AbcOpenGL::getDiskCacheDirectory );
+    def("getDiskCacheSize", &AbcOpenGL::getDiskCacheSize );
+    def("getDiskCacheHits", &AbcOpenGL::getDiskCacheHits );
+    def("getDiskCacheMisses", &AbcOpenGL::getDiskCacheMisses );
+    def("clearDiskCache", &AbcOpenGL::clearDiskCache );
+
     // GLCamera overloads
     //
     void ( AbcOpenGL::GLCamera::*setSizeWidthHeight )( int w, int h )
@@ -136,15 +244,23 @@ void register_opengl()
           "SceneWrapper",
           "Wraps AbcOpenGL Scene class",
           no_init )
-        .def( init<const std::string, bool> (
-              ( arg( "fileName" ), arg( "verbose" ) = false ),
-              "doc"))
+        .def( "__init__",
+              make_constructor( &newSceneWrapper,
+                                default_call_policies(),
+                                ( arg( "fileName" ), arg( "verbose" ) = false ) ),
+              "doc" )
         .def( "selection",
               &AbcOpenGL::SceneWrapper::selection,
               ( arg( "x" ), arg( "y" ), arg( "camera" ) ) )
         .def( "draw",
               &AbcOpenGL::SceneWrapper::draw,
-              ( arg( "visibleOnly" ) = false , arg( "boundsOnly" ) = false ) )
+              ( arg( "visibleOnly" ) = false , arg( "boundsOnly" ) = false,
+                arg( "cull" ) = false, arg( "useBuffers" ) = false ) )
+        .def( "drawInstances",
+              &drawSceneInstances,
+              ( arg( "instances" ), arg( "colors" ),
+                arg( "visibleOnly" ) = false , arg( "boundsOnly" ) = false,
+                arg( "useBuffers" ) = false ) )
         .def( "drawBounds",
               &AbcOpenGL::SceneWrapper::drawBounds,
               ( arg( "mode" ) ) )
@@ -156,9 +272,18 @@ void register_opengl()
               &AbcOpenGL::SceneWrapper::getCurrentTime )
         .def( "isConstant",
               &AbcOpenGL::SceneWrapper::isConstant )
+        .def( "getNumPrimitives",
+              &AbcOpenGL::SceneWrapper::getNumPrimitives )
+        .def( "getNumDrawn",
+              &AbcOpenGL::SceneWrapper::getNumDrawn )
+        .def( "getNumCulled",
+              &AbcOpenGL::SceneWrapper::getNumCulled )
         .def( "setTime",
               &AbcOpenGL::SceneWrapper::setTime,
               ( arg( "time" ) ) )
+        .def( "prefetch",
+              &prefetchScene,
+              ( arg( "time" ) ) )
         .def( "playForward",
               &AbcOpenGL::SceneWrapper::playForward,
               ( arg( "fps" ) ) )